@@ -0,0 +1,100 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+"""
+Micro-benchmarks of the parser and the data pipeline based on the frame captures of the tests.
+
+Run from the repository root:
+    python -m benchmarks                   # measure and compare with the stored baseline
+    python -m benchmarks --save-baseline   # measure and store the results as new baseline
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+from typing import Dict, List
+
+from .pipeline import BenchmarkResult, run_benchmarks
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parser and pipeline micro-benchmarks")
+    parser.add_argument("-n", "--iterations", type=int, default=200,
+                        help="Measured iterations per benchmark. Default: 200")
+    parser.add_argument("-w", "--warmup", type=int, default=20,
+                        help="Unmeasured iterations before measuring. Default: 20")
+    parser.add_argument("-k", "--filter", default="",
+                        help="Only run benchmarks of datasets containing this name.")
+    parser.add_argument("-b", "--baseline", default=DEFAULT_BASELINE,
+                        help="Baseline file (JSON). Default: benchmarks/baseline.json")
+    parser.add_argument("-t", "--threshold", type=float, default=0.25,
+                        help="Allowed slowdown relative to the baseline before failing. Default: 0.25 (25%%)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store the results as new baseline instead of comparing.")
+    return parser.parse_args()
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)["median_us"]
+
+
+def save_baseline(path: str, results: List[BenchmarkResult]) -> None:
+    baseline = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "median_us": {result.name: round(result.median_us, 2) for result in results},
+    }
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(baseline, baseline_file, indent=2)
+        baseline_file.write("\n")
+
+
+def report(results: List[BenchmarkResult], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """Prints the results. Returns: Names of the benchmarks slower than the baseline by more than `threshold`."""
+    regressions = []
+    print(f"{'benchmark':<60} {'median [us]':>12} {'frames/s':>10} {'baseline':>10} {'change':>8}")
+    for result in results:
+        line = f"{result.name:<60} {result.median_us:>12.1f} {result.frames_per_sec:>10.0f}"
+        reference = baseline.get(result.name, None)
+        if reference:
+            change = result.median_us / reference - 1
+            line += f" {reference:>10.1f} {change:>+8.0%}"
+            if change > threshold:
+                regressions.append(result.name)
+                line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+def main() -> int:
+    args = parse_arguments()
+    logging.basicConfig(level=logging.ERROR)
+    results = run_benchmarks(args.iterations, args.warmup, args.filter)
+    if args.save_baseline:
+        report(results, {}, args.threshold)
+        save_baseline(args.baseline, results)
+        print(f"Baseline stored in {args.baseline}.")
+        return 0
+
+    regressions = report(results, load_baseline(args.baseline), args.threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}:")
+        for name in regressions:
+            print(f"  {name}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
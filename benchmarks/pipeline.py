@@ -0,0 +1,161 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from smartmeter_datacollector.sinks.mqtt_sink import MqttDataSink
+from smartmeter_datacollector.smartmeter.aes_gcm import (BACKEND_CRYPTOGRAPHY, BACKEND_GURUX, Cipher,
+                                                         create_aes_gcm_backend)
+from smartmeter_datacollector.smartmeter.cosem import Cosem
+from smartmeter_datacollector.smartmeter.fast_path import ApduAssembler
+from smartmeter_datacollector.smartmeter.hdlc_dlms_parser import HdlcDlmsParser
+from smartmeter_datacollector.smartmeter.meter_data import MeterReading
+from tests.utils import (ENCRYPTED_DATA_NO_PUSHLIST_LG, ENCRYPTED_VALID_DATA_LGE570, UNENCRYPTED_VALID_DATA_ISKRA,
+                         UNENCRYPTED_VALID_DATA_LG, UNENCRYPTED_VALID_DATA_LG2, hex_to_frames)
+
+
+@dataclass
+class Dataset:
+    name: str
+    frames: List[bytes]  # frames of exactly one complete message
+    block_cipher_key: Optional[str] = None
+
+
+DATASETS = [
+    # the first two frames of the capture belong to an incomplete message
+    Dataset("lge450", hex_to_frames(UNENCRYPTED_VALID_DATA_LG)[2:]),
+    Dataset("lge450_short", hex_to_frames(UNENCRYPTED_VALID_DATA_LG2)),
+    Dataset("iskraam550", hex_to_frames(UNENCRYPTED_VALID_DATA_ISKRA)),
+    Dataset("lge570_encrypted", hex_to_frames(ENCRYPTED_VALID_DATA_LGE570), "101112131415161718191A1B1C1D1E1F"),
+    Dataset("lg_no_pushlist_encrypted", hex_to_frames(ENCRYPTED_DATA_NO_PUSHLIST_LG),
+            "F08660A6C19D2048556BF623AB0257E6"),
+]
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    frames: int
+    median_us: float
+
+    @property
+    def frames_per_sec(self) -> float:
+        return self.frames / self.median_us * 1e6 if self.median_us else 0.0
+
+
+class StageTimer:
+    """Collects the duration of named stages over all iterations of a benchmark."""
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, List[int]] = {}
+
+    def measure(self, stage: str, func: Callable, *args):
+        start = time.perf_counter_ns()
+        result = func(*args)
+        self.durations.setdefault(stage, []).append(time.perf_counter_ns() - start)
+        return result
+
+    def results(self, prefix: str, frames: int) -> List[BenchmarkResult]:
+        return [BenchmarkResult(f"{prefix}.{stage}", frames, statistics.median(durations) / 1000)
+                for stage, durations in self.durations.items()]
+
+
+def _extract(parser: HdlcDlmsParser, frames: List[bytes]) -> None:
+    complete = False
+    for frame in frames:
+        parser.append_to_hdlc_buffer(frame)
+        complete = parser.extract_data_from_hdlc_frames()
+    if not complete:
+        raise RuntimeError("Benchmark data does not contain a complete message.")
+
+
+def _to_json(reading: MeterReading) -> List[str]:
+    return [data_point.to_json() for data_point in reading]
+
+
+def _to_mqtt_json(reading: MeterReading) -> List[str]:
+    return [MqttDataSink.data_point_to_mqtt_json(data_point) for data_point in reading]
+
+
+def bench_full_decoding(dataset: Dataset, iterations: int, warmup: int) -> List[BenchmarkResult]:
+    """Per-stage cost of decoding every message with gurux (the fast path is never learned)."""
+    parser = HdlcDlmsParser(Cosem(fallback_id=dataset.name), dataset.block_cipher_key)
+    timer = StageTimer()
+    for iteration in range(warmup + iterations):
+        if iteration == warmup:
+            timer = StageTimer()
+        timer.measure("hdlc_extraction", _extract, parser, dataset.frames)
+        dlms_objects = timer.measure("parse_to_dlms_objects", parser.parse_to_dlms_objects)
+        message_time = parser.extract_message_time()
+        reading = timer.measure("convert_dlms_bundle_to_reader_data", parser.convert_dlms_bundle_to_reader_data,
+                                    dlms_objects, message_time)
+        if not reading:
+            raise RuntimeError(f"No data points decoded from {dataset.name}.")
+        timer.measure("to_json", _to_json, reading)
+        timer.measure("data_point_to_mqtt_json", _to_mqtt_json, reading)
+    return timer.results(dataset.name, len(dataset.frames))
+
+
+def bench_pipeline(dataset: Dataset, iterations: int, warmup: int) -> List[BenchmarkResult]:
+    """Cost of a message from HDLC frames to data points as done by the meters (including the fast path)."""
+    parser = HdlcDlmsParser(Cosem(fallback_id=dataset.name), dataset.block_cipher_key)
+    timer = StageTimer()
+
+    def pipeline() -> Optional[MeterReading]:
+        _extract(parser, dataset.frames)
+        return parser.parse_to_meter_data()
+
+    for iteration in range(warmup + iterations):
+        if iteration == warmup:
+            timer = StageTimer()
+        timer.measure("pipeline", pipeline)
+    return timer.results(dataset.name, len(dataset.frames))
+
+
+def bench_decryption(dataset: Dataset, iterations: int, warmup: int) -> List[BenchmarkResult]:
+    """
+    Cost of decrypting the reassembled APDU with each available AES-GCM backend.
+    Backends which cannot decrypt the APDU (e.g. failed tag verification) are reported and skipped.
+    """
+    if not dataset.block_cipher_key:
+        return []
+    assembler = ApduAssembler()
+    for frame in dataset.frames:
+        apdu = assembler.add(frame)
+    backends = [BACKEND_GURUX]
+    if Cipher is not None:
+        backends.append(BACKEND_CRYPTOGRAPHY)
+    timer = StageTimer()
+    for backend_name in backends:
+        backend = create_aes_gcm_backend(backend_name, bytes.fromhex(dataset.block_cipher_key))
+        try:
+            backend.decrypt(apdu)
+        except ValueError as ex:
+            print(f"{dataset.name}.decrypt_{backend_name} skipped: {ex}", file=sys.stderr)
+            continue
+        for _ in range(warmup):
+            backend.decrypt(apdu)
+        for _ in range(iterations):
+            timer.measure(f"decrypt_{backend_name}", backend.decrypt, apdu)
+    return timer.results(dataset.name, len(dataset.frames))
+
+
+BENCHMARKS = [bench_full_decoding, bench_decryption, bench_pipeline]
+
+
+def run_benchmarks(iterations: int, warmup: int, name_filter: str = "") -> List[BenchmarkResult]:
+    results = []
+    for dataset in DATASETS:
+        if name_filter not in dataset.name:
+            continue
+        for benchmark in BENCHMARKS:
+            results.extend(benchmark(dataset, iterations, warmup))
+    return results
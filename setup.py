@@ -47,7 +47,7 @@ setup(
     license="GPLv2",
     python_requires=">=3.8",
     packages=find_packages(
-        exclude=["contrib", "doc", "LICENSES", "scripts", "tests", "tests."]
+        exclude=["benchmarks", "contrib", "doc", "LICENSES", "scripts", "tests", "tests."]
     ),
     include_package_data=True,
     install_requires=[
@@ -57,6 +57,9 @@ setup(
         'paho-mqtt==1.6.1',
         'pyserial==3.5'
     ],
+    extras_require={
+        'crypto': ['cryptography']
+    },
     scripts=["bin/smartmeter-datacollector"],
     zip_safe=True,
     dependency_links=[],
@@ -11,26 +11,57 @@ import logging
 from asyncio import CancelledError
 from configparser import ConfigParser
 
-from . import config, factory
+from . import config, factory, metrics, sharding
+from .supervisor import ReaderSupervisor
 
 logging.basicConfig(level=logging.WARNING)
 
 
 async def build_and_start(app_config: ConfigParser):
+    if sharding.get_worker_count(app_config) > 1:
+        await build_and_start_sharded(app_config)
+        return
+
+    reporters = metrics.build_reporters(app_config)
     readers = factory.build_meters(app_config)
     sinks = factory.build_sinks(app_config)
-    data_collector = factory.build_collector(readers, sinks)
+    data_collector = factory.build_collector(readers, sinks, app_config)
+    supervisors = [ReaderSupervisor(reader, f"{type(reader).__name__}#{index}")
+                   for index, reader in enumerate(readers)]
+
+    await asyncio.gather(*[sink.start() for sink in sinks])
+
+    try:
+        await asyncio.gather(
+            *[supervisor.run() for supervisor in supervisors],
+            *[reporter.run() for reporter in reporters],
+            data_collector.process_queue())
+    except CancelledError:
+        pass
+    finally:
+        logging.info("App shutting down now.")
+        await asyncio.gather(*[sink.stop() for sink in sinks])
+
+
+async def build_and_start_sharded(app_config: ConfigParser):
+    reporters = metrics.build_reporters(app_config)
+    sinks = factory.build_sinks(app_config)
+    data_collector = factory.build_collector([], sinks, app_config)
+    shards = sharding.build_shards(app_config, data_collector)
 
     await asyncio.gather(*[sink.start() for sink in sinks])
 
     try:
         await asyncio.gather(
-            *[reader.start() for reader in readers],
+            *[shard.run() for shard in shards],
+            *[reporter.run() for reporter in reporters],
             data_collector.process_queue())
     except CancelledError:
         pass
     finally:
         logging.info("App shutting down now.")
+        for shard in shards:
+            shard.stop()
         await asyncio.gather(*[sink.stop() for sink in sinks])
 
 
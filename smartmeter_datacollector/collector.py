@@ -7,34 +7,241 @@
 #
 import asyncio
 import logging
-from asyncio import QueueFull
-from typing import List
+import time
+from array import array
+from collections import deque
+from configparser import ConfigParser, SectionProxy
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Deque, Dict, List, Optional, Tuple
 
+from .config import InvalidConfigError
+from .metrics import METRICS
 from .sinks.data_sink import DataSink
-from .smartmeter.meter_data import MeterDataPoint
+from .smartmeter.meter_data import MeterReading
 
 LOGGER = logging.getLogger("collector")
 
 
+class OverflowPolicy(Enum):
+    # the new reading is dropped
+    DROP_NEWEST = "drop_newest"
+    # the oldest queued reading is dropped
+    DROP_OLDEST = "drop_oldest"
+    # queued values superseded by the new reading are removed (drop oldest if there is nothing to coalesce)
+    COALESCE = "coalesce"
+
+    @staticmethod
+    def from_string(value: str) -> "OverflowPolicy":
+        try:
+            return OverflowPolicy(value)
+        except ValueError as ex:
+            raise InvalidConfigError(f"'overflow' is invalid: {value}") from ex
+
+
+@dataclass
+class CollectorConfig:
+    # maximum number of readings passed to the sinks at once
+    batch_size: int = 100
+    # seconds to wait for more readings before passing an incomplete batch (0: do not wait)
+    batch_delay: float = 0.0
+    # maximum number of readings queued per sink
+    queue_size: int = 10000
+    overflow: OverflowPolicy = OverflowPolicy.DROP_NEWEST
+
+    @staticmethod
+    def from_config(config: ConfigParser) -> "CollectorConfig":
+        if not config.has_section("collector"):
+            return CollectorConfig()
+        collector_config = config["collector"]
+        return CollectorConfig(
+            batch_size=max(1, collector_config.getint("batch_size", 100)),
+            batch_delay=max(0.0, collector_config.getfloat("batch_delay", 0.0)),
+            queue_size=max(1, collector_config.getint("queue_size", 10000)),
+            overflow=OverflowPolicy.from_string(collector_config.get("overflow", OverflowPolicy.DROP_NEWEST.value))
+        )
+
+    def for_sink(self, sink_config: SectionProxy) -> "CollectorConfig":
+        """Returns: The config with `queue_size` and `overflow` of the sink section, if set."""
+        return replace(
+            self,
+            queue_size=max(1, sink_config.getint("queue_size", self.queue_size)),
+            overflow=OverflowPolicy.from_string(sink_config.get("overflow", self.overflow.value))
+        )
+
+
+class _QueuedReading:
+    __slots__ = ("enqueued", "reading")
+
+    def __init__(self, enqueued: float, reading: Optional[MeterReading]) -> None:
+        self.enqueued = enqueued
+        # None once all values are coalesced
+        self.reading = reading
+
+
+class ReadingQueue:
+    """FIFO queue of readings (with the time they were enqueued) bounded by the overflow policy."""
+
+    def __init__(self, maxsize: int, overflow: OverflowPolicy) -> None:
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._items: Deque[_QueuedReading] = deque()
+        # number of items which are not coalesced
+        self._size = 0
+        # number of coalesced items still in the deque, compacted once they outnumber the others
+        self._coalesced = 0
+        # queued items by source, oldest first (coalesce policy only)
+        self._by_source: Dict[str, Deque[_QueuedReading]] = {}
+        self._not_empty = asyncio.Event()
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return not self._size
+
+    def put(self, enqueued: float, reading: MeterReading) -> Tuple[int, int]:
+        """Returns: The number of dropped and of coalesced data points."""
+        dropped = coalesced = 0
+        item = _QueuedReading(enqueued, reading)
+        self._items.append(item)
+        self._size += 1
+        if self._overflow == OverflowPolicy.COALESCE:
+            self._by_source.setdefault(reading.source, deque()).append(item)
+        if self._size > self._maxsize:
+            if self._overflow == OverflowPolicy.DROP_NEWEST:
+                self._items.pop()
+                self._size -= 1
+                dropped = len(reading)
+            else:
+                if self._overflow == OverflowPolicy.COALESCE:
+                    coalesced = self._coalesce(reading)
+                    if self._coalesced > self._size:
+                        self._items = deque(item for item in self._items if item.reading is not None)
+                        self._coalesced = 0
+                if self._size > self._maxsize:
+                    dropped = len(self.get_nowait()[1])
+        self._not_empty.set()
+        return dropped, coalesced
+
+    async def get(self) -> Tuple[float, MeterReading]:
+        while not self._size:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def get_nowait(self) -> Tuple[float, MeterReading]:
+        item = self._items.popleft()
+        while item.reading is None:
+            self._coalesced -= 1
+            item = self._items.popleft()
+        self._size -= 1
+        if self._overflow == OverflowPolicy.COALESCE:
+            queued = self._by_source[item.reading.source]
+            queued.popleft()
+            if not queued:
+                del self._by_source[item.reading.source]
+        return item.enqueued, item.reading
+
+    def _coalesce(self, reading: MeterReading) -> int:
+        """
+        Removes the values of queued readings of the same source which are superseded by `reading`.
+        Readings without remaining values are removed.
+        Returns: The number of removed values.
+        """
+        types = set(reading.types)
+        queued = self._by_source[reading.source]
+        removed = 0
+        for item in list(queued)[:-1]:
+            older = item.reading
+            keep = [index for index, point_type in enumerate(older.types) if point_type not in types]
+            if len(keep) == len(older):
+                continue
+            removed += len(older) - len(keep)
+            if keep:
+                item.reading = MeterReading(older.source, older.timestamp, tuple(older.types[index] for index in keep),
+                                            array("d", (older.values[index] for index in keep)))
+            else:
+                item.reading = None
+                queued.remove(item)
+                self._size -= 1
+                self._coalesced += 1
+        return removed
+
+
+class SinkQueue:
+    """Bounded delivery queue of one sink and its consumer, a slow sink only delays its own readings.
+
+    The consumer is restarted after `RESTART_DELAY` seconds if the sink fails, the failed batch is lost.
+    """
+    RESTART_DELAY = 1.0
+
+    def __init__(self, sink: DataSink, name: str, config: CollectorConfig) -> None:
+        self.sink = sink
+        self.name = name
+        self._config = config
+        self._queue = ReadingQueue(config.queue_size, config.overflow)
+
+    def put(self, reading: MeterReading, enqueued: float) -> None:
+        dropped, coalesced = self._queue.put(enqueued, reading)
+        if dropped:
+            LOGGER.warning("Queue of sink %s is full. %i data points are dropped.", self.name, dropped)
+            METRICS.increment(self.name, "dropped", dropped)
+        if coalesced:
+            LOGGER.debug("Queue of sink %s is full. %i data points are coalesced.", self.name, coalesced)
+            METRICS.increment(self.name, "coalesced", coalesced)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self._consume()
+            except Exception as ex:  # pylint: disable=broad-except
+                LOGGER.error("Sink %s failed. Restarting in %.1fs. '%s'", self.name, self.RESTART_DELAY, ex)
+                METRICS.increment(self.name, "restarts")
+                await asyncio.sleep(self.RESTART_DELAY)
+
+    async def _consume(self) -> None:
+        while True:
+            batch = await self._get_batch()
+            start = time.perf_counter()
+            for enqueued, _ in batch:
+                METRICS.observe(self.name, "queue_wait", start - enqueued)
+            await self.sink.send_batch([reading for _, reading in batch])
+            METRICS.observe(self.name, "send", time.perf_counter() - start)
+            METRICS.increment(self.name, "readings", len(batch))
+            METRICS.increment(self.name, "batches")
+
+    async def _get_batch(self) -> List[Tuple[float, MeterReading]]:
+        """Waits for the next reading and drains all queued readings up to the batch size."""
+        batch = [await self._queue.get()]
+        if self._config.batch_delay > 0 and self._queue.qsize() < self._config.batch_size - 1:
+            await asyncio.sleep(self._config.batch_delay)
+        while len(batch) < self._config.batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+
 class Collector:
-    def __init__(self) -> None:
-        self._queue = asyncio.Queue()
-        self._data_sinks: List[DataSink] = []
+    def __init__(self, config: Optional[CollectorConfig] = None) -> None:
+        self._config = config if config else CollectorConfig()
+        self._sink_queues: List[SinkQueue] = []
 
-    def register_sink(self, sink: DataSink) -> None:
+    def register_sink(self, sink: DataSink, config: Optional[CollectorConfig] = None) -> None:
+        """`config` overrides the queue settings of the collector for this sink."""
         assert isinstance(sink, DataSink)
-        self._data_sinks.append(sink)
+        name = f"{type(sink).__name__}#{len(self._sink_queues)}"
+        self._sink_queues.append(SinkQueue(sink, name, config if config else self._config))
 
-    def notify(self, reader_data_points: List[MeterDataPoint]) -> None:
-        for point in reader_data_points:
-            try:
-                self._queue.put_nowait(point)
-            except QueueFull:
-                LOGGER.warning("Queue is full. Current data points are dropped.")
-                return
+    def notify(self, reading: MeterReading) -> None:
+        enqueued = time.perf_counter()
+        for sink_queue in self._sink_queues:
+            sink_queue.put(reading, enqueued)
 
     async def process_queue(self) -> None:
-        while True:
-            data_point: MeterDataPoint = await self._queue.get()
-            for sink in self._data_sinks:
-                await sink.send(data_point)
+        """Runs the consumers of all sinks."""
+        consumers = [asyncio.create_task(sink_queue.run()) for sink_queue in self._sink_queues]
+        try:
+            await asyncio.gather(*consumers)
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
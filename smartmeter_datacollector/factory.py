@@ -6,12 +6,14 @@
 # See LICENSES/README.md for more information.
 #
 import logging
-from configparser import ConfigParser
-from typing import List
+from configparser import ConfigParser, SectionProxy
+from typing import List, Optional
 
-from .collector import Collector
+from .collector import Collector, CollectorConfig
 from .config import InvalidConfigError
+from .sinks.aggregation import DEFAULT_STATISTICS, AggregatingSink
 from .sinks.data_sink import DataSink
+from .sinks.deadband import DeadbandConfig, DeadbandSink
 from .sinks.logger_sink import LoggerSink
 from .sinks.mqtt_sink import MqttConfig, MqttDataSink
 from .smartmeter.iskraam550 import IskraAM550
@@ -20,6 +22,7 @@ from .smartmeter.lge360 import LGE360
 from .smartmeter.lge450 import LGE450
 from .smartmeter.lge570 import LGE570
 from .smartmeter.meter import Meter, MeterError
+from .smartmeter.reader import ReaderConfig
 
 
 def build_meters(config: ConfigParser) -> List[Meter]:
@@ -33,35 +36,40 @@ def build_meters(config: ConfigParser) -> List[Meter]:
                     port=meter_config.get('port', "/dev/ttyUSB0"),
                     baudrate=meter_config.getint('baudrate', LGE450.BAUDRATE),
                     decryption_key=meter_config.get('key'),
-                    use_system_time=meter_config.getboolean('systemtime', False)
+                    use_system_time=meter_config.getboolean('systemtime', False),
+                    reader_config=ReaderConfig.from_meter_config(meter_config)
                 ))
             elif meter_type == "lge570":
                 meters.append(LGE570(
                     port=meter_config.get('port', "/dev/ttyUSB0"),
                     baudrate=meter_config.getint('baudrate', LGE570.BAUDRATE),
                     decryption_key=meter_config.get('key'),
-                    use_system_time=meter_config.getboolean('systemtime', False)
+                    use_system_time=meter_config.getboolean('systemtime', False),
+                    reader_config=ReaderConfig.from_meter_config(meter_config)
                 ))
             elif meter_type == "lge360":
                 meters.append(LGE360(
                     port=meter_config.get('port', "/dev/ttyUSB0"),
                     baudrate=meter_config.getint('baudrate', LGE360.BAUDRATE),
                     decryption_key=meter_config.get('key'),
-                    use_system_time=meter_config.getboolean('systemtime', False)
+                    use_system_time=meter_config.getboolean('systemtime', False),
+                    reader_config=ReaderConfig.from_meter_config(meter_config)
                 ))
             elif meter_type == "iskraam550":
                 meters.append(IskraAM550(
                     port=meter_config.get('port', "/dev/ttyUSB0"),
                     baudrate=meter_config.getint('baudrate', IskraAM550.BAUDRATE),
                     decryption_key=meter_config.get('key'),
-                    use_system_time=meter_config.getboolean('systemtime', False)
+                    use_system_time=meter_config.getboolean('systemtime', False),
+                    reader_config=ReaderConfig.from_meter_config(meter_config)
                 ))
             elif meter_type == "kamstrup_han":
                 meters.append(KamstrupHAN(
                     port=meter_config.get('port', "/dev/ttyUSB0"),
                     baudrate=meter_config.getint('baudrate', KamstrupHAN.BAUDRATE),
                     decryption_key=meter_config.get('key'),
-                    use_system_time=meter_config.getboolean('systemtime', False)
+                    use_system_time=meter_config.getboolean('systemtime', False),
+                    reader_config=ReaderConfig.from_meter_config(meter_config)
                 ))
             else:
                 raise InvalidConfigError(f"'type' is invalid or missing: {meter_type}")
@@ -77,23 +85,49 @@ def build_sinks(config: ConfigParser) -> List[DataSink]:
         sink_config = config[section_name]
         sink_type = sink_config.get('type')
 
+        sink: DataSink
         if sink_type == "logger":
-            sinks.append(LoggerSink(
+            sink = LoggerSink(
                 logger_name=sink_config.get('name', "DataLogger")
-            ))
+            )
         elif sink_type == "mqtt":
             mqtt_config = MqttConfig.from_sink_config(sink_config)
-            sinks.append(MqttDataSink(mqtt_config))
+            sink = MqttDataSink(mqtt_config)
         else:
             raise InvalidConfigError(f"'type' is invalid or missing: {sink_type}")
+        sinks.append(build_sink_stages(sink, sink_config))
     return sinks
 
 
-def build_collector(readers: List[Meter], sinks: List[DataSink]) -> Collector:
-    collector = Collector()
+def build_sink_stages(sink: DataSink, sink_config: SectionProxy) -> DataSink:
+    """Wraps the sink into the processing stages configured in its section (aggregation, then deadband)."""
+    try:
+        deadband_config = DeadbandConfig.from_sink_config(sink_config)
+    except ValueError as ex:
+        raise InvalidConfigError(str(ex)) from ex
+    if deadband_config.enabled:
+        sink = DeadbandSink(sink, deadband_config)
 
-    for sink in sinks:
-        collector.register_sink(sink)
+    window = sink_config.getfloat('aggregation_window', 0.0)
+    if window > 0:
+        statistics = [s.strip() for s in sink_config.get('aggregation_statistics', ",".join(DEFAULT_STATISTICS))
+                      .split(",") if s.strip()]
+        try:
+            sink = AggregatingSink(sink, window, statistics)
+        except ValueError as ex:
+            raise InvalidConfigError(str(ex)) from ex
+    return sink
+
+
+def build_collector(readers: List[Meter], sinks: List[DataSink], config: Optional[ConfigParser] = None) -> Collector:
+    collector_config = CollectorConfig.from_config(config) if config else CollectorConfig()
+    collector = Collector(collector_config)
+
+    # build_sinks creates one sink per sink section in the same order
+    sink_sections = [config[sec] for sec in config.sections() if sec.startswith("sink")] if config else []
+    for index, sink in enumerate(sinks):
+        sink_config = collector_config.for_sink(sink_sections[index]) if index < len(sink_sections) else None
+        collector.register_sink(sink, sink_config)
     for reader in readers:
         reader.register(collector)
     return collector
@@ -0,0 +1,161 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+import json
+import logging
+import os
+from bisect import bisect_left
+from configparser import ConfigParser
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+LOGGER = logging.getLogger("metrics")
+
+# upper bounds of the latency histogram buckets in seconds
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, quantile: float) -> float:
+        """Returns: Upper bound of the bucket containing the quantile (or the maximum for the last bucket)."""
+        rank = quantile * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if count and cumulative >= rank:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max
+        return 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = {str(bound): count for bound, count in zip(LATENCY_BUCKETS, self.counts) if count}
+        if self.counts[-1]:
+            buckets["inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+class Metrics:
+    """Latency histograms and counters of the hot path per meter and per sink.
+
+    Metrics are disabled by default, recording is then a no-op. Durations should be measured
+    with `time.perf_counter()`.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, str], int] = {}
+
+    def observe(self, source: str, stage: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        histogram = self._histograms.get((source, stage), None)
+        if histogram is None:
+            histogram = self._histograms[(source, stage)] = Histogram()
+        histogram.observe(seconds)
+
+    def increment(self, source: str, name: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        key = (source, name)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def clear(self) -> None:
+        self._histograms.clear()
+        self._counters.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns: Histograms and counters grouped by source (meter or sink)."""
+        sources: Dict[str, Dict[str, Any]] = {}
+        for (source, stage), histogram in sorted(self._histograms.items()):
+            sources.setdefault(source, {}).setdefault("latency", {})[stage] = histogram.snapshot()
+        for (source, name), value in sorted(self._counters.items()):
+            sources.setdefault(source, {}).setdefault("counters", {})[name] = value
+        return sources
+
+
+METRICS = Metrics()
+
+
+@dataclass
+class MetricsConfig:
+    enabled: bool = False
+    interval: float = 60.0
+    path: Optional[str] = None
+
+    @staticmethod
+    def from_config(config: ConfigParser) -> "MetricsConfig":
+        if not config.has_section("metrics"):
+            return MetricsConfig()
+        metrics_config = config["metrics"]
+        return MetricsConfig(
+            enabled=metrics_config.getboolean("enabled", False),
+            interval=metrics_config.getfloat("interval", 60.0),
+            path=metrics_config.get("path") or None
+        )
+
+
+class MetricsReporter:
+    """Periodically logs a snapshot of the metrics (logger "metrics", level INFO) and optionally writes it to a file."""
+
+    def __init__(self, config: MetricsConfig, metrics: Metrics = METRICS) -> None:
+        self._config = config
+        self._metrics = metrics
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self._config.interval)
+            self.report()
+
+    def report(self) -> None:
+        snapshot = self._metrics.snapshot()
+        LOGGER.info("%s", json.dumps(snapshot))
+        if self._config.path:
+            try:
+                # replace atomically so readers never see a partially written file
+                with open(self._config.path + ".tmp", "w", encoding="utf-8") as metrics_file:
+                    json.dump(snapshot, metrics_file, indent=2)
+                os.replace(self._config.path + ".tmp", self._config.path)
+            except OSError as ex:
+                LOGGER.warning("Unable to write metrics to '%s'. '%s'", self._config.path, ex)
+
+
+def build_reporters(config: ConfigParser, path_suffix: str = "") -> List[MetricsReporter]:
+    """Enables the metrics if configured. Returns: The reporter to run (if enabled)."""
+    metrics_config = MetricsConfig.from_config(config)
+    METRICS.enabled = metrics_config.enabled
+    if not metrics_config.enabled:
+        return []
+    if metrics_config.path and path_suffix:
+        metrics_config.path += path_suffix
+    return [MetricsReporter(metrics_config)]
@@ -0,0 +1,158 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+import logging
+import multiprocessing
+import pickle
+from array import array
+from configparser import ConfigParser
+from multiprocessing.connection import Connection
+from typing import Dict, List, Optional, Union
+
+from .collector import Collector
+from .smartmeter.meter_data import (BUILTIN_TYPE_COUNT, DATA_POINT_TYPES, MeterDataPointType, MeterReading,
+                                    portable_timestamp)
+from .supervisor import ReaderSupervisor
+
+LOGGER = logging.getLogger("collector")
+
+
+def get_worker_count(config: ConfigParser) -> int:
+    return config.getint("sharding", "workers", fallback=1)
+
+
+def partition_reader_sections(config: ConfigParser, workers: int) -> List[List[str]]:
+    """Distributes all [readerN] sections round-robin over at most `workers` partitions."""
+    sections = [sec for sec in config.sections() if sec.startswith("reader")]
+    partitions = [sections[index::workers] for index in range(workers)]
+    return [partition for partition in partitions if partition]
+
+
+def _encode_type(point_type: MeterDataPointType) -> Union[int, MeterDataPointType]:
+    type_id = DATA_POINT_TYPES.id_of(point_type)
+    return type_id if type_id is not None and type_id < BUILTIN_TYPE_COUNT else point_type
+
+
+def encode_reading(reading: MeterReading) -> bytes:
+    """
+    Encodes a reading compactly for the transfer between processes.
+    Builtin data point types are referenced by their id only. Custom types and types registered later
+    (e.g. derived by a sink stage) have process dependent ids and are pickled as objects.
+    """
+    types = tuple(map(_encode_type, reading.types))
+    return pickle.dumps((reading.source, portable_timestamp(reading.timestamp), types, reading.values.tobytes()),
+                        pickle.HIGHEST_PROTOCOL)
+
+
+def decode_reading(data: bytes) -> MeterReading:
+    source, timestamp, types, values = pickle.loads(data)
+    types = tuple(DATA_POINT_TYPES.get(point_type) if isinstance(point_type, int) else point_type
+                  for point_type in types)
+    return MeterReading(source, timestamp, types, array("d", values))
+
+
+class _BatchForwarder:
+    def __init__(self, conn: Connection) -> None:
+        self._conn = conn
+
+    def notify(self, reading: MeterReading) -> None:
+        if reading:
+            self._conn.send_bytes(encode_reading(reading))
+
+
+def run_worker(config_dict: Dict[str, Dict[str, str]], conn: Connection) -> None:
+    """Entry point of a worker process reading the meters of its [readerN] sections."""
+    # pylint: disable=import-outside-toplevel
+    from . import factory, metrics
+    from .app import set_logging_levels
+
+    worker_config = ConfigParser()
+    worker_config.read_dict(config_dict)
+    set_logging_levels(worker_config)
+    # each worker records the metrics of its own meters
+    reporters = metrics.build_reporters(worker_config, f".{multiprocessing.current_process().name}")
+
+    meters = factory.build_meters(worker_config)
+    forwarder = _BatchForwarder(conn)
+    for meter in meters:
+        meter.register(forwarder)
+
+    supervisors = [ReaderSupervisor(meter, f"{type(meter).__name__}#{index}")
+                   for index, meter in enumerate(meters)]
+
+    async def read_meters() -> None:
+        await asyncio.gather(*[supervisor.run() for supervisor in supervisors],
+                             *[reporter.run() for reporter in reporters])
+
+    try:
+        asyncio.run(read_meters())
+    except KeyboardInterrupt:
+        pass
+
+
+class WorkerShard:
+    """Runs the readers of some [readerN] sections in a separate process and forwards their data to the collector."""
+    RESTART_DELAY = 5.0
+
+    def __init__(self, index: int, config_dict: Dict[str, Dict[str, str]], collector: Collector) -> None:
+        self._name = f"worker{index}"
+        self._config_dict = config_dict
+        self._collector = collector
+        self._process: Optional[multiprocessing.Process] = None
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context("spawn")
+        while True:
+            recv_conn, send_conn = context.Pipe(duplex=False)
+            self._process = context.Process(target=run_worker, name=self._name,
+                                            args=(self._config_dict, send_conn), daemon=True)
+            self._process.start()
+            send_conn.close()
+            LOGGER.info("Started %s (pid %i) for %s.", self._name, self._process.pid,
+                        [sec for sec in self._config_dict if sec.startswith("reader")])
+
+            closed = loop.create_future()
+            loop.add_reader(recv_conn.fileno(), self._receive, recv_conn, closed)
+            try:
+                await closed
+            finally:
+                loop.remove_reader(recv_conn.fileno())
+                recv_conn.close()
+            self._process.join(0)
+            LOGGER.error("%s exited (exit code %s). Restarting in %.0fs.",
+                         self._name, self._process.exitcode, self.RESTART_DELAY)
+            await asyncio.sleep(self.RESTART_DELAY)
+
+    def stop(self) -> None:
+        if self._process and self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+
+    def _receive(self, conn: Connection, closed: asyncio.Future) -> None:
+        try:
+            data = conn.recv_bytes()
+        except (EOFError, OSError):
+            if not closed.done():
+                closed.set_result(None)
+            return
+        try:
+            reading = decode_reading(data)
+        except (pickle.UnpicklingError, TypeError, ValueError, KeyError, IndexError, EOFError) as ex:
+            LOGGER.error("Invalid reading received from %s is dropped. '%s'", self._name, ex)
+            return
+        self._collector.notify(reading)
+
+
+def build_shards(config: ConfigParser, collector: Collector) -> List[WorkerShard]:
+    shared_sections = [sec for sec in config.sections() if not sec.startswith(("reader", "sink"))]
+    shards = []
+    for index, partition in enumerate(partition_reader_sections(config, get_worker_count(config))):
+        config_dict = {sec: dict(config[sec]) for sec in partition + shared_sections}
+        shards.append(WorkerShard(index, config_dict, collector))
+    return shards
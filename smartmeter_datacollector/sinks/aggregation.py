@@ -0,0 +1,172 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+import logging
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..metrics import METRICS
+from ..smartmeter.meter_data import MeterDataPointType, MeterReading
+from .data_sink import DataSink, SinkStage
+
+LOGGER = logging.getLogger("sink")
+
+STATISTICS = ("count", "min", "max", "mean", "last")
+DEFAULT_STATISTICS = ("min", "max", "mean", "last")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class WindowStatistics:
+    __slots__ = ("count", "min", "max", "total", "last")
+
+    def __init__(self, value: float) -> None:
+        self.count = 1
+        self.min = value
+        self.max = value
+        self.total = value
+        self.last = value
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.total += value
+        self.last = value
+
+    def get(self, statistic: str) -> float:
+        if statistic == "mean":
+            return self.total / self.count
+        return float(getattr(self, statistic))
+
+
+class _Window:
+    """Statistics of one source within a window."""
+    __slots__ = ("start", "statistics", "received")
+
+    def __init__(self, start: datetime) -> None:
+        self.start = start
+        self.statistics: Dict[MeterDataPointType, WindowStatistics] = {}
+        # monotonic time of the last reading
+        self.received = time.monotonic()
+
+
+class AggregatingSink(SinkStage):
+    """Aggregates the readings per source and data point type over tumbling windows.
+
+    Only the statistics of complete windows are passed to the sink, as data point types `<TYPE>_<STATISTIC>`
+    with the end of the window as timestamp. Windows are aligned to multiples of the window length and based
+    on the timestamps of the readings. A window is complete when a later reading of its source arrives or when
+    its source did not send for two window lengths, which is checked once per window length after start.
+    Windows are tracked per source, so the clock of one meter does not affect the windows of others.
+    Late readings of an already passed window are dropped. Open windows are passed on stop.
+    """
+
+    def __init__(self, sink: DataSink, window: float, statistics: Sequence[str] = DEFAULT_STATISTICS) -> None:
+        super().__init__(sink)
+        invalid = [statistic for statistic in statistics if statistic not in STATISTICS]
+        if window <= 0 or not statistics or invalid:
+            raise ValueError(f"Invalid aggregation: window {window}, statistics {', '.join(statistics)}")
+        self._window = timedelta(seconds=window)
+        self._statistics = tuple(statistics)
+        self._windows: Dict[str, _Window] = {}
+        # end of the last passed window by source, older readings are late
+        self._watermarks: Dict[str, datetime] = {}
+        self._derived_types: Dict[MeterDataPointType, Tuple[MeterDataPointType, ...]] = {}
+        # windows are passed on by the timer and by send_batch, one at a time
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        await super().start()
+        self._timer = asyncio.ensure_future(self._close_idle_windows_periodically())
+
+    async def stop(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+            await asyncio.wait((self._timer,))
+            self._timer = None
+        async with self._lock:
+            complete = [self._close(source) for source in list(self._windows)]
+            if complete:
+                await self._sink.send_batch(complete)
+        await super().stop()
+
+    async def send_batch(self, readings: List[MeterReading]) -> None:
+        async with self._lock:
+            complete = self._add(readings)
+            complete.extend(self._close_idle_windows())
+            if complete:
+                await self._sink.send_batch(complete)
+
+    async def _close_idle_windows_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._window.total_seconds())
+            async with self._lock:
+                complete = self._close_idle_windows()
+                if not complete:
+                    continue
+                try:
+                    await self._sink.send_batch(complete)
+                except Exception as ex:  # pylint: disable=broad-except
+                    LOGGER.error("Unable to pass %i aggregates of idle sources. '%s'", len(complete), ex)
+
+    def _add(self, readings: List[MeterReading]) -> List[MeterReading]:
+        """Returns: The windows completed by the readings."""
+        complete = []
+        for reading in readings:
+            start = self._window_start(reading.timestamp)
+            if start < self._watermarks.get(reading.source, _EPOCH):
+                LOGGER.debug("Late reading of '%s' at %s is dropped.", reading.source, reading.timestamp)
+                METRICS.increment(reading.source, "late_dropped")
+                continue
+            window = self._windows.get(reading.source, None)
+            if window is not None and window.start != start:
+                complete.append(self._close(reading.source))
+                window = None
+            if window is None:
+                window = self._windows[reading.source] = _Window(start)
+            window.received = time.monotonic()
+            for point_type, value in zip(reading.types, reading.values):
+                statistics = window.statistics.get(point_type, None)
+                if statistics is None:
+                    window.statistics[point_type] = WindowStatistics(value)
+                else:
+                    statistics.add(value)
+        return complete
+
+    def _close_idle_windows(self) -> List[MeterReading]:
+        """Returns: The windows of sources which stopped sending."""
+        idle = time.monotonic() - 2 * self._window.total_seconds()
+        return [self._close(source) for source, window in list(self._windows.items()) if window.received <= idle]
+
+    def _window_start(self, timestamp: datetime) -> datetime:
+        return timestamp - (timestamp - _EPOCH) % self._window
+
+    def _close(self, source: str) -> MeterReading:
+        window = self._windows.pop(source)
+        end = self._watermarks[source] = window.start + self._window
+        types: List[MeterDataPointType] = []
+        values = array("d")
+        for point_type, statistics in window.statistics.items():
+            types.extend(self._get_derived_types(point_type))
+            values.extend(statistics.get(statistic) for statistic in self._statistics)
+        return MeterReading(source, end, tuple(types), values)
+
+    def _get_derived_types(self, point_type: MeterDataPointType) -> Tuple[MeterDataPointType, ...]:
+        derived = self._derived_types.get(point_type, None)
+        if derived is None:
+            derived = self._derived_types[point_type] = tuple(
+                MeterDataPointType(f"{point_type.identifier}_{statistic.upper()}", f"{point_type.name} ({statistic})",
+                                   "" if statistic == "count" else point_type.unit)
+                for statistic in self._statistics)
+        return derived
@@ -6,8 +6,9 @@
 # See LICENSES/README.md for more information.
 #
 from abc import ABC, abstractmethod
+from typing import List
 
-from ..smartmeter.meter_data import MeterDataPoint
+from ..smartmeter.meter_data import MeterDataPoint, MeterReading
 
 
 class DataSink(ABC):
@@ -22,3 +23,36 @@ class DataSink(ABC):
     @abstractmethod
     async def send(self, data_point: MeterDataPoint) -> None:
         raise NotImplementedError()
+
+    async def send_reading(self, reading: MeterReading) -> None:
+        """Sends all data points of a reading. Sinks handling complete readings override this method."""
+        for data_point in reading:
+            await self.send(data_point)
+
+    async def send_batch(self, readings: List[MeterReading]) -> None:
+        """Sends the readings queued since the last call. Sinks writing in bulk override this method."""
+        for reading in readings:
+            await self.send_reading(reading)
+
+
+class SinkStage(DataSink):
+    """Processing stage in front of a sink, e.g. to aggregate or filter the readings before passing them on."""
+
+    def __init__(self, sink: DataSink) -> None:
+        self._sink = sink
+
+    async def start(self) -> None:
+        await self._sink.start()
+
+    async def stop(self) -> None:
+        await self._sink.stop()
+
+    async def send(self, data_point: MeterDataPoint) -> None:
+        await self.send_batch([MeterReading.from_data_points([data_point])])
+
+    async def send_reading(self, reading: MeterReading) -> None:
+        await self.send_batch([reading])
+
+    @abstractmethod
+    async def send_batch(self, readings: List[MeterReading]) -> None:
+        raise NotImplementedError()
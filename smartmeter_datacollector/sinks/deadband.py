@@ -0,0 +1,106 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+from array import array
+from configparser import SectionProxy
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from ..smartmeter.meter_data import MeterDataPointType, MeterReading
+from .data_sink import DataSink, SinkStage
+
+
+@dataclass(frozen=True)
+class Deadband:
+    # changes up to the larger of both bands are suppressed
+    absolute: float = 0.0
+    # relative to the last passed value
+    relative: float = 0.0
+
+    def contains(self, last: float, value: float) -> bool:
+        return abs(value - last) <= max(self.absolute, self.relative * abs(last))
+
+    @staticmethod
+    def from_string(value: str) -> "Deadband":
+        """Parses `<absolute>[, <relative>]`."""
+        parts = [float(part) for part in value.split(",")]
+        if not 1 <= len(parts) <= 2 or any(part < 0 for part in parts):
+            raise ValueError(f"Invalid deadband: {value}")
+        return Deadband(*parts)
+
+
+@dataclass
+class DeadbandConfig:
+    default: Deadband = Deadband()
+    # deadbands by data point type identifier
+    types: Dict[str, Deadband] = field(default_factory=dict)
+    # seconds after which a value is passed even if it did not change (0: never)
+    max_silence: float = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        # with max_silence only, unchanged values are suppressed
+        return self.default != Deadband() or bool(self.types) or self.max_silence > 0
+
+    @staticmethod
+    def from_sink_config(config: SectionProxy) -> "DeadbandConfig":
+        types = {}
+        for option, value in config.items():
+            if option.startswith("deadband."):
+                types[option[len("deadband."):].upper()] = Deadband.from_string(value)
+        return DeadbandConfig(
+            default=Deadband(config.getfloat("deadband_absolute", 0.0), config.getfloat("deadband_relative", 0.0)),
+            types=types,
+            max_silence=config.getfloat("deadband_max_silence", 0.0)
+        )
+
+
+class DeadbandSink(SinkStage):
+    """Passes a value only if it left the deadband around the last passed value of its source and type
+    (report by exception). Unchanged values are passed again after `max_silence` as heartbeat."""
+
+    def __init__(self, sink: DataSink, config: DeadbandConfig) -> None:
+        super().__init__(sink)
+        self._config = config
+        self._max_silence = timedelta(seconds=config.max_silence) if config.max_silence > 0 else None
+        # last passed value and its timestamp by source and type
+        self._last: Dict[Tuple[str, MeterDataPointType], Tuple[float, datetime]] = {}
+        self._deadbands: Dict[MeterDataPointType, Deadband] = {}
+
+    async def send_batch(self, readings: List[MeterReading]) -> None:
+        passed = []
+        for reading in readings:
+            filtered = self._filter(reading)
+            if filtered:
+                passed.append(filtered)
+        if passed:
+            await self._sink.send_batch(passed)
+
+    def _filter(self, reading: MeterReading) -> Optional[MeterReading]:
+        keep = []
+        for index, (point_type, value) in enumerate(zip(reading.types, reading.values)):
+            key = (reading.source, point_type)
+            last = self._last.get(key, None)
+            if last is not None and self._get_deadband(point_type).contains(last[0], value):
+                if self._max_silence is None or reading.timestamp - last[1] < self._max_silence:
+                    continue
+            self._last[key] = (value, reading.timestamp)
+            keep.append(index)
+        if len(keep) == len(reading):
+            return reading
+        if not keep:
+            return None
+        return MeterReading(reading.source, reading.timestamp, tuple(reading.types[index] for index in keep),
+                            array("d", (reading.values[index] for index in keep)))
+
+    def _get_deadband(self, point_type: MeterDataPointType) -> Deadband:
+        deadband = self._deadbands.get(point_type, None)
+        if deadband is None:
+            deadband = self._deadbands[point_type] = self._config.types.get(point_type.identifier,
+                                                                            self._config.default)
+        return deadband
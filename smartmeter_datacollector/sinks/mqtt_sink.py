@@ -10,15 +10,16 @@ import logging
 import ssl
 from configparser import SectionProxy
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 
 from asyncio_mqtt import Client
 from asyncio_mqtt.client import ProtocolVersion
 from asyncio_mqtt.error import MqttCodeError, MqttError
 from paho.mqtt.client import MQTT_ERR_NO_CONN
 
-from ..smartmeter.meter_data import MeterDataPoint
+from ..smartmeter.meter_data import MeterDataPoint, MeterReading
 from .data_sink import DataSink
+from .spool import Spool
 
 LOGGER = logging.getLogger("sink")
 
@@ -36,6 +37,8 @@ class MqttConfig:
     check_hostname: bool = True
     client_cert_path: Optional[str] = None
     client_key_path: Optional[str] = None
+    spool_dir: Optional[str] = None
+    spool_max_size: int = 64 * 1024 * 1024
 
     def with_tls(self, ca_cert_path: Optional[str] = None, check_hostname: bool = True) -> "MqttConfig":
         self.use_tls = True
@@ -54,6 +57,11 @@ class MqttConfig:
         self.client_key_path = key_path
         return self
 
+    def with_spool(self, spool_dir: str, spool_max_size: int = 64 * 1024 * 1024) -> "MqttConfig":
+        self.spool_dir = spool_dir
+        self.spool_max_size = spool_max_size
+        return self
+
     @staticmethod
     def from_sink_config(config: SectionProxy) -> "MqttConfig":
         mqtt_cfg = MqttConfig(config.get("host"), config.getint("port", 1883))
@@ -68,11 +76,15 @@ class MqttConfig:
                 config.get("client_cert_path"),
                 config.get("client_key_path")
             )
+        if config.get("spool_dir"):
+            mqtt_cfg.with_spool(config.get("spool_dir"), config.getint("spool_max_size", mqtt_cfg.spool_max_size))
         return mqtt_cfg
 
 
 class MqttDataSink(DataSink):
     TIMEOUT = 3
+    # spooled readings replayed per batch
+    SPOOL_REPLAY_SIZE = 100
 
     def __init__(self, config: MqttConfig) -> None:
         tls_context = None
@@ -97,6 +109,10 @@ class MqttDataSink(DataSink):
             clean_session=True,
             **user_pass_auth)
 
+        self._spool: Optional[Spool] = None
+        if config.spool_dir:
+            self._spool = Spool(config.spool_dir, config.spool_max_size, name=f"spool {config.spool_dir}")
+
     @staticmethod
     def _build_ssl_context(
         ca_file_path: Optional[str] = None,
@@ -123,15 +139,54 @@ class MqttDataSink(DataSink):
     async def stop(self) -> None:
         await self._disconnect_from_server()
         LOGGER.info("Disconnected from MQTT broker.")
+        if self._spool:
+            self._spool.close()
 
     async def send(self, data_point: MeterDataPoint) -> None:
+        await self._publish(data_point)
+
+    async def send_batch(self, readings: List[MeterReading]) -> None:
+        """
+        Readings which cannot be delivered are stored in the spool (if configured) and replayed in order
+        once the broker is reachable again. Delivery is at least once, a partially sent reading is replayed completely.
+        """
+        if self._spool is None:
+            await super().send_batch(readings)
+            return
+        for index, reading in enumerate(readings):
+            if not await self._publish_reading(reading):
+                LOGGER.warning("MQTT broker not reachable. %i readings are spooled.", len(readings) - index)
+                self._spool.append(readings[index:])
+                return
+        if len(self._spool):
+            await self._replay_spool()
+
+    async def _replay_spool(self) -> None:
+        # limited per batch, so live data is not delayed by a large spool
+        readings = self._spool.peek(self.SPOOL_REPLAY_SIZE)
+        for reading in readings:
+            if not await self._publish_reading(reading):
+                return
+        self._spool.commit()
+        LOGGER.info("%i spooled readings sent to MQTT broker.", len(readings))
+
+    async def _publish_reading(self, reading: MeterReading) -> bool:
+        for data_point in reading:
+            if not await self._publish(data_point):
+                return False
+        return True
+
+    async def _publish(self, data_point: MeterDataPoint) -> bool:
+        """Returns: False if the broker is not reachable. Invalid data points are not sent but count as delivered."""
         topic = MqttDataSink.get_topic_name_for_datapoint(data_point)
         dp_json = self.data_point_to_mqtt_json(data_point)
         try:
             await self._client.publish(topic, dp_json)
             LOGGER.debug("%s sent to MQTT broker.", dp_json)
+            return True
         except ValueError as ex:
             LOGGER.error("MQTT payload or topic is invalid: '%s'", ex)
+            return True
         except MqttCodeError as ex:
             if ex.rc == MQTT_ERR_NO_CONN:
                 if await self._connect_to_server():
@@ -139,12 +194,14 @@ class MqttDataSink(DataSink):
                     try:
                         await self._client.publish(topic, dp_json)
                         LOGGER.debug("%s sent to MQTT broker.", dp_json)
+                        return True
                     except MqttError:
                         LOGGER.warning("MQTT message not sent.")
             else:
                 LOGGER.error("MQTT message sending error: '%s'", ex)
         except MqttError as ex:
             LOGGER.error("MQTT message sending error: '%s'", ex)
+        return False
 
     async def _connect_to_server(self) -> bool:
         try:
@@ -0,0 +1,210 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import logging
+import os
+import pickle
+import struct
+from array import array
+from collections import OrderedDict
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from ..metrics import METRICS
+from ..smartmeter.meter_data import MeterDataPointType, MeterDataPointTypes, MeterReading, portable_timestamp
+
+LOGGER = logging.getLogger("sink")
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".spool"
+QUARANTINE_SUFFIX = ".corrupt"
+RECORD_HEADER = struct.Struct(">I")
+
+# builtin types are stored by their identifier which is stable between versions
+_BUILTIN_TYPES: Dict[str, MeterDataPointType] = {t.value.identifier: t.value for t in MeterDataPointTypes}
+
+
+def encode_record(reading: MeterReading) -> bytes:
+    types = tuple(point_type.identifier if _BUILTIN_TYPES.get(point_type.identifier) == point_type else point_type
+                  for point_type in reading.types)
+    payload = pickle.dumps((reading.source, portable_timestamp(reading.timestamp), types, reading.values.tobytes()),
+                           pickle.HIGHEST_PROTOCOL)
+    return RECORD_HEADER.pack(len(payload)) + payload
+
+
+def decode_record(payload: bytes) -> MeterReading:
+    """Raises: ValueError if the record is invalid."""
+    try:
+        source, timestamp, types, values = pickle.loads(payload)
+        types = tuple(_BUILTIN_TYPES[point_type] if isinstance(point_type, str) else point_type
+                      for point_type in types)
+        return MeterReading(source, timestamp, types, array("d", values))
+    except (pickle.UnpicklingError, ValueError, TypeError, KeyError, EOFError, AttributeError) as ex:
+        raise ValueError(f"Invalid spool record. '{ex}'") from ex
+
+
+class Spool:
+    """Persistent FIFO of readings a sink was unable to deliver.
+
+    Readings are appended to segment files in `directory`, a new segment is started once the current
+    one exceeds `segment_size` bytes. Readings are replayed oldest first with `peek` and `commit`, a segment
+    is removed once all of its readings are committed. If the spool exceeds `max_size` bytes the oldest
+    segments are evicted. Segments left from a previous run are replayed from their start. Segments with
+    invalid records are renamed to `*.corrupt` and not replayed.
+    """
+
+    def __init__(self, directory: str, max_size: int = 64 * 1024 * 1024, segment_size: int = 1024 * 1024,
+                 name: str = "spool") -> None:
+        """`name` identifies the spool in the metrics."""
+        self._directory = directory
+        self._max_size = max_size
+        self._segment_size = segment_size
+        self._name = name
+        self._file: Optional[BinaryIO] = None
+        # position of the next uncommitted record in the oldest segment
+        self._read_offset = 0
+        # end position of the peeked records and whether the oldest segment is then completely read
+        self._peeked: Optional[Tuple[int, bool]] = None
+        # sizes of the segments by sequence number, oldest first
+        self._segments: "OrderedDict[int, int]" = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+        for file_name in sorted(os.listdir(directory)):
+            if file_name.startswith(SEGMENT_PREFIX) and file_name.endswith(SEGMENT_SUFFIX):
+                try:
+                    sequence = int(file_name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+                except ValueError:
+                    continue
+                self._segments[sequence] = os.path.getsize(self._path(sequence))
+        if self._segments:
+            LOGGER.info("Spool '%s' contains %i bytes from a previous run.", directory, self.size)
+
+    def __len__(self) -> int:
+        """Returns: The number of segments."""
+        return len(self._segments)
+
+    @property
+    def size(self) -> int:
+        return sum(self._segments.values())
+
+    def append(self, readings: List[MeterReading]) -> None:
+        data = b"".join(encode_record(reading) for reading in readings)
+        if not data:
+            return
+        try:
+            if self._file is None or self._segments[self._current] >= self._segment_size:
+                self._start_segment()
+            self._file.write(data)
+            self._file.flush()
+        except OSError as ex:
+            LOGGER.error("Unable to write to spool '%s'. %i readings are lost. '%s'",
+                         self._directory, len(readings), ex)
+            self._close_segment()
+            return
+        self._segments[self._current] += len(data)
+        METRICS.increment(self._name, "spooled", len(readings))
+        self._evict()
+
+    def peek(self, max_records: int) -> List[MeterReading]:
+        """Returns: Up to `max_records` readings of the oldest segment, which are not removed until `commit`."""
+        self._peeked = None
+        if not self._segments:
+            return []
+        sequence = next(iter(self._segments))
+        readings = []
+        try:
+            with open(self._path(sequence), "rb") as segment:
+                segment.seek(self._read_offset)
+                offset = self._read_offset
+                while len(readings) < max_records:
+                    header = segment.read(RECORD_HEADER.size)
+                    if len(header) < RECORD_HEADER.size:
+                        break
+                    length, = RECORD_HEADER.unpack(header)
+                    payload = segment.read(length)
+                    if len(payload) < length:
+                        # interrupted write, the remainder of the segment is unusable
+                        break
+                    readings.append(decode_record(payload))
+                    offset += RECORD_HEADER.size + length
+                exhausted = len(readings) < max_records
+        except OSError as ex:
+            LOGGER.error("Unable to read spool segment %i. '%s'", sequence, ex)
+            return []
+        except ValueError as ex:
+            self._quarantine_oldest(ex)
+            return []
+        self._peeked = (offset, exhausted)
+        return readings
+
+    def commit(self) -> None:
+        """Removes the readings returned by the last `peek`."""
+        if self._peeked is None:
+            return
+        offset, exhausted = self._peeked
+        self._peeked = None
+        sequence = next(iter(self._segments))
+        appended = self._file is not None and sequence == self._current and self._segments[sequence] > offset
+        if exhausted and not appended:
+            self.remove_oldest()
+        else:
+            self._read_offset = offset
+
+    def remove_oldest(self) -> None:
+        if not self._segments:
+            return
+        sequence = next(iter(self._segments))
+        if self._file is not None and sequence == self._current:
+            self._close_segment()
+        del self._segments[sequence]
+        self._read_offset = 0
+        self._peeked = None
+        try:
+            os.remove(self._path(sequence))
+        except OSError as ex:
+            LOGGER.error("Unable to remove spool segment %i. '%s'", sequence, ex)
+
+    def close(self) -> None:
+        self._close_segment()
+
+    @property
+    def _current(self) -> int:
+        return next(reversed(self._segments))
+
+    def _path(self, sequence: int) -> str:
+        return os.path.join(self._directory, f"{SEGMENT_PREFIX}{sequence:010d}{SEGMENT_SUFFIX}")
+
+    def _start_segment(self) -> None:
+        self._close_segment()
+        sequence = self._current + 1 if self._segments else 0
+        self._file = open(self._path(sequence), "ab")  # pylint: disable=consider-using-with
+        self._segments[sequence] = 0
+
+    def _close_segment(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _quarantine_oldest(self, reason: Exception) -> None:
+        sequence = next(iter(self._segments))
+        if self._file is not None and sequence == self._current:
+            self._close_segment()
+        del self._segments[sequence]
+        self._read_offset = 0
+        path = self._path(sequence)
+        LOGGER.error("Spool segment %i contains invalid records and is kept as '%s'. %s",
+                     sequence, path + QUARANTINE_SUFFIX, reason)
+        try:
+            os.replace(path, path + QUARANTINE_SUFFIX)
+        except OSError as ex:
+            LOGGER.error("Unable to quarantine spool segment %i. '%s'", sequence, ex)
+
+    def _evict(self) -> None:
+        while len(self._segments) > 1 and self.size > self._max_size:
+            sequence = next(iter(self._segments))
+            LOGGER.warning("Spool '%s' is full. Oldest segment %i with %i bytes is evicted.",
+                           self._directory, sequence, self._segments[sequence])
+            METRICS.increment(self._name, "evicted_bytes", self._segments[sequence])
+            self.remove_oldest()
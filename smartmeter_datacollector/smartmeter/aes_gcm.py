@@ -0,0 +1,140 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+
+from gurux_dlms import GXByteBuffer
+from gurux_dlms.AesGcmParameter import AesGcmParameter
+from gurux_dlms.GXDLMSChippering import GXDLMSChippering
+
+from .fast_path import read_length
+
+try:
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:
+    Cipher = None
+
+LOGGER = logging.getLogger("smartmeter")
+
+GENERAL_GLO_CIPHERING_TAG = 0xDB
+SECURITY_AUTHENTICATION = 0x10
+SECURITY_ENCRYPTION = 0x20
+SECURITY_SUITE_MASK = 0x0F
+SYSTEM_TITLE_SIZE = 8
+AUTHENTICATION_TAG_SIZE = 12
+# gurux default, gurux does not verify the tag
+GURUX_AUTHENTICATION_KEY = bytes(range(0xD0, 0xE0))
+
+BACKEND_AUTO = "auto"
+BACKEND_CRYPTOGRAPHY = "cryptography"
+BACKEND_GURUX = "gurux"
+
+
+@dataclass
+class CipheredApdu:
+    system_title: bytes
+    security_control: int
+    invocation_counter: bytes
+    ciphertext: bytes
+    tag: Optional[bytes]
+
+    @staticmethod
+    def from_general_glo_ciphering(apdu: bytes) -> "CipheredApdu":
+        if not apdu or apdu[0] != GENERAL_GLO_CIPHERING_TAG:
+            raise ValueError("APDU is no general-glo-ciphering.")
+        title_length, pos = read_length(apdu, 1)
+        system_title = apdu[pos:pos + title_length]
+        length, pos = read_length(apdu, pos + title_length)
+        content = apdu[pos:pos + length]
+        if len(system_title) != SYSTEM_TITLE_SIZE or len(content) != length or length < 5:
+            raise ValueError("Invalid general-glo-ciphering APDU.")
+        security_control = content[0]
+        if security_control & SECURITY_SUITE_MASK != 0:
+            raise ValueError("Unsupported security suite.")
+        if not security_control & SECURITY_ENCRYPTION:
+            raise ValueError("APDU is not encrypted.")
+        if security_control & SECURITY_AUTHENTICATION:
+            if length < 5 + AUTHENTICATION_TAG_SIZE:
+                raise ValueError("Invalid general-glo-ciphering APDU.")
+            return CipheredApdu(system_title, security_control, content[1:5],
+                                content[5:-AUTHENTICATION_TAG_SIZE], content[-AUTHENTICATION_TAG_SIZE:])
+        return CipheredApdu(system_title, security_control, content[1:5], content[5:], None)
+
+
+class AesGcmBackend(ABC):
+    """Decrypts general-glo-ciphering APDUs (AES-GCM-128, security suite 0)."""
+
+    def __init__(self, block_cipher_key: bytes, authentication_key: Optional[bytes] = None) -> None:
+        """The tag is only verified if `authentication_key` is given."""
+        self._block_cipher_key = block_cipher_key
+        self._authentication_key = authentication_key
+
+    @abstractmethod
+    def decrypt(self, apdu: bytes) -> bytes:
+        """
+        Returns: The decrypted APDU.
+        Raises: ValueError if the APDU is not supported or cannot be decrypted.
+        """
+        raise NotImplementedError()
+
+
+class GuruxAesGcm(AesGcmBackend):
+    """Pure Python AES-GCM of gurux."""
+
+    def decrypt(self, apdu: bytes) -> bytes:
+        parameter = AesGcmParameter(0, None, bytearray(self._block_cipher_key),
+                                    bytearray(self._authentication_key or GURUX_AUTHENTICATION_KEY))
+        return bytes(GXDLMSChippering.decryptAesGcm(parameter, GXByteBuffer(bytearray(apdu))))
+
+
+class CryptographyAesGcm(AesGcmBackend):
+    """
+    AES-GCM of the `cryptography` library (OpenSSL).
+    Unlike gurux the authentication tag is verified if the authentication key is known.
+    """
+
+    def __init__(self, block_cipher_key: bytes, authentication_key: Optional[bytes] = None) -> None:
+        super().__init__(block_cipher_key, authentication_key)
+        if Cipher is None:
+            raise ValueError("AES-GCM backend 'cryptography' is not installed.")
+        self._algorithm = algorithms.AES(block_cipher_key)
+
+    def decrypt(self, apdu: bytes) -> bytes:
+        ciphered = CipheredApdu.from_general_glo_ciphering(apdu)
+        nonce = ciphered.system_title + ciphered.invocation_counter
+        if ciphered.tag is None or self._authentication_key is None:
+            # GCM without authentication is CTR mode starting with counter 2
+            decryptor = Cipher(self._algorithm, modes.CTR(nonce + b"\x00\x00\x00\x02")).decryptor()
+        else:
+            # DLMS tags are truncated to 12 bytes, which the AESGCM class does not support
+            decryptor = Cipher(self._algorithm,
+                               modes.GCM(nonce, ciphered.tag, min_tag_length=AUTHENTICATION_TAG_SIZE)).decryptor()
+            decryptor.authenticate_additional_data(bytes((ciphered.security_control,)) + self._authentication_key)
+        try:
+            return decryptor.update(ciphered.ciphertext) + decryptor.finalize()
+        except InvalidTag as ex:
+            raise ValueError("Decrypt failed. Invalid tag.") from ex
+
+
+def create_aes_gcm_backend(name: str, block_cipher_key: bytes,
+                           authentication_key: Optional[bytes] = None) -> AesGcmBackend:
+    """
+    Creates the AES-GCM backend `auto`, `cryptography` or `gurux`.
+    `auto` and `cryptography` fall back to gurux if `cryptography` is not installed.
+    """
+    if name not in (BACKEND_AUTO, BACKEND_CRYPTOGRAPHY, BACKEND_GURUX):
+        raise ValueError(f"Invalid AES-GCM backend: {name}")
+    if name != BACKEND_GURUX:
+        if Cipher is not None:
+            return CryptographyAesGcm(block_cipher_key, authentication_key)
+        if name == BACKEND_CRYPTOGRAPHY:
+            LOGGER.warning("AES-GCM backend 'cryptography' is not installed. Falling back to gurux.")
+    return GuruxAesGcm(block_cipher_key, authentication_key)
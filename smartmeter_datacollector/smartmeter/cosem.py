@@ -144,11 +144,16 @@ class Cosem:
         self._register_obis = {r.obis: r for r in registers}
         self._id_detect_countdown = Cosem.OBJECT_DETECT_ATTEMPTS
 
+    @property
+    def id(self) -> Optional[str]:
+        """Meter ID once it has been retrieved (or given up to retrieve)."""
+        return self._id
+
     def retrieve_id(self, dlms_objects: Dict[OBISCode, Any]) -> str:
         if self._id:
             return self._id
 
-        id_obis = self._find_obis_of_id(dlms_objects)
+        id_obis = self.find_id_obis(dlms_objects)
         if not id_obis:
             LOGGER.debug("Unable to find ID object. Using fallback ID %s.", self._fallback_id)
             self._trigger_id_detect_counter()
@@ -171,7 +176,7 @@ class Cosem:
         return meter_id
 
     def retrieve_external_id(self, dlms_objects: Dict[OBISCode, Any]) -> str:
-        id_obis = self._find_obis_of_id(dlms_objects)
+        id_obis = self.find_id_obis(dlms_objects)
         if not id_obis:
             LOGGER.debug("Unable to find external ID object. Using fallback ID %s.", self._fallback_id)
             return self._fallback_id
@@ -204,7 +209,7 @@ class Cosem:
                            Cosem.OBJECT_DETECT_ATTEMPTS, self._fallback_id)
             self._id = self._fallback_id
 
-    def _find_obis_of_id(self, dlms_objects: Dict[OBISCode, Any]) -> Optional[OBISCode]:
+    def find_id_obis(self, dlms_objects: Dict[OBISCode, Any]) -> Optional[OBISCode]:
         # first check all ID OBIS of override list (empty by default)
         for id_obis in self._id_obis_override:
             if id_obis in dlms_objects:
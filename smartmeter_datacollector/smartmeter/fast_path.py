@@ -0,0 +1,268 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import struct
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from gurux_dlms.objects import GXDLMSClock, GXDLMSExtendedRegister, GXDLMSObject, GXDLMSRegister
+
+from .cosem import Cosem
+from .hdlc_framer import HdlcFramer
+from .meter_data import MeterDataPointType
+from .obis import OBISCode
+
+LLC_HEADERS = (b"\xE6\xE7\x00", b"\xE6\xE6\x00")
+HDLC_SEGMENTATION = 0x08
+GBT_TAG = 0xE0
+GBT_LAST_BLOCK = 0x80
+DATA_NOTIFICATION_TAG = 0x0F
+
+# A-XDR data types
+ARRAY = 0x01
+STRUCTURE = 0x02
+BIT_STRING = 0x04
+OCTET_STRING = 0x09
+DATE_TIME = 0x19
+STRING_TAGS = (OCTET_STRING, 0x0A, 0x0C)
+FIXED_SIZES = {
+    0x00: 0, 0x03: 1, 0x05: 4, 0x06: 4, 0x0D: 1, 0x0F: 1, 0x10: 2, 0x11: 1, 0x12: 2,
+    0x14: 8, 0x15: 8, 0x16: 1, 0x17: 4, 0x18: 8, DATE_TIME: 12, 0x1A: 5, 0x1B: 4,
+}
+NUMBER_FORMATS = {
+    0x05: struct.Struct(">i"), 0x06: struct.Struct(">I"), 0x0F: struct.Struct(">b"), 0x10: struct.Struct(">h"),
+    0x11: struct.Struct(">B"), 0x12: struct.Struct(">H"), 0x14: struct.Struct(">q"), 0x15: struct.Struct(">Q"),
+    0x17: struct.Struct(">f"), 0x18: struct.Struct(">d"),
+}
+DATE_TIME_SIZE = 12
+CLOCK_OCTET_STRING = bytes((OCTET_STRING, DATE_TIME_SIZE))
+
+# layout steps
+_STATIC = 0
+_VALUE = 1
+_SKIP = 2
+_CLOCK = 3
+
+
+def read_length(data: bytes, pos: int) -> Tuple[int, int]:
+    """Reads an A-XDR length field. Returns: length and position after the field."""
+    length = data[pos]
+    pos += 1
+    if length & 0x80:
+        count = length & 0x7F
+        length = int.from_bytes(data[pos:pos + count], "big")
+        pos += count
+    return length, pos
+
+
+def skip_element(data: bytes, pos: int) -> int:
+    """Returns the position after the A-XDR encoded element starting at `pos`."""
+    tag = data[pos]
+    pos += 1
+    size = FIXED_SIZES.get(tag, None)
+    if size is not None:
+        pos += size
+    elif tag in (ARRAY, STRUCTURE):
+        count, pos = read_length(data, pos)
+        for _ in range(count):
+            pos = skip_element(data, pos)
+    elif tag in STRING_TAGS:
+        length, pos = read_length(data, pos)
+        pos += length
+    elif tag == BIT_STRING:
+        length, pos = read_length(data, pos)
+        pos += (length + 7) // 8
+    else:
+        raise ValueError(f"Unsupported A-XDR data type {tag:#04x}.")
+    if pos > len(data):
+        raise ValueError("A-XDR element exceeds data.")
+    return pos
+
+
+def notification_body(apdu: bytes) -> bytes:
+    """Returns the notification body of an unencrypted data-notification APDU."""
+    if not apdu or apdu[0] != DATA_NOTIFICATION_TAG:
+        raise ValueError("APDU is no unencrypted data-notification.")
+    # skip tag, long-invoke-id-and-priority and date-time
+    return apdu[6 + apdu[5]:]
+
+
+class ApduAssembler:
+    """Reassembles the APDU of a message from its (segmented) HDLC frames and general block transfer blocks."""
+
+    def __init__(self) -> None:
+        self.frames: List[bytes] = []
+        self._segments = bytearray()
+        self._blocks = bytearray()
+        self._block_number = 0
+
+    def clear(self) -> None:
+        self.frames = []
+        self._segments.clear()
+        self._blocks.clear()
+        self._block_number = 0
+
+    def add(self, frame: bytes) -> Optional[bytes]:
+        """
+        Adds the next frame of a message. An incomplete previous message is discarded when a new one starts.
+        Returns: The complete APDU or None if more frames are expected.
+        Raises: ValueError if the frames cannot be reassembled.
+        """
+        info_start = HdlcFramer.information_offset(frame)
+        llc = info_start >= 0 and not self._segments and frame[info_start:info_start + 3] in LLC_HEADERS
+        if llc and not self._continues_block_transfer(frame[info_start + 3:info_start + 7]):
+            self.clear()
+        self.frames.append(frame)
+        if info_start < 0:
+            raise ValueError("HDLC frame without information field.")
+        if len(self.frames) == 1 and not llc:
+            raise ValueError("HDLC frame is not the start of a message.")
+
+        self._segments += frame[info_start + 3 if llc else info_start:-3]
+        if frame[1] & HDLC_SEGMENTATION:
+            return None
+        pdu = bytes(self._segments)
+        self._segments.clear()
+        if pdu[0] != GBT_TAG:
+            if self._block_number:
+                raise ValueError("General block transfer interrupted.")
+            return pdu
+
+        block_number = int.from_bytes(pdu[2:4], "big")
+        if block_number != self._block_number + 1:
+            raise ValueError(f"Unexpected block number {block_number}.")
+        self._block_number = block_number
+        length, pos = read_length(pdu, 6)
+        self._blocks += pdu[pos:pos + length]
+        if not pdu[1] & GBT_LAST_BLOCK:
+            return None
+        return bytes(self._blocks)
+
+    def _continues_block_transfer(self, header: bytes) -> bool:
+        return (self._block_number > 0 and len(header) == 4 and header[0] == GBT_TAG and
+                int.from_bytes(header[2:4], "big") == self._block_number + 1)
+
+
+class FastPathLayout:
+    """Decoder compiled for a known push message layout of a meter.
+
+    The push-object-list, the logical names and the scaler/unit attributes of a message are expected
+    to match the learned message byte by byte. Only the register values are decoded at their known
+    positions and converted with the learned scalers.
+    Decoding returns None if the message does not match the layout.
+    """
+
+    def __init__(self, steps: List[tuple], data_points: List[Tuple[MeterDataPointType, float, float]]) -> None:
+        self._steps = steps
+        self._data_points = data_points
+        self.types = tuple(point_type for point_type, _, _ in data_points)
+
+    @classmethod
+    def compile(cls, body: bytes, objects: List[Tuple[GXDLMSObject, int]], cosem: Cosem) -> "FastPathLayout":
+        """
+        Compiles the layout of a message body which has been decoded by gurux to the given push objects.
+        Raises: ValueError if the layout is not supported by the fast path.
+        """
+        if body[0] != STRUCTURE:
+            raise ValueError("Message body is no structure.")
+        count, pos = read_length(body, 1)
+        if count != len(objects):
+            raise ValueError("Message body does not match push-object-list.")
+        spans = []
+        for _ in range(count):
+            end = skip_element(body, pos)
+            spans.append((pos, end))
+            pos = end
+        if pos != len(body):
+            raise ValueError("Unexpected data after message body.")
+
+        # same object mapping as HdlcDlmsParser.convert_dlms_bundle_to_reader_data
+        value_indices: Dict[int, int] = {}
+        obis_objects: Dict[OBISCode, GXDLMSObject] = {}
+        for index, (obj, attr_ind) in enumerate(objects):
+            if index > 0 and attr_ind == 2:
+                value_indices[id(obj)] = index
+            try:
+                obis_objects[OBISCode.from_string(str(obj.logicalName))] = obj
+            except ValueError:
+                continue
+
+        slots: Dict[int, int] = {}
+        data_points = []
+        for obis, obj in obis_objects.items():
+            reg_type = cosem.get_register(obis)
+            index = value_indices.get(id(obj), None)
+            if not reg_type or not isinstance(obj, GXDLMSRegister) or index is None:
+                continue
+            if isinstance(obj, GXDLMSExtendedRegister):
+                raise ValueError("Extended registers are not supported.")
+            if body[spans[index][0]] not in NUMBER_FORMATS:
+                raise ValueError(f"Register value of {obis} is no number.")
+            slots[index] = len(data_points)
+            data_points.append((reg_type.data_point_type, obj.scaler, reg_type.scaling))
+
+        clock = obis_objects.get(Cosem.CLOCK_DEFAULT_OBIS, None)
+        clock_index = value_indices.get(id(clock), None) if isinstance(clock, GXDLMSClock) else None
+
+        steps: List[tuple] = []
+        static_start = 0
+        for index, (start, end) in enumerate(spans):
+            if index == 0 or objects[index][1] != 2:
+                # push-object-list, logical names and scalers are part of the static layout
+                continue
+            if static_start < start:
+                steps.append((_STATIC, body[static_start:start]))
+            tag = body[start]
+            if index in slots:
+                steps.append((_VALUE, tag, NUMBER_FORMATS[tag], slots[index]))
+            elif index == clock_index and (tag == DATE_TIME or body[start:start + 2] == CLOCK_OCTET_STRING):
+                steps.append((_CLOCK, tag))
+            else:
+                steps.append((_SKIP, tag))
+            static_start = end
+        if static_start < len(body):
+            steps.append((_STATIC, body[static_start:]))
+        return cls(steps, data_points)
+
+    def decode(self, body: bytes) -> Optional[Tuple[Optional[bytes], array]]:
+        """Returns: The date-time of the pushed clock object (if any) and the converted values of `types`."""
+        raw_values: List = [None] * len(self._data_points)
+        clock = None
+        pos = 0
+        try:
+            for step in self._steps:
+                if step[0] == _STATIC:
+                    if not body.startswith(step[1], pos):
+                        return None
+                    pos += len(step[1])
+                    continue
+                if body[pos] != step[1]:
+                    return None
+                if step[0] == _VALUE:
+                    raw_values[step[3]] = step[2].unpack_from(body, pos + 1)[0]
+                    pos += 1 + step[2].size
+                elif step[0] == _CLOCK:
+                    if step[1] == OCTET_STRING:
+                        if body[pos + 1] != DATE_TIME_SIZE:
+                            return None
+                        pos += 1
+                    clock = body[pos + 1:pos + 1 + DATE_TIME_SIZE]
+                    pos += 1 + DATE_TIME_SIZE
+                else:
+                    pos = skip_element(body, pos)
+        except (IndexError, ValueError, struct.error):
+            return None
+        if pos != len(body):
+            return None
+
+        values = array("d")
+        for raw_value, (_, scaler, scaling) in zip(raw_values, self._data_points):
+            # same conversion as the gurux register and HdlcDlmsParser
+            if scaler != 1:
+                raw_value = raw_value * scaler
+            values.append(float(raw_value) * scaling)
+        return clock, values
@@ -0,0 +1,132 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+import os
+from typing import Callable, Optional
+
+import aioserial
+
+from .hdlc_framer import HdlcFramer
+from .reader import Reader, ReaderError
+from .serial_reader import SerialConfig
+
+try:
+    import termios
+except ImportError:  # pragma: no cover
+    termios = None
+
+
+# pylint: disable=too-few-public-methods
+class FdSerialReader(Reader):
+    """Serial reader without executor threads.
+
+    The tty is opened non-blocking, configured with termios and its file descriptor is
+    watched by the asyncio event loop. Complete HDLC frames are handed over to the callback.
+    """
+    CHUNK_SIZE = 4096
+
+    def __init__(self, serial_config: SerialConfig, callback: Callable[[bytes], None]) -> None:
+        super().__init__(callback)
+        if termios is None:
+            raise ReaderError("Serial backend 'fd' is only available on POSIX systems.")
+        self._serial_config = serial_config
+        self._framer = HdlcFramer()
+        self._closed: Optional[asyncio.Future] = None
+        self._fd: Optional[int] = None
+        self._open()
+
+    async def start_and_listen(self) -> None:
+        if self._fd is None:
+            # port has been closed after a failure, try to reopen it
+            self._open()
+        self._framer.clear()
+        loop = asyncio.get_running_loop()
+        self._closed = loop.create_future()
+        loop.add_reader(self._fd, self._read_ready)
+        try:
+            await self._closed
+        finally:
+            loop.remove_reader(self._fd)
+            self._close()
+
+    def _open(self) -> None:
+        try:
+            self._fd = os.open(self._serial_config.port, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        except OSError as ex:
+            raise ReaderError(ex) from ex
+        try:
+            self._configure_tty(self._serial_config)
+        except (termios.error, ValueError) as ex:
+            self._close()
+            raise ReaderError(ex) from ex
+
+    def _close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _read_ready(self) -> None:
+        try:
+            data = os.read(self._fd, self.CHUNK_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as ex:
+            self._stop(ReaderError(ex))
+            return
+        if not data:
+            self._stop(ReaderError("Serial port has been closed."))
+            return
+        try:
+            for frame in self._framer.feed(data):
+                self._callback(frame)
+        except Exception as ex:  # pylint: disable=broad-except
+            self._stop(ex)
+
+    def _stop(self, ex: Exception) -> None:
+        if self._closed and not self._closed.done():
+            self._closed.set_exception(ex)
+
+    def _configure_tty(self, serial_config: SerialConfig) -> None:
+        baudrate = getattr(termios, f"B{serial_config.baudrate}", None)
+        if baudrate is None:
+            raise ValueError(f"Unsupported baudrate {serial_config.baudrate}.")
+        data_bits = {
+            aioserial.FIVEBITS: termios.CS5,
+            aioserial.SIXBITS: termios.CS6,
+            aioserial.SEVENBITS: termios.CS7,
+            aioserial.EIGHTBITS: termios.CS8,
+        }.get(serial_config.data_bits)
+        if data_bits is None:
+            raise ValueError(f"Unsupported number of data bits {serial_config.data_bits}.")
+
+        iflag, oflag, cflag, lflag, _, _, ctrl_chars = termios.tcgetattr(self._fd)
+        # raw mode
+        iflag &= ~(termios.INLCR | termios.IGNCR | termios.ICRNL | termios.IGNBRK | termios.IXON |
+                   termios.IXOFF | termios.IXANY | termios.INPCK | termios.ISTRIP | termios.PARMRK)
+        oflag &= ~(termios.OPOST | termios.ONLCR | termios.OCRNL)
+        lflag &= ~(termios.ICANON | termios.ECHO | termios.ECHOE | termios.ECHOK | termios.ECHONL |
+                   termios.ISIG | termios.IEXTEN)
+        cflag &= ~(termios.CSIZE | termios.CSTOPB | termios.PARENB | termios.PARODD | termios.CRTSCTS)
+        cflag |= termios.CLOCAL | termios.CREAD | data_bits
+
+        if serial_config.stop_bits == aioserial.STOPBITS_TWO:
+            cflag |= termios.CSTOPB
+        if serial_config.parity == aioserial.PARITY_EVEN:
+            cflag |= termios.PARENB
+            iflag |= termios.INPCK
+        elif serial_config.parity == aioserial.PARITY_ODD:
+            cflag |= termios.PARENB | termios.PARODD
+            iflag |= termios.INPCK
+        elif serial_config.parity != aioserial.PARITY_NONE:
+            raise ValueError(f"Unsupported parity {serial_config.parity}.")
+
+        ctrl_chars[termios.VMIN] = 0
+        ctrl_chars[termios.VTIME] = 0
+        termios.tcsetattr(self._fd, termios.TCSANOW,
+                          [iflag, oflag, cflag, lflag, baudrate, baudrate, ctrl_chars])
+        termios.tcflush(self._fd, termios.TCIFLUSH)
@@ -0,0 +1,137 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+import atexit
+import glob
+import logging
+import os
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+LOGGER = logging.getLogger("smartmeter")
+
+CAPTURE_MAGIC = b"SMDCCAP1"
+# wall clock time [ns], monotonic time [ns] at creation of the segment
+SEGMENT_HEADER = struct.Struct("<qQ")
+# monotonic receive time [ns], length of the data
+RECORD_HEADER = struct.Struct("<QI")
+
+
+class FrameCapture:
+    """Append-only capture of received raw data (HDLC frames) with monotonic receive timestamps.
+
+    Records are collected in memory and written to size-rotated segment files
+    (`<path>.<index>`) by a background thread, so the event loop never blocks on disk I/O.
+    """
+    FLUSH_SIZE = 65536
+    FLUSH_INTERVAL = 5.0
+
+    def __init__(self, path: str, max_segment_size: int = 10 * 1024 * 1024, max_segments: int = 10) -> None:
+        self._path = path
+        self._max_segment_size = max_segment_size
+        self._max_segments = max_segments
+        self._buffer = bytearray()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture")
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._file: Optional[BinaryIO] = None
+        self._segment_size = 0
+        existing = list_segments(path)
+        self._segment_index = segment_index(existing[-1]) + 1 if existing else 0
+        atexit.register(self.close)
+        LOGGER.info("Capturing received data to '%s.*'.", path)
+
+    def write(self, data: bytes) -> None:
+        self._buffer += RECORD_HEADER.pack(time.monotonic_ns(), len(data))
+        self._buffer += data
+        if len(self._buffer) >= self.FLUSH_SIZE:
+            self.flush()
+        elif not self._flush_handle:
+            try:
+                self._flush_handle = asyncio.get_running_loop().call_later(self.FLUSH_INTERVAL, self.flush)
+            except RuntimeError:
+                self.flush()
+
+    def flush(self) -> None:
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._buffer:
+            return
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        self._executor.submit(self._write_chunk, chunk)
+
+    def close(self) -> None:
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._executor.shutdown(wait=True)
+        if self._buffer:
+            self._write_chunk(bytes(self._buffer))
+            self._buffer.clear()
+        if self._file:
+            self._file.close()
+            self._file = None
+        atexit.unregister(self.close)
+
+    def _write_chunk(self, chunk: bytes) -> None:
+        try:
+            if not self._file:
+                self._open_segment()
+            self._file.write(chunk)
+            self._file.flush()
+            self._segment_size += len(chunk)
+            if self._segment_size >= self._max_segment_size:
+                self._file.close()
+                self._file = None
+        except OSError as ex:
+            LOGGER.error("Unable to write capture file. Captured data is lost. '%s'", ex)
+            self._file = None
+
+    def _open_segment(self) -> None:
+        segment_path = f"{self._path}.{self._segment_index:06d}"
+        self._segment_index += 1
+        self._file = open(segment_path, "ab")  # pylint: disable=consider-using-with
+        self._file.write(CAPTURE_MAGIC + SEGMENT_HEADER.pack(time.time_ns(), time.monotonic_ns()))
+        self._segment_size = len(CAPTURE_MAGIC) + SEGMENT_HEADER.size
+        for old_segment in list_segments(self._path)[:-self._max_segments]:
+            os.remove(old_segment)
+
+
+def list_segments(path: str) -> List[str]:
+    """Returns all capture segments of a capture path, oldest first."""
+    segments = filter(lambda p: p[len(path) + 1:].isdigit(), glob.glob(f"{glob.escape(path)}.*"))
+    return sorted(segments, key=segment_index)
+
+
+def segment_index(segment_path: str) -> int:
+    return int(segment_path.rsplit(".", 1)[1])
+
+
+def read_capture(path: str) -> Iterator[Tuple[int, bytes]]:
+    """
+    Reads captured records either from a single segment file or from all segments of a capture path.
+    Returns: Iterator of (monotonic receive time [ns], data).
+    """
+    segments = [path] if os.path.isfile(path) else list_segments(path)
+    for segment in segments:
+        with open(segment, "rb") as file:
+            content = file.read()
+        if not content.startswith(CAPTURE_MAGIC):
+            raise ValueError(f"'{segment}' is not a capture file.")
+        pos = len(CAPTURE_MAGIC) + SEGMENT_HEADER.size
+        while pos + RECORD_HEADER.size <= len(content):
+            timestamp, length = RECORD_HEADER.unpack_from(content, pos)
+            pos += RECORD_HEADER.size
+            if pos + length > len(content):
+                LOGGER.warning("Truncated record at the end of capture file '%s'.", segment)
+                break
+            yield timestamp, content[pos:pos + length]
+            pos += length
@@ -6,82 +6,307 @@
 # See LICENSES/README.md for more information.
 #
 import logging
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from gurux_dlms import GXByteBuffer, GXDateTime, GXDLMSClient, GXReplyData
-from gurux_dlms.enums import InterfaceType, ObjectType, Security
+from gurux_dlms.enums import DataType, InterfaceType, ObjectType, Security
 from gurux_dlms.objects import (GXDLMSCaptureObject, GXDLMSClock, GXDLMSData, GXDLMSObject, GXDLMSPushSetup,
                                 GXDLMSRegister, GXDLMSExtendedRegister)
 from gurux_dlms.secure import GXDLMSSecureClient
 
+from ..metrics import METRICS
+from .aes_gcm import BACKEND_AUTO, GENERAL_GLO_CIPHERING_TAG, AesGcmBackend, create_aes_gcm_backend
 from .cosem import Cosem
-from .meter_data import MeterDataPoint
+from .fast_path import ApduAssembler, FastPathLayout, notification_body
+from .hdlc_framer import HdlcFramer
+from .meter_data import MeterDataPointType, MeterReading
 from .obis import OBISCode
 
 LOGGER = logging.getLogger("smartmeter")
 
 
+@dataclass
+class PushObjectSchema:
+    """DLMS objects of a push-object-list, reused for all messages with the same list."""
+    objects: List[Tuple[GXDLMSObject, int]]
+    value_indices: List[int] = field(default_factory=list)
+    meta_indices: List[int] = field(default_factory=list)
+    meta_values: Dict[int, Any] = field(default_factory=dict)
+    # False once the fast path failed for a message of this list, it is not compiled again
+    fast_path: bool = True
+
+
+@dataclass
+class ExtractionPlan:
+    """Cosem mapping compiled for the DLMS objects of a message layout, reused for all messages with this layout."""
+    key: Tuple
+    # (object index, scaling, data point type) of the configured registers
+    registers: List[Tuple[int, float, MeterDataPointType]]
+    id_obis: Optional[OBISCode]
+    id_index: Optional[int]
+    clock_index: Optional[int]
+    # the external ID of extended registers (M-Bus) is the source of the reading
+    external_id: bool
+
+    @staticmethod
+    def layout_key(dlms_objects: List[GXDLMSObject]) -> Tuple:
+        return tuple((obj.objectType, obj.logicalName) for obj in dlms_objects)
+
+    @staticmethod
+    def compile(key: Tuple, dlms_objects: List[GXDLMSObject], cosem: Cosem) -> "ExtractionPlan":
+        obis_indices: Dict[OBISCode, int] = {}
+        for index, obj in enumerate(dlms_objects):
+            try:
+                obis_indices[OBISCode.from_string(str(obj.logicalName))] = index
+            except ValueError as ex:
+                LOGGER.warning("Skipping unparsable DLMS object. (Reason: %s)", ex)
+
+        registers = []
+        external_id = False
+        for obis, index in obis_indices.items():
+            obj = dlms_objects[index]
+            if obj.getObjectType() not in (ObjectType.REGISTER, ObjectType.EXTENDED_REGISTER):
+                continue
+            reg_type = cosem.get_register(obis)
+            if reg_type and isinstance(obj, (GXDLMSRegister, GXDLMSExtendedRegister)):
+                external_id = external_id or isinstance(obj, GXDLMSExtendedRegister)
+                registers.append((index, reg_type.scaling, reg_type.data_point_type))
+
+        id_obis = cosem.find_id_obis(obis_indices)
+        return ExtractionPlan(key, registers, id_obis, obis_indices.get(id_obis, None),
+                              obis_indices.get(Cosem.CLOCK_DEFAULT_OBIS, None), external_id)
+
+
 class HdlcDlmsParser:
     HDLC_BUFFER_MAX_SIZE = 5000
+    PUSH_OBJECT_SCHEMA_CACHE_SIZE = 8
 
-    def __init__(self, cosem: Cosem, block_cipher_key: Optional[str] = None, use_system_time: bool = False) -> None:
+    def __init__(self, cosem: Cosem, block_cipher_key: Optional[str] = None, use_system_time: bool = False,
+                 aes_gcm_backend: str = BACKEND_AUTO, name: str = "",
+                 authentication_key: Optional[str] = None) -> None:
+        """
+        `name` identifies the meter in the metrics.
+        The authentication tag of encrypted messages is only verified if `authentication_key` is given.
+        """
+        self._aes_gcm: Optional[AesGcmBackend] = None
         if block_cipher_key:
             self._client = GXDLMSSecureClient(
                 useLogicalNameReferencing=True,
                 interfaceType=InterfaceType.HDLC)
             self._client.ciphering.security = Security.ENCRYPTION
             self._client.ciphering.blockCipherKey = GXByteBuffer.hexToBytes(block_cipher_key)
+            self._aes_gcm = create_aes_gcm_backend(aes_gcm_backend, bytes(self._client.ciphering.blockCipherKey),
+                                                   bytes.fromhex(authentication_key) if authentication_key else None)
         else:
             self._client = GXDLMSClient(
                 useLogicalNameReferencing=True,
                 interfaceType=InterfaceType.HDLC)
 
+        self._framer = HdlcFramer(validate_crc=True, capacity=self.HDLC_BUFFER_MAX_SIZE)
+        self._frames: Deque[bytes] = deque()
         self._hdlc_buffer = GXByteBuffer()
         self._dlms_data = GXReplyData()
+        self._reply = GXReplyData()
+        self._push_object_schemas: Dict[Tuple, PushObjectSchema] = {}
+        self._last_schema: Optional[PushObjectSchema] = None
+        self._message_frames: List[bytes] = []
+        self._complete_frames: List[bytes] = []
+        self._complete_apdu: Optional[bytes] = None
+        self._replay_count = 0
+        self._assembler = ApduAssembler()
+        self._pdu_client = GXDLMSClient(
+            useLogicalNameReferencing=True,
+            interfaceType=InterfaceType.PDU)
+        self._layout: Optional[FastPathLayout] = None
+        self._extraction_plan: Optional[ExtractionPlan] = None
+        self._fast_path_result: Optional[Tuple[Optional[bytes], array]] = None
         self._cosem = cosem
+        self._name = name
         self._use_system_time = use_system_time
         if use_system_time:
             LOGGER.info("Use system UTC time instead of time in DLMS messages for this smart meter.")
 
+    @property
+    def crc_error_count(self) -> int:
+        return self._framer.crc_error_count
+
+    @property
+    def dropped_bytes(self) -> int:
+        return self._framer.dropped_bytes
+
     def append_to_hdlc_buffer(self, data: bytes) -> None:
-        if self._hdlc_buffer.getSize() > self.HDLC_BUFFER_MAX_SIZE:
-            LOGGER.warning("HDLC byte-buffer > %i. Buffer is cleared, some data is lost.",
-                           self.HDLC_BUFFER_MAX_SIZE)
-            self._hdlc_buffer.clear()
-            self._dlms_data.clear()
-        self._hdlc_buffer.set(data)
+        dropped_bytes = self._framer.dropped_bytes
+        self._frames.extend(self._framer.feed(data))
+        if self._framer.dropped_bytes != dropped_bytes:
+            METRICS.increment(self._name, "dropped_bytes", self._framer.dropped_bytes - dropped_bytes)
 
     def clear_hdlc_buffer(self) -> None:
+        self._framer.clear()
+        self._frames.clear()
         self._hdlc_buffer.clear()
+        self._message_frames.clear()
+        self._assembler.clear()
+        self._replay_count = 0
+        self._fast_path_result = None
 
     def extract_data_from_hdlc_frames(self) -> bool:
         """
-        Try to extract data fragments from HDLC frame-buffer and store it into DLMS buffer.
-        HDLC buffer is being cleared.
+        Try to extract data fragments from the received and validated HDLC frames and store it into DLMS buffer.
+        Processed frames are removed. Remaining frames are processed with the next call.
         Returns: True if data is complete for parsing.
         """
-        tmp = GXReplyData()
+        while self._frames:
+            frame = self._frames.popleft()
+            if self._replay_count:
+                self._replay_count -= 1
+            elif self._layout or self._aes_gcm:
+                if self._extract_apdu(frame):
+                    return True
+                continue
+            self._message_frames.append(frame)
+            self._hdlc_buffer.clear()
+            self._hdlc_buffer.set(frame)
+            self._reply.clear()
+            try:
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug("HDLC Buffer: %s", GXByteBuffer.hex(self._hdlc_buffer))
+                self._client.getData(self._hdlc_buffer, self._reply, self._dlms_data)
+            except (ValueError, TypeError) as ex:
+                LOGGER.warning("Failed to extract data from HDLC frame: '%s' Some data got lost.", ex)
+                self._hdlc_buffer.clear()
+                self._dlms_data.clear()
+                self._message_frames.clear()
+                continue
+
+            if not self._dlms_data.isComplete():
+                LOGGER.debug("HDLC frame incomplete and will not be parsed yet.")
+                continue
+
+            if self._dlms_data.isMoreData():
+                LOGGER.debug("More DLMS data expected. Not yet ready to be parsed.")
+                continue
+
+            LOGGER.debug("DLMS packet complete and ready for parsing.")
+            self._hdlc_buffer.clear()
+            self._complete_frames = self._message_frames
+            self._complete_apdu = None
+            self._message_frames = []
+            return True
+        return False
+
+    def parse_to_meter_data(self) -> Optional[MeterReading]:
+        """
+        Parse the extracted message to a meter reading. Returns None if the message is not parsable.
+        Messages matching the learned layout of the meter are decoded by the fast path, all others with gurux.
+        """
+        start = time.perf_counter()
+        if self._fast_path_result:
+            clock, values = self._fast_path_result
+            self._fast_path_result = None
+            reading = self._create_reading(self._layout.types, values, clock)
+            METRICS.observe(self._name, "conversion", time.perf_counter() - start)
+            METRICS.increment(self._name, "fast_path_messages")
+            return reading
+
+        dlms_objects = self.parse_to_dlms_objects()
+        if not dlms_objects:
+            return None
+        message_time = self.extract_message_time()
+        parsed = time.perf_counter()
+        METRICS.observe(self._name, "dlms_parsing", parsed - start)
+        reading = self.convert_dlms_bundle_to_reader_data(dlms_objects, message_time)
+        METRICS.observe(self._name, "conversion", time.perf_counter() - parsed)
+        if self._last_schema:
+            self._learn_layout(self._last_schema, reading)
+        return reading
+
+    def _extract_apdu(self, frame: bytes) -> bool:
+        """
+        Reassembles and decrypts messages without gurux. Messages matching the learned layout are decoded
+        by the fast path, all others by gurux from the reassembled APDU.
+        If the frames cannot be reassembled or decrypted they are handed over to the HDLC client of gurux.
+        Returns: True if the frame completes a message ready for parsing.
+        """
         try:
-            LOGGER.debug("HDLC Buffer: %s", GXByteBuffer.hex(self._hdlc_buffer))
-            self._client.getData(self._hdlc_buffer, tmp, self._dlms_data)
+            apdu = self._assembler.add(frame)
+            if apdu is None:
+                return False
+            apdu = self._decrypt(apdu)
+            body = notification_body(apdu)
+        except (IndexError, ValueError) as ex:
+            LOGGER.debug("Unable to reassemble message. Falling back to gurux. (Reason: %s)", ex)
+            frames = self._assembler.frames
+            self._assembler.clear()
+            self._frames.extendleft(reversed(frames))
+            self._replay_count = len(frames)
+            return False
+        self._assembler.clear()
+
+        if self._layout:
+            result = self._layout.decode(body)
+            if result is not None:
+                self._dlms_data.clear()
+                self._fast_path_result = result
+                return True
+            LOGGER.info("Message does not match the learned layout. Falling back to full decoding.")
+            self._layout = None
+
+        self._dlms_data.clear()
+        self._reply.clear()
+        try:
+            self._pdu_client.getData(GXByteBuffer(bytearray(apdu)), self._reply, self._dlms_data)
         except (ValueError, TypeError) as ex:
-            LOGGER.warning("Failed to extract data from HDLC frame: '%s' Some data got lost.", ex)
-            self._hdlc_buffer.clear()
+            LOGGER.warning("Failed to extract data from APDU: '%s' Some data got lost.", ex)
             self._dlms_data.clear()
             return False
-
-        if not self._dlms_data.isComplete():
-            LOGGER.debug("HDLC frame incomplete and will not be parsed yet.")
+        if not self._dlms_data.isComplete() or self._dlms_data.isMoreData():
+            LOGGER.warning("Incomplete APDU. Some data got lost.")
+            self._dlms_data.clear()
             return False
+        self._complete_apdu = apdu
+        return True
 
-        if self._dlms_data.isMoreData():
-            LOGGER.debug("More DLMS data expected. Not yet ready to be parsed.")
-            return False
+    def _decrypt(self, apdu: bytes) -> bytes:
+        if self._aes_gcm and apdu and apdu[0] == GENERAL_GLO_CIPHERING_TAG:
+            return self._aes_gcm.decrypt(apdu)
+        return apdu
 
-        LOGGER.debug("DLMS packet complete and ready for parsing.")
-        self._hdlc_buffer.clear()
-        return True
+    def _learn_layout(self, schema: PushObjectSchema, reading: MeterReading) -> None:
+        if not reading or self._cosem.id is None or not schema.fast_path:
+            return
+        try:
+            apdu = self._complete_apdu
+            if apdu is None:
+                assembler = ApduAssembler()
+                for frame in self._complete_frames:
+                    apdu = assembler.add(frame)
+                if apdu is None:
+                    raise ValueError("Incomplete message.")
+                apdu = self._decrypt(apdu)
+            body = notification_body(apdu)
+            layout = FastPathLayout.compile(body, schema.objects, self._cosem)
+            result = layout.decode(body)
+        except (IndexError, ValueError) as ex:
+            LOGGER.debug("Message layout not supported by fast path. (Reason: %s)", ex)
+            schema.fast_path = False
+            return
+
+        def comparable(other: MeterReading) -> Tuple:
+            return (other.types, other.values, other.source, None if self._use_system_time else other.timestamp)
+
+        fast_reading = None if result is None else self._create_reading(layout.types, result[1], result[0])
+        if fast_reading is None or comparable(fast_reading) != comparable(reading):
+            LOGGER.debug("Fast path decoding differs from full decoding. Fast path is not used.")
+            schema.fast_path = False
+            return
+        LOGGER.info("Learned message layout with %i registers. Using fast path for following messages.",
+                    len(reading))
+        self._layout = layout
 
     def parse_to_dlms_objects_orig(self) -> Dict[str, GXDLMSObject]:
         parsed_objects: List[Tuple[GXDLMSObject, int]] = []
@@ -115,6 +340,7 @@ class HdlcDlmsParser:
         return None
 
     def parse_to_dlms_objects(self) -> List[GXDLMSObject]:
+        self._last_schema = None
         if not isinstance(self._dlms_data.value, list) or not self._dlms_data.value:
             self._dlms_data.clear()
             LOGGER.error("DLMS data is no list or empty list. Not parsable.")
@@ -134,22 +360,63 @@ class HdlcDlmsParser:
         return dlms_objects
 
     def convert_dlms_bundle_to_reader_data(self, dlms_objects: List[GXDLMSObject],
-                                           message_time: Optional[datetime] = None) -> List[MeterDataPoint]:
-        obis_obj_pairs = {}
-        for obj in dlms_objects:
-            try:
-                obis_obj_pairs[OBISCode.from_string(str(obj.logicalName))] = obj
-            except ValueError as ex:
-                LOGGER.warning("Skipping unparsable DLMS object. (Reason: %s)", ex)
+                                           message_time: Optional[datetime] = None) -> MeterReading:
+        """
+        Converts the registers of the COSEM config to a reading.
+        If the message contains extended registers (M-Bus) the external ID is the source of the reading.
+        """
+        key = ExtractionPlan.layout_key(dlms_objects)
+        plan = self._extraction_plan
+        if plan is None or plan.key != key:
+            plan = self._extraction_plan = ExtractionPlan.compile(key, dlms_objects, self._cosem)
+
+        # the Cosem lookups only need the ID object (if any) instead of all objects
+        id_objects = {} if plan.id_index is None else {plan.id_obis: dlms_objects[plan.id_index]}
+        if plan.external_id:
+            meter_id = self._cosem.retrieve_external_id(id_objects)
+        else:
+            meter_id = self._cosem.retrieve_id(id_objects)
 
-        meter_id = self._cosem.retrieve_id(obis_obj_pairs)
+        register_time = None
+        if not self._use_system_time and plan.clock_index is not None:
+            register_time = self._cosem.retrieve_time_from_dlms_registers(
+                {Cosem.CLOCK_DEFAULT_OBIS: dlms_objects[plan.clock_index]})
+        timestamp = self._get_timestamp(register_time, message_time)
 
+        # Extract register data
+        types: List[MeterDataPointType] = []
+        values = array("d")
+        for index, scaling, data_point_type in plan.registers:
+            obj = dlms_objects[index]
+            raw_value = obj.value
+            if raw_value is None:
+                LOGGER.warning("No value received for %s.", obj.logicalName)
+                continue
+            try:
+                value = float(raw_value) * scaling
+            except (TypeError, ValueError, OverflowError):
+                LOGGER.warning("Invalid register value '%s'. Skipping register.", str(raw_value))
+                continue
+            types.append(data_point_type)
+            values.append(value)
+        return MeterReading(meter_id, timestamp, tuple(types), values)
+
+    def _create_reading(self, types: Tuple[MeterDataPointType, ...], values: array,
+                        clock: Optional[bytes]) -> MeterReading:
+        register_time = None
+        if clock and not self._use_system_time:
+            register_time = self._client.changeType(bytearray(clock), DataType.DATETIME,
+                                                    self._client.settings.useUtc2NormalTime).value
+        timestamp = self._get_timestamp(register_time, None)
+        return MeterReading(self._cosem.id, timestamp, types, values)
+
+    def _get_timestamp(self, register_time: Optional[datetime], message_time: Optional[datetime]) -> datetime:
         timestamp = None
         if self._use_system_time:
             timestamp = datetime.now(timezone.utc)
 
         if not timestamp:
-            timestamp = self._cosem.retrieve_time_from_dlms_registers(obis_obj_pairs)
+            timestamp = register_time
         if not timestamp:
             timestamp = message_time
         if not timestamp:
@@ -160,50 +427,49 @@ class HdlcDlmsParser:
         if not timestamp.tzinfo:
             # if timezone info not set, assume UTC
             timestamp = timestamp.replace(tzinfo=timezone.utc)
-
-        # Extract register data
-        data_points: List[MeterDataPoint] = []
-
-        for obis, obj in filter(lambda o: (o[1].getObjectType() == ObjectType.REGISTER) or 
-                (o[1].getObjectType() == ObjectType.EXTENDED_REGISTER), obis_obj_pairs.items()):
-            reg_type = self._cosem.get_register(obis)
-            if reg_type and (isinstance(obj, (GXDLMSRegister, GXDLMSExtendedRegister))):
-
-                if (isinstance(obj, (GXDLMSExtendedRegister))):
-                    meter_id = self._cosem.retrieve_external_id(obis_obj_pairs)
-
-                raw_value = self._extract_register_value(obj)
-                if raw_value is None:
-                    LOGGER.warning("No value received for %s.", obis)
-                    continue
-                data_point_type = reg_type.data_point_type
-                try:
-                    value = float(raw_value) * reg_type.scaling
-                except (TypeError, ValueError, OverflowError):
-                    LOGGER.warning("Invalid register value '%s'. Skipping register.", str(raw_value))
-                    continue
-                data_points.append(MeterDataPoint(data_point_type, value, meter_id, timestamp))
-        return data_points
+        return timestamp
 
     def _parse_dlms_with_push_object_list(self) -> List[GXDLMSObject]:
-        parsed_objects: List[Tuple[GXDLMSObject, int]] = []
-        parsed_objects = self._client.parsePushObjects(self._dlms_data.value[0])
-        value_objects = {}
-        for index, (obj, attr_ind) in enumerate(parsed_objects[1:], start=1):
-            if attr_ind == 2:
-                # Temp store and skip values for now, so that scaling is defined before setting the value
-                value_objects[index] = obj
+        schema = self._get_push_object_schema(self._dlms_data.value[0])
+        self._last_schema = schema
+        values = self._dlms_data.value
+        for index in schema.meta_indices:
+            # Scaler, unit etc. only need to be updated when they change
+            if index in schema.meta_values and schema.meta_values[index] == values[index]:
                 continue
-            
-            self._client.updateValue(obj, attr_ind, self._dlms_data.value[index])
+            obj, attr_ind = schema.objects[index]
+            self._client.updateValue(obj, attr_ind, values[index])
+            schema.meta_values[index] = values[index]
             LOGGER.debug("%s %s %s: %s", obj.objectType, obj.logicalName, attr_ind, obj.getValues()[attr_ind - 1])
-        
-        for index, value_object in value_objects.items():
-            # Set values
-            self._client.updateValue(value_object,2, self._dlms_data.value[index])
-            LOGGER.debug("%s %s %s: %s", value_object.objectType, value_object.logicalName, 2, value_object.getValues()[1])       
-            
-        return [obj for obj, _ in parsed_objects]
+
+        for index in schema.value_indices:
+            # Set values after the scaling is defined
+            value_object = schema.objects[index][0]
+            self._client.updateValue(value_object, 2, values[index])
+            LOGGER.debug("%s %s %s: %s", value_object.objectType, value_object.logicalName, 2, value_object.getValues()[1])
+
+        return [obj for obj, _ in schema.objects]
+
+    def _get_push_object_schema(self, push_object_list: List[Any]) -> PushObjectSchema:
+        key = tuple(tuple(bytes(item) if isinstance(item, bytearray) else item for item in entry)
+                    for entry in push_object_list)
+        schema = self._push_object_schemas.get(key, None)
+        if schema:
+            return schema
+
+        LOGGER.debug("New push-object-list received. Parsing DLMS objects.")
+        parsed_objects: List[Tuple[GXDLMSObject, int]] = self._client.parsePushObjects(push_object_list)
+        schema = PushObjectSchema(parsed_objects)
+        for index, (_, attr_ind) in enumerate(parsed_objects[1:], start=1):
+            if attr_ind == 2:
+                schema.value_indices.append(index)
+            else:
+                schema.meta_indices.append(index)
+        if len(self._push_object_schemas) >= self.PUSH_OBJECT_SCHEMA_CACHE_SIZE:
+            # evict oldest schema
+            del self._push_object_schemas[next(iter(self._push_object_schemas))]
+        self._push_object_schemas[key] = schema
+        return schema
 
     def _parse_dlms_without_push_list(self) -> List[GXDLMSObject]:
         """Tries to extract OBIS codes and values from message.
@@ -236,10 +502,6 @@ class HdlcDlmsParser:
     def _extract_value_from_data_object(data_object: GXDLMSData) -> Optional[Any]:
         return data_object.getValues()[1]
 
-    @staticmethod
-    def _extract_register_value(register: GXDLMSRegister) -> Optional[Any]:
-        return register.getValues()[1]
-
     @staticmethod
     def extract_obis_and_values(data: List[Any]) -> Tuple[List[OBISCode], List[Any]]:
         obis_it = filter(lambda d: isinstance(d[1], (bytearray, bytes)) and OBISCode.is_obis(d[1]), enumerate(data))
@@ -0,0 +1,175 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import logging
+from typing import List, Union
+
+LOGGER = logging.getLogger("smartmeter")
+
+
+def _build_crc16_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x8408 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+CRC16_TABLE = _build_crc16_table()
+
+
+def crc16(data: Union[bytes, bytearray, memoryview]) -> int:
+    """CRC-16/X.25 as used for HCS and FCS of HDLC frames (IEC 62056-46)."""
+    crc = 0xFFFF
+    table = CRC16_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc ^ 0xFFFF
+
+
+class HdlcFramer:
+    """Incrementally splits a byte stream into complete HDLC frames (IEC 62056-46).
+
+    Frame boundaries are determined by the opening flag and the length given in the
+    frame format field, since DLMS HDLC does not escape flag bytes inside the payload.
+    With `validate_crc` frames with an invalid header (HCS) or frame check sequence (FCS)
+    are dropped and counted.
+    At most `capacity` bytes of an incomplete frame are kept. On overflow only the bytes before
+    the next flag are dropped and the framer resynchronizes. All bytes not delivered in frames
+    (garbage, corrupted frames, overflow) are counted in `dropped_bytes`.
+    """
+    HDLC_FLAG = 0x7E
+    FRAME_FORMAT_TYPE = 0xA0
+    FRAME_MIN_LENGTH = 7  # format (2), addresses (min. 2), control (1), FCS (2)
+    ADDRESS_MAX_LENGTH = 4
+    BUFFER_MAX_SIZE = 5000
+
+    def __init__(self, validate_crc: bool = False, capacity: int = BUFFER_MAX_SIZE) -> None:
+        self._buffer = bytearray()
+        self._validate_crc = validate_crc
+        self._capacity = capacity
+        self.frame_count = 0
+        self.crc_error_count = 0
+        self.dropped_bytes = 0
+        self._covered = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def clear(self) -> None:
+        self._buffer.clear()
+        self._covered = 0
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """
+        Append received data to the internal buffer and extract all complete frames.
+        Returns: Complete frames including opening and closing flag.
+        """
+        self._buffer += data
+        frames: List[bytes] = []
+        pos = 0
+        # bytes of delivered frames and flags between frames, `covered` is the end of the last delivered frame
+        covered = self._covered
+        framing_bytes = covered
+        with memoryview(self._buffer) as view:
+            size = len(view)
+            while True:
+                start = self._buffer.find(self.HDLC_FLAG, pos)
+                if start < 0:
+                    # no frame start in buffer, remaining bytes are garbage
+                    pos = size
+                    break
+                if start + 3 > size:
+                    pos = start
+                    break
+                if view[start + 1] == self.HDLC_FLAG:
+                    # closing flag directly followed by the next opening flag
+                    pos = start + 1
+                    if start >= covered:
+                        framing_bytes += 1
+                    continue
+                if view[start + 1] & 0xF0 != self.FRAME_FORMAT_TYPE:
+                    pos = start + 1
+                    continue
+                length = ((view[start + 1] & 0x07) << 8) | view[start + 2]
+                end = start + length + 1
+                if length < self.FRAME_MIN_LENGTH:
+                    pos = start + 1
+                    continue
+                if end >= size:
+                    # frame not yet complete
+                    pos = start
+                    break
+                if view[end] != self.HDLC_FLAG:
+                    pos = start + 1
+                    continue
+                # the closing flag may be shared as opening flag of the next frame
+                pos = end
+                if self._validate_crc and not self._is_crc_valid(view[start + 1:end]):
+                    self.crc_error_count += 1
+                    LOGGER.warning("Dropped HDLC frame with invalid checksum.")
+                    continue
+                self.frame_count += 1
+                framing_bytes += end + 1 - max(start, covered)
+                covered = end + 1
+                frames.append(bytes(view[start:end + 1]))
+        # the closing flag of the last frame is kept as possible opening flag of the next one
+        self._covered = max(covered - pos, 0)
+        self.dropped_bytes += pos - framing_bytes + self._covered
+        if pos:
+            del self._buffer[:pos]
+        if len(self._buffer) > self._capacity:
+            self._resynchronize()
+        return frames
+
+    def _resynchronize(self) -> None:
+        """Drops the oldest bytes up to the first flag which leaves at most `capacity` bytes in the buffer."""
+        resync = self._buffer.find(self.HDLC_FLAG, len(self._buffer) - self._capacity)
+        dropped = len(self._buffer) if resync < 0 else resync
+        LOGGER.warning("HDLC framer buffer > %i. Dropped %i bytes to resynchronize.", self._capacity, dropped)
+        self.dropped_bytes += max(dropped - self._covered, 0)
+        self._covered = 0
+        del self._buffer[:dropped]
+
+    @classmethod
+    def information_offset(cls, frame: bytes) -> int:
+        """Returns the position of the information field in a complete frame (with flags) or -1."""
+        with memoryview(frame) as view:
+            header_end = cls._find_header_end(view[1:-1])
+        if header_end < 0 or header_end + 2 >= len(frame) - 4:
+            return -1
+        # skip opening flag and HCS
+        return header_end + 3
+
+    @classmethod
+    def _is_crc_valid(cls, frame: memoryview) -> bool:
+        """Validates HCS and FCS of a frame without flags."""
+        fcs_pos = len(frame) - 2
+        if crc16(frame[:fcs_pos]) != frame[fcs_pos] | (frame[fcs_pos + 1] << 8):
+            return False
+        header_end = cls._find_header_end(frame)
+        if header_end < 0:
+            return False
+        if header_end == fcs_pos:
+            # frame without information field has no HCS
+            return True
+        return crc16(frame[:header_end]) == frame[header_end] | (frame[header_end + 1] << 8)
+
+    @classmethod
+    def _find_header_end(cls, frame: memoryview) -> int:
+        """Returns the position after format, destination/source address and control field or -1."""
+        pos = 2
+        for _ in range(2):
+            address_end = pos
+            while not frame[address_end] & 0x01:
+                address_end += 1
+                if address_end - pos >= cls.ADDRESS_MAX_LENGTH or address_end >= len(frame) - 3:
+                    return -1
+            pos = address_end + 1
+        return pos + 1
@@ -12,7 +12,7 @@ import serial
 
 from .cosem import Cosem
 from .meter import MeterError, SerialHdlcDlmsMeter
-from .reader import ReaderError
+from .reader import ReaderConfig, ReaderError
 from .serial_reader import SerialConfig
 
 LOGGER = logging.getLogger("smartmeter")
@@ -24,7 +24,8 @@ class KamstrupHAN(SerialHdlcDlmsMeter):
     def __init__(self, port: str,
                  baudrate: int = BAUDRATE,
                  decryption_key: Optional[str] = None,
-                 use_system_time: bool = False) -> None:
+                 use_system_time: bool = False,
+                 reader_config: Optional[ReaderConfig] = None) -> None:
         serial_config = SerialConfig(
             port=port,
             baudrate=baudrate,
@@ -35,7 +36,7 @@ class KamstrupHAN(SerialHdlcDlmsMeter):
         )
         cosem = Cosem(fallback_id=port)
         try:
-            super().__init__(serial_config, cosem, decryption_key, use_system_time)
+            super().__init__(serial_config, cosem, decryption_key, use_system_time, reader_config)
         except ReaderError as ex:
             LOGGER.fatal("Unable to setup serial reader for Kamstrup HAN. '%s'", ex)
             raise MeterError("Failed setting up Kamstrup HAN.") from ex
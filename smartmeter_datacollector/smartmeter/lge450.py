@@ -14,7 +14,7 @@ from .cosem import Cosem, RegisterCosem
 from .meter import MeterError, SerialHdlcDlmsMeter
 from .meter_data import MeterDataPointTypes
 from .obis import OBISCode
-from .reader import ReaderError
+from .reader import ReaderConfig, ReaderError
 from .serial_reader import SerialConfig
 
 LOGGER = logging.getLogger("smartmeter")
@@ -33,7 +33,8 @@ class LGE450(SerialHdlcDlmsMeter):
     def __init__(self, port: str,
                  baudrate: int = BAUDRATE,
                  decryption_key: Optional[str] = None,
-                 use_system_time: bool = False) -> None:
+                 use_system_time: bool = False,
+                 reader_config: Optional[ReaderConfig] = None) -> None:
         serial_config = SerialConfig(
             port=port,
             baudrate=baudrate,
@@ -44,7 +45,7 @@ class LGE450(SerialHdlcDlmsMeter):
         )
         cosem = Cosem(fallback_id=port, id_obis_override=EXTENDED_REGISTER_IDS, register_obis_extended=EXTENDED_REGISTER_MAPPING)
         try:
-            super().__init__(serial_config, cosem, decryption_key, use_system_time)
+            super().__init__(serial_config, cosem, decryption_key, use_system_time, reader_config)
         except ReaderError as ex:
             LOGGER.fatal("Unable to setup serial reader for L+G E450. '%s'", ex)
             raise MeterError("Failed setting up L+G E450.") from ex
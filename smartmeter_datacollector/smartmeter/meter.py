@@ -5,13 +5,21 @@
 # SPDX-License-Identifier: GPL-2.0-only
 # See LICENSES/README.md for more information.
 #
+import asyncio
+import time
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
+from ..metrics import METRICS
 from .cosem import Cosem
+from .fd_serial_reader import FdSerialReader
+from .frame_capture import FrameCapture
 from .hdlc_dlms_parser import HdlcDlmsParser
-from .meter_data import MeterDataPoint
+from .meter_data import MeterReading
+from .reader import Reader, ReaderConfig, ReaderError
+from .replay_reader import ReplayReader
 from .serial_reader import SerialConfig, SerialReader
+from .tcp_reader import TcpReader
 
 
 class MeterError(Exception):
@@ -29,9 +37,9 @@ class Meter(ABC):
     async def start(self) -> None:
         raise NotImplementedError()
 
-    def _notify_observers(self, data_points: List[MeterDataPoint]) -> None:
+    def _notify_observers(self, reading: MeterReading) -> None:
         for observer in self._observers:
-            observer.notify(data_points)
+            observer.notify(reading)
 
 
 class SerialHdlcDlmsMeter(Meter):
@@ -40,26 +48,112 @@ class SerialHdlcDlmsMeter(Meter):
     def __init__(self, serial_config: SerialConfig,
                  cosem: Cosem,
                  decryption_key: Optional[str] = None,
-                 use_system_time: bool = False) -> None:
+                 use_system_time: bool = False,
+                 reader_config: Optional[ReaderConfig] = None) -> None:
         super().__init__()
-        self._parser = HdlcDlmsParser(cosem, decryption_key, use_system_time)
-        self._serial = SerialReader(serial_config, self._data_received)
+        if not reader_config:
+            reader_config = ReaderConfig()
+        self._name = serial_config.port
+        try:
+            self._parser = HdlcDlmsParser(cosem, decryption_key, use_system_time, reader_config.aes_gcm_backend,
+                                          self._name, reader_config.auth_key)
+        except ValueError as ex:
+            raise ReaderError(ex) from ex
+        self._reader = self._build_reader(serial_config, reader_config)
+        self._decode_in_thread = reader_config.decode_in_thread
+        self._decode_queue: Optional["asyncio.Queue[Optional[bytes]]"] = None
+        self._decoding: Optional[asyncio.Future] = None
+        self._capture: Optional[FrameCapture] = None
+        if reader_config.capture_path:
+            self._capture = FrameCapture(reader_config.capture_path,
+                                         reader_config.capture_max_size,
+                                         reader_config.capture_segments)
 
     async def start(self) -> None:
-        await self._serial.start_and_listen()
+        self._parser.clear_hdlc_buffer()
+        if not self._decode_in_thread:
+            await self._reader.start_and_listen()
+            return
+
+        self._decode_queue = asyncio.Queue()
+        decoder = asyncio.ensure_future(self._decode_received_data(self._decode_queue))
+        try:
+            await self._reader.start_and_listen()
+            # decode the remaining data of a finished reader
+            self._decode_queue.put_nowait(None)
+            await decoder
+        finally:
+            self._decode_queue = None
+            decoder.cancel()
+            if self._decoding:
+                # the parser must not be used by the thread anymore when the meter is restarted
+                await asyncio.wait((self._decoding,))
+
+    def _build_reader(self, serial_config: SerialConfig, reader_config: ReaderConfig) -> Reader:
+        if TcpReader.is_tcp_url(serial_config.port):
+            return TcpReader(serial_config.port, self._data_received)
+        if reader_config.backend == "aioserial":
+            return SerialReader(serial_config, self._data_received, reader_config.chunked_read)
+        if reader_config.backend == "fd":
+            return FdSerialReader(serial_config, self._data_received)
+        if reader_config.backend == "replay":
+            return ReplayReader(serial_config.port, self._data_received, reader_config.replay_speed)
+        raise ReaderError(f"Invalid reader backend: {reader_config.backend}")
 
     def _data_received(self, received_data: bytes) -> None:
         if not received_data:
             return
+        start = time.perf_counter()
+        METRICS.increment(self._name, "reads")
+        METRICS.increment(self._name, "bytes_received", len(received_data))
+        if self._capture:
+            self._capture.write(received_data)
+        if self._decode_queue is not None:
+            self._decode_queue.put_nowait(received_data)
+        else:
+            for reading in self._decode(received_data):
+                self._notify_observers(reading)
+        METRICS.observe(self._name, "read_handling", time.perf_counter() - start)
+
+    async def _decode_received_data(self, queue: "asyncio.Queue[Optional[bytes]]") -> None:
+        """Decodes the received data in a thread of the default executor, one batch at a time to keep the order."""
+        loop = asyncio.get_running_loop()
+        while True:
+            chunks = [await queue.get()]
+            while not queue.empty():
+                chunks.append(queue.get_nowait())
+            self._decoding = loop.run_in_executor(None, self._decode_chunks, [chunk for chunk in chunks if chunk])
+            # the thread cannot be interrupted, a cancelled meter waits for it in start()
+            messages = await asyncio.shield(self._decoding)
+            self._decoding = None
+            for reading in messages:
+                self._notify_observers(reading)
+            if chunks[-1] is None:
+                return
+
+    def _decode_chunks(self, chunks: List[bytes]) -> List[MeterReading]:
+        messages = []
+        for received_data in chunks:
+            messages.extend(self._decode(received_data))
+        return messages
+
+    def _decode(self, received_data: bytes) -> List[MeterReading]:
+        """Returns: The readings of all messages completed by the received data."""
         if received_data == SerialHdlcDlmsMeter.HDLC_FLAG:
             self._parser.append_to_hdlc_buffer(received_data)
-            return
+            return []
 
+        messages = []
+        extraction_start = time.perf_counter()
         self._parser.append_to_hdlc_buffer(received_data)
-        if self._parser.extract_data_from_hdlc_frames():
-            dlms_objects = self._parser.parse_to_dlms_objects()
-            if not dlms_objects:
-                return
-            message_time = self._parser.extract_message_time()
-            data_points = self._parser.convert_dlms_bundle_to_reader_data(dlms_objects, message_time)
-            self._notify_observers(data_points)
+        # received data may contain frames of more than one message
+        while self._parser.extract_data_from_hdlc_frames():
+            METRICS.observe(self._name, "hdlc_extraction", time.perf_counter() - extraction_start)
+            reading = self._parser.parse_to_meter_data()
+            if reading:
+                METRICS.increment(self._name, "messages")
+                METRICS.increment(self._name, "data_points", len(reading))
+                messages.append(reading)
+            extraction_start = time.perf_counter()
+        METRICS.observe(self._name, "hdlc_extraction", time.perf_counter() - extraction_start)
+        return messages
@@ -5,19 +5,25 @@
 # SPDX-License-Identifier: GPL-2.0-only
 # See LICENSES/README.md for more information.
 #
-import dataclasses
 import json
+from array import array
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class MeterDataPointType:
+    __slots__ = ("identifier", "name", "unit")
     identifier: str
     name: str
     unit: str
 
+    def __reduce__(self):
+        # frozen slotted dataclasses cannot be unpickled by setting their attributes
+        return MeterDataPointType, (self.identifier, self.name, self.unit)
+
 
 class MeterDataPointTypes(Enum):
     ACTIVE_POWER_P = MeterDataPointType("ACTIVE_POWER_P", "Active Power +", "W")
@@ -85,8 +91,53 @@ class MeterDataPointTypes(Enum):
     WATER = MeterDataPointType("WATER", "Accumulated volume", "m3")
 
 
+class MeterDataPointTypeRegistry:
+    """Assigns small integer ids to data point types.
+
+    The types of `MeterDataPointTypes` are registered first and have the same ids in every process,
+    ids of other types depend on the order of registration. Only ids below `BUILTIN_TYPE_COUNT` may
+    therefore be passed between processes, other types have to be passed by value.
+    """
+
+    def __init__(self, types: Iterable[MeterDataPointType] = ()) -> None:
+        self._types: List[MeterDataPointType] = []
+        self._ids: Dict[MeterDataPointType, int] = {}
+        for point_type in types:
+            self.register(point_type)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def register(self, point_type: MeterDataPointType) -> int:
+        """Returns: The id of the type, registering it if it is unknown."""
+        type_id = self._ids.get(point_type, None)
+        if type_id is None:
+            type_id = self._ids[point_type] = len(self._types)
+            self._types.append(point_type)
+        return type_id
+
+    def id_of(self, point_type: MeterDataPointType) -> Optional[int]:
+        return self._ids.get(point_type, None)
+
+    def get(self, type_id: int) -> MeterDataPointType:
+        return self._types[type_id]
+
+
+DATA_POINT_TYPES = MeterDataPointTypeRegistry(t.value for t in MeterDataPointTypes)
+BUILTIN_TYPE_COUNT = len(DATA_POINT_TYPES)
+
+
+def portable_timestamp(timestamp: datetime) -> datetime:
+    """Returns: The timestamp with a standard library time zone, gurux time zones cannot be pickled."""
+    offset = timestamp.utcoffset()
+    if offset is None or isinstance(timestamp.tzinfo, timezone):
+        return timestamp
+    return timestamp.replace(tzinfo=timezone(offset))
+
+
 @dataclass
 class MeterDataPoint:
+    __slots__ = ("type", "value", "source", "timestamp")
     type: MeterDataPointType
     value: float
     source: str
@@ -96,6 +147,44 @@ class MeterDataPoint:
         return f"{self.source} - {self.timestamp.isoformat()} - {self.type.name}: {self.value} {self.type.unit}"
 
     def to_json(self) -> str:
-        dict_repr = dataclasses.asdict(self)
-        dict_repr['timestamp'] = self.timestamp.isoformat()
-        return json.dumps(dict_repr)
+        point_type = self.type
+        return json.dumps({
+            "type": {"identifier": point_type.identifier, "name": point_type.name, "unit": point_type.unit},
+            "value": self.value,
+            "source": self.source,
+            "timestamp": self.timestamp.isoformat(),
+        })
+
+
+@dataclass
+class MeterReading:
+    """Register values of one message of a meter, sharing source and timestamp.
+
+    The values are stored in an `array('d')` next to a tuple of their types, which is shared
+    by all readings of the same message layout. Iterating a reading yields `MeterDataPoint`s.
+    """
+    __slots__ = ("source", "timestamp", "types", "values")
+    source: str
+    timestamp: datetime
+    types: Tuple[MeterDataPointType, ...]
+    values: array
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[MeterDataPoint]:
+        for point_type, value in zip(self.types, self.values):
+            yield MeterDataPoint(point_type, value, self.source, self.timestamp)
+
+    def __getitem__(self, index: int) -> MeterDataPoint:
+        return MeterDataPoint(self.types[index], self.values[index], self.source, self.timestamp)
+
+    def data_points(self) -> List[MeterDataPoint]:
+        return list(self)
+
+    @staticmethod
+    def from_data_points(data_points: Sequence[MeterDataPoint]) -> "MeterReading":
+        """Creates a reading from data points which must not be empty. Source and timestamp are taken from the first."""
+        return MeterReading(data_points[0].source, data_points[0].timestamp,
+                            tuple(point.type for point in data_points),
+                            array("d", (point.value for point in data_points)))
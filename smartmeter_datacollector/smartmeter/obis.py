@@ -7,9 +7,11 @@
 #
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import ClassVar, Union
 
 REGEX = r"^(\d{1,3})\W(\d{1,3})\W(\d{1,3})\W(\d{1,3})\W(\d{1,3})\W(\d{1,3})$"
+INTERN_CACHE_SIZE = 1024
 
 
 @dataclass(frozen=True)
@@ -38,7 +40,9 @@ class OBISCode:
                 self.d == other.d)
 
     @classmethod
+    @lru_cache(maxsize=INTERN_CACHE_SIZE)
     def from_string(cls, obis_string: str) -> 'OBISCode':
+        """Parses an OBIS string. Parsed codes are interned, i.e. equal strings return the same instance."""
         match = cls.PATTERN.match(obis_string)
         if not match:
             raise ValueError(f"Invalid OBIS string {obis_string}.")
@@ -47,6 +51,11 @@ class OBISCode:
 
     @classmethod
     def from_bytes(cls, obis_bytes: Union[bytes, bytearray]) -> 'OBISCode':
+        return cls._from_bytes(bytes(obis_bytes))
+
+    @classmethod
+    @lru_cache(maxsize=INTERN_CACHE_SIZE)
+    def _from_bytes(cls, obis_bytes: bytes) -> 'OBISCode':
         if not cls.is_obis(obis_bytes):
             raise ValueError("Invalid OBIS bytes.")
         return cls(*obis_bytes)
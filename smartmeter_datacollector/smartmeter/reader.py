@@ -6,13 +6,43 @@
 # See LICENSES/README.md for more information.
 #
 from abc import ABC, abstractmethod
-from typing import Callable
+from configparser import SectionProxy
+from dataclasses import dataclass
+from typing import Callable, Optional
 
 
 class ReaderError(Exception):
     pass
 
 
+@dataclass
+class ReaderConfig:
+    backend: str = "aioserial"
+    chunked_read: bool = False
+    capture_path: Optional[str] = None
+    capture_max_size: int = 10 * 1024 * 1024
+    capture_segments: int = 10
+    replay_speed: float = 1.0
+    aes_gcm_backend: str = "auto"
+    # hex authentication key of encrypted meters, the tag is not verified without
+    auth_key: Optional[str] = None
+    decode_in_thread: bool = False
+
+    @staticmethod
+    def from_meter_config(config: SectionProxy) -> "ReaderConfig":
+        return ReaderConfig(
+            backend=config.get("backend", "aioserial"),
+            chunked_read=config.getboolean("chunked_read", False),
+            capture_path=config.get("capture_path") or None,
+            capture_max_size=config.getint("capture_max_size", 10 * 1024 * 1024),
+            capture_segments=config.getint("capture_segments", 10),
+            replay_speed=config.getfloat("replay_speed", 1.0),
+            aes_gcm_backend=config.get("aes_gcm_backend", "auto"),
+            auth_key=config.get("auth_key") or None,
+            decode_in_thread=config.getboolean("decode_in_thread", False)
+        )
+
+
 # pylint: disable=too-few-public-methods
 class Reader(ABC):
     def __init__(self, callback: Callable[[bytes], None]) -> None:
@@ -0,0 +1,87 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+import logging
+import os
+import re
+import time
+from typing import Callable, Iterator, Tuple
+
+from .frame_capture import CAPTURE_MAGIC, list_segments, read_capture
+from .reader import Reader, ReaderError
+
+LOGGER = logging.getLogger("smartmeter")
+
+QUOTED_HEX = re.compile(r"\"([0-9A-Fa-f\s]+)\"")
+
+
+class ReplayReader(Reader):
+    """Replays previously captured data instead of reading from a smart meter.
+
+    Supported sources are capture files written by `FrameCapture` (single segment or capture path)
+    and text files with one hex encoded frame per line (optionally quoted, lines starting with `#` are ignored).
+    With `speed` 1.0 the original pacing is kept, N replays N times faster and 0 replays as fast as possible.
+    Hex dumps contain no timestamps and are always replayed as fast as possible.
+    """
+    YIELD_INTERVAL = 100
+
+    def __init__(self, path: str, callback: Callable[[bytes], None], speed: float = 1.0) -> None:
+        super().__init__(callback)
+        if speed < 0:
+            raise ReaderError(f"Invalid replay speed {speed}.")
+        if not os.path.isfile(path) and not list_segments(path):
+            raise ReaderError(f"Replay source '{path}' not found.")
+        self._path = path
+        self._speed = speed
+
+    async def start_and_listen(self) -> None:
+        LOGGER.info("Start replaying '%s'.", self._path)
+        start = time.monotonic()
+        first_timestamp = None
+        count = 0
+        for timestamp, data in self._records():
+            if self._speed and timestamp:
+                if first_timestamp is None:
+                    first_timestamp = timestamp
+                delay = start + (timestamp - first_timestamp) / 1e9 / self._speed - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif count % self.YIELD_INTERVAL == 0:
+                await asyncio.sleep(0)
+            self._callback(data)
+            count += 1
+        duration = time.monotonic() - start
+        LOGGER.info("Replay of '%s' finished. %i chunks in %.3fs (%.1f/s).",
+                    self._path, count, duration, count / duration if duration else 0.0)
+
+    def _records(self) -> Iterator[Tuple[int, bytes]]:
+        if os.path.isfile(self._path) and not self._is_capture_file(self._path):
+            yield from ((0, frame) for frame in read_hex_dump(self._path))
+            return
+        try:
+            yield from read_capture(self._path)
+        except ValueError as ex:
+            raise ReaderError(ex) from ex
+
+    @staticmethod
+    def _is_capture_file(path: str) -> bool:
+        with open(path, "rb") as file:
+            return file.read(len(CAPTURE_MAGIC)) == CAPTURE_MAGIC
+
+
+def read_hex_dump(path: str) -> Iterator[bytes]:
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            for hex_str in QUOTED_HEX.findall(line) or [line]:
+                try:
+                    yield bytes.fromhex(hex_str)
+                except ValueError:
+                    LOGGER.warning("Skipping invalid hex dump line '%s'.", line)
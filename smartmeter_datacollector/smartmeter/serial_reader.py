@@ -6,10 +6,11 @@
 # See LICENSES/README.md for more information.
 #
 from dataclasses import dataclass
-from typing import Callable
+from typing import Callable, Optional
 
 import aioserial
 
+from .hdlc_framer import HdlcFramer
 from .reader import Reader, ReaderError
 
 
@@ -25,9 +26,17 @@ class SerialConfig:
 
 # pylint: disable=too-few-public-methods
 class SerialReader(Reader):
-    def __init__(self, serial_config: SerialConfig, callback: Callable[[bytes], None]) -> None:
+    CHUNK_SIZE = 4096
+
+    def __init__(self, serial_config: SerialConfig, callback: Callable[[bytes], None], chunked: bool = False) -> None:
+        """
+        By default the serial port is read until the termination byte is received.
+        With `chunked` all available bytes are read at once and complete HDLC frames are handed over
+        to the callback.
+        """
         super().__init__(callback)
         self._termination = serial_config.termination
+        self._framer: Optional[HdlcFramer] = HdlcFramer() if chunked else None
         try:
             self._serial = aioserial.AioSerial(
                 port=serial_config.port,
@@ -40,6 +49,30 @@ class SerialReader(Reader):
             raise ReaderError(ex) from ex
 
     async def start_and_listen(self) -> None:
+        if not self._serial.is_open:
+            # port has been closed after a failure, try to reopen it
+            try:
+                self._serial.open()
+            except aioserial.SerialException as ex:
+                raise ReaderError(ex) from ex
+        try:
+            if self._framer is not None:
+                self._framer.clear()
+                await self._listen_chunked()
+            else:
+                await self._listen_until_termination()
+        except aioserial.SerialException as ex:
+            self._serial.close()
+            raise ReaderError(ex) from ex
+
+    async def _listen_until_termination(self) -> None:
         while True:
             data: bytes = await self._serial.read_until_async(self._termination, None)
             self._callback(data)
+
+    async def _listen_chunked(self) -> None:
+        while True:
+            # blocks until the first byte only, a fixed size would wait until the chunk is full
+            data: bytes = await self._serial.read_async(min(max(1, self._serial.in_waiting), self.CHUNK_SIZE))
+            for frame in self._framer.feed(data):
+                self._callback(frame)
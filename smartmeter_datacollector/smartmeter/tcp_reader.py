@@ -0,0 +1,95 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+import logging
+import socket
+from typing import Callable, Tuple
+from urllib.parse import urlsplit
+
+from .hdlc_framer import HdlcFramer
+from .reader import Reader, ReaderError
+
+LOGGER = logging.getLogger("smartmeter")
+
+
+class TcpReader(Reader):
+    """Reads HDLC frames from a serial-to-Ethernet gateway (e.g. ser2net, Moxa NPort in TCP server mode).
+
+    The connection is kept open persistently and re-established with exponential backoff. The backoff
+    is reset once data is received on a connection.
+    """
+    URL_SCHEME = "tcp"
+    READ_SIZE = 65536
+    RECONNECT_DELAY_MIN = 1.0
+    RECONNECT_DELAY_MAX = 60.0
+    CONNECT_TIMEOUT = 10.0
+
+    def __init__(self, url: str, callback: Callable[[bytes], None]) -> None:
+        super().__init__(callback)
+        self._host, self._port = self.parse_url(url)
+        self._framer = HdlcFramer()
+
+    @classmethod
+    def is_tcp_url(cls, port: str) -> bool:
+        return port.startswith(f"{cls.URL_SCHEME}://")
+
+    @classmethod
+    def parse_url(cls, url: str) -> Tuple[str, int]:
+        try:
+            parts = urlsplit(url)
+            port = parts.port
+        except ValueError as ex:
+            raise ReaderError(f"Invalid TCP address '{url}'.") from ex
+        if parts.scheme != cls.URL_SCHEME or not parts.hostname or not port:
+            raise ReaderError(f"Invalid TCP address '{url}'. Expected format: tcp://host:port")
+        return parts.hostname, port
+
+    async def start_and_listen(self) -> None:
+        delay = self.RECONNECT_DELAY_MIN
+        while True:
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(self._host, self._port),
+                                                        self.CONNECT_TIMEOUT)
+            except (OSError, asyncio.TimeoutError) as ex:
+                LOGGER.warning("Unable to connect to %s:%i. Retrying in %.0fs. '%s'",
+                               self._host, self._port, delay, ex)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.RECONNECT_DELAY_MAX)
+                continue
+
+            LOGGER.info("Connected to %s:%i.", self._host, self._port)
+            sock = writer.get_extra_info("socket")
+            if sock is not None:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            try:
+                received = await self._listen(reader)
+            finally:
+                writer.close()
+            self._framer.clear()
+            # a gateway accepting connections without a meter attached must not be reconnected at full rate
+            if received:
+                delay = self.RECONNECT_DELAY_MIN
+            await asyncio.sleep(delay)
+            if not received:
+                delay = min(delay * 2, self.RECONNECT_DELAY_MAX)
+
+    async def _listen(self, reader: asyncio.StreamReader) -> bool:
+        """Returns: True if data was received before the connection was closed."""
+        received = False
+        try:
+            while True:
+                data = await reader.read(self.READ_SIZE)
+                if not data:
+                    LOGGER.warning("Connection to %s:%i closed by remote.", self._host, self._port)
+                    return received
+                received = True
+                for frame in self._framer.feed(data):
+                    self._callback(frame)
+        except OSError as ex:
+            LOGGER.warning("Connection to %s:%i lost. '%s'", self._host, self._port, ex)
+            return received
@@ -0,0 +1,79 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+import logging
+import time
+from enum import Enum
+
+from .smartmeter.meter import Meter
+
+LOGGER = logging.getLogger("smartmeter")
+
+
+class ReaderState(Enum):
+    STARTING = "starting"
+    RUNNING = "running"
+    BACKOFF = "backoff"
+    STOPPED = "stopped"
+
+
+class ReaderSupervisor:
+    """Runs a meter's reader, isolates its failures and restarts it with exponential backoff.
+
+    The backoff delay is reset once the reader has been running for at least `STABLE_TIME` seconds.
+    A reader which returns without failure (e.g. finished replay) is not restarted.
+    """
+    BACKOFF_MIN = 1.0
+    BACKOFF_MAX = 60.0
+    STABLE_TIME = 60.0
+
+    def __init__(self, meter: Meter, name: str) -> None:
+        self._meter = meter
+        self._name = name
+        self._state = ReaderState.STARTING
+        self._restarts = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def state(self) -> ReaderState:
+        return self._state
+
+    @property
+    def restarts(self) -> int:
+        return self._restarts
+
+    async def run(self) -> None:
+        delay = self.BACKOFF_MIN
+        while True:
+            self._set_state(ReaderState.RUNNING)
+            started = time.monotonic()
+            try:
+                await self._meter.start()
+            except asyncio.CancelledError:
+                self._set_state(ReaderState.STOPPED)
+                raise
+            except Exception as ex:  # pylint: disable=broad-except
+                if time.monotonic() - started >= self.STABLE_TIME:
+                    delay = self.BACKOFF_MIN
+                LOGGER.error("Reader %s failed. Restarting in %.1fs. '%s'", self._name, delay, ex)
+            else:
+                self._set_state(ReaderState.STOPPED)
+                return
+
+            self._set_state(ReaderState.BACKOFF)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.BACKOFF_MAX)
+            self._restarts += 1
+
+    def _set_state(self, state: ReaderState) -> None:
+        if state != self._state:
+            LOGGER.info("Reader %s: %s -> %s", self._name, self._state.value, state.value)
+            self._state = state
@@ -0,0 +1,115 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+from gurux_dlms.AesGcmParameter import AesGcmParameter
+from gurux_dlms.enums import Security
+from gurux_dlms.GXDLMSChippering import GXDLMSChippering
+
+from smartmeter_datacollector.smartmeter.aes_gcm import (GURUX_AUTHENTICATION_KEY, CipheredApdu,
+                                                         CryptographyAesGcm, GuruxAesGcm, create_aes_gcm_backend)
+from smartmeter_datacollector.smartmeter.fast_path import ApduAssembler
+
+from .utils import *
+
+KEY = bytes.fromhex("101112131415161718191A1B1C1D1E1F")
+AUTH_KEY = bytes.fromhex("A0A1A2A3A4A5A6A7A8A9AAABACADAEAF")
+
+
+def assemble(data: List[bytes]) -> bytes:
+    assembler = ApduAssembler()
+    for frame in data:
+        apdu = assembler.add(frame)
+    return apdu
+
+
+def test_gurux_backend_decrypts_data_notification(encrypted_valid_data_lge570: List[bytes]):
+    apdu = assemble(encrypted_valid_data_lge570)
+
+    plaintext = GuruxAesGcm(KEY).decrypt(apdu)
+
+    ciphered = CipheredApdu.from_general_glo_ciphering(apdu)
+    assert ciphered.tag is None
+    assert len(plaintext) == len(ciphered.ciphertext)
+    assert plaintext[0] == 0x0F
+
+
+def authenticate(apdu: bytes, authentication_key: bytes) -> bytes:
+    """Returns: The APDU encrypted again with authentication tag."""
+    plaintext = GuruxAesGcm(KEY).decrypt(apdu)
+    ciphered = CipheredApdu.from_general_glo_ciphering(apdu)
+    parameter = AesGcmParameter(0xDB, bytearray(ciphered.system_title), bytearray(KEY), bytearray(authentication_key))
+    parameter.security = Security.AUTHENTICATION_ENCRYPTION
+    parameter.invocationCounter = int.from_bytes(ciphered.invocation_counter, "big")
+    return bytes(GXDLMSChippering.encryptAesGcm(parameter, bytearray(plaintext)))
+
+
+def test_cryptography_backend_equals_gurux(encrypted_valid_data_lge570: List[bytes]):
+    pytest.importorskip("cryptography")
+    apdu = assemble(encrypted_valid_data_lge570)
+    plaintext = GuruxAesGcm(KEY).decrypt(apdu)
+    authenticated_apdu = authenticate(apdu, AUTH_KEY)
+    backend = CryptographyAesGcm(KEY)
+
+    assert backend.decrypt(apdu) == plaintext
+    assert backend.decrypt(authenticated_apdu) == plaintext
+    # without authentication key the tag is not verified, same as gurux
+    assert backend.decrypt(authenticated_apdu[:-1] + b"\x00") == plaintext
+
+
+def test_cryptography_backend_rejects_invalid_tag(encrypted_valid_data_lge570: List[bytes]):
+    pytest.importorskip("cryptography")
+    apdu = assemble(encrypted_valid_data_lge570)
+    authenticated_apdu = authenticate(apdu, AUTH_KEY)
+    backend = CryptographyAesGcm(KEY, AUTH_KEY)
+
+    assert backend.decrypt(authenticated_apdu) == GuruxAesGcm(KEY).decrypt(apdu)
+    with pytest.raises(ValueError):
+        backend.decrypt(authenticated_apdu[:-1] + bytes((authenticated_apdu[-1] ^ 0x01,)))
+    with pytest.raises(ValueError):
+        backend.decrypt(authenticated_apdu[:-20] + bytes((authenticated_apdu[-20] ^ 0x01,)) + authenticated_apdu[-19:])
+    with pytest.raises(ValueError):
+        CryptographyAesGcm(KEY, GURUX_AUTHENTICATION_KEY).decrypt(authenticated_apdu)
+
+
+def test_cryptography_backend_without_authentication_key(encrypted_data_no_pushlist_lg: List[bytes]):
+    pytest.importorskip("cryptography")
+    key = bytes.fromhex("F08660A6C19D2048556BF623AB0257E6")
+    apdu = assemble(encrypted_data_no_pushlist_lg)
+
+    assert CipheredApdu.from_general_glo_ciphering(apdu).tag is not None
+    assert CryptographyAesGcm(key).decrypt(apdu) == GuruxAesGcm(key).decrypt(apdu)
+
+
+def test_parser_falls_back_to_gurux_on_invalid_tag(encrypted_data_no_pushlist_lg: List[bytes]):
+    pytest.importorskip("cryptography")
+    parser = HdlcDlmsParser(Cosem("fallback_id"), "F08660A6C19D2048556BF623AB0257E6",
+                            authentication_key=GURUX_AUTHENTICATION_KEY.hex())
+    for frame in encrypted_data_no_pushlist_lg:
+        parser.append_to_hdlc_buffer(frame)
+        parser.extract_data_from_hdlc_frames()
+
+    assert len(parser.parse_to_dlms_objects()) == 16
+
+
+def test_create_backend():
+    assert isinstance(create_aes_gcm_backend("gurux", KEY), GuruxAesGcm)
+    with pytest.raises(ValueError):
+        create_aes_gcm_backend("openssl", KEY)
+
+
+def test_parser_backends_equal(encrypted_valid_data_lge570: List[bytes]):
+    pytest.importorskip("cryptography")
+    results = []
+    for backend in ("gurux", "cryptography"):
+        parser = HdlcDlmsParser(Cosem("fallback_id"), KEY.hex(), aes_gcm_backend=backend)
+        for frame in encrypted_valid_data_lge570:
+            parser.append_to_hdlc_buffer(frame)
+        assert parser.extract_data_from_hdlc_frames()
+        results.append(parser.parse_to_meter_data())
+
+    assert len(results[0]) > 0
+    assert results[0] == results[1]
@@ -0,0 +1,126 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+from configparser import ConfigParser
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pytest_mock import MockerFixture
+
+from smartmeter_datacollector.config import InvalidConfigError
+from smartmeter_datacollector.factory import build_sink_stages
+from smartmeter_datacollector.sinks.aggregation import AggregatingSink
+from smartmeter_datacollector.sinks.data_sink import DataSink
+from smartmeter_datacollector.sinks.logger_sink import LoggerSink
+from smartmeter_datacollector.smartmeter.meter_data import MeterDataPoint, MeterDataPointTypes, MeterReading
+
+START = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+POWER = MeterDataPointTypes.ACTIVE_POWER_P.value
+
+
+def create_reading(source: str, seconds: float, value: float) -> MeterReading:
+    return MeterReading.from_data_points([MeterDataPoint(POWER, value, source, START + timedelta(seconds=seconds))])
+
+
+@pytest.mark.asyncio
+async def test_aggregation_passes_complete_windows(mocker: MockerFixture):
+    sink = mocker.AsyncMock(DataSink)
+    aggregation = AggregatingSink(sink, 60, ["count", "min", "max", "mean", "last"])
+
+    await aggregation.send_batch([create_reading("meter1", 0, 2.0), create_reading("meter1", 10, 6.0)])
+    await aggregation.send_batch([create_reading("meter1", 50, 1.0)])
+    sink.send_batch.assert_not_awaited()
+
+    await aggregation.send_batch([create_reading("meter1", 60, 5.0)])
+
+    aggregate, = sink.send_batch.await_args.args[0]
+    assert aggregate.source == "meter1"
+    assert aggregate.timestamp == START + timedelta(seconds=60)
+    assert [point_type.identifier for point_type in aggregate.types] == [
+        "ACTIVE_POWER_P_COUNT", "ACTIVE_POWER_P_MIN", "ACTIVE_POWER_P_MAX", "ACTIVE_POWER_P_MEAN", "ACTIVE_POWER_P_LAST"]
+    assert aggregate.values.tolist() == [3.0, 1.0, 6.0, 3.0, 1.0]
+    assert aggregate.types[1].unit == POWER.unit
+
+
+@pytest.mark.asyncio
+async def test_aggregation_passes_windows_of_silent_sources(mocker: MockerFixture):
+    monotonic = mocker.patch("smartmeter_datacollector.sinks.aggregation.time.monotonic", return_value=1000.0)
+    sink = mocker.AsyncMock(DataSink)
+    aggregation = AggregatingSink(sink, 60, ["last"])
+
+    await aggregation.send_batch([create_reading("meter1", 0, 1.0), create_reading("meter2", 0, 2.0)])
+    monotonic.return_value = 1070.0
+    await aggregation.send_batch([create_reading("meter2", 70, 3.0)])
+    assert [reading.source for reading in sink.send_batch.await_args.args[0]] == ["meter2"]
+
+    monotonic.return_value = 1130.0
+    await aggregation.send_batch([create_reading("meter2", 130, 4.0)])
+    assert [reading.source for reading in sink.send_batch.await_args.args[0]] == ["meter2", "meter1"]
+
+    await aggregation.stop()
+    assert [reading.values.tolist() for reading in sink.send_batch.await_args.args[0]] == [[4.0]]
+    sink.stop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_aggregation_passes_window_of_single_silent_source(mocker: MockerFixture):
+    sink = mocker.AsyncMock(DataSink)
+    aggregation = AggregatingSink(sink, 0.05, ["last"])
+    await aggregation.start()
+
+    await aggregation.send_batch([create_reading("meter1", 0, 1.0)])
+    await asyncio.sleep(0.2)
+
+    aggregate, = sink.send_batch.await_args.args[0]
+    assert (aggregate.source, aggregate.values.tolist()) == ("meter1", [1.0])
+    await aggregation.stop()
+    assert sink.send_batch.await_count == 1
+    sink.stop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_aggregation_windows_are_independent_of_skewed_clocks(mocker: MockerFixture):
+    sink = mocker.AsyncMock(DataSink)
+    aggregation = AggregatingSink(sink, 60, ["count"])
+
+    # clock of meter2 is an hour ahead
+    await aggregation.send_batch([create_reading("meter1", 0, 1.0), create_reading("meter2", 3600, 1.0)])
+    await aggregation.send_batch([create_reading("meter1", 10, 1.0), create_reading("meter2", 3610, 1.0)])
+    sink.send_batch.assert_not_awaited()
+
+    await aggregation.send_batch([create_reading("meter1", 60, 1.0)])
+    aggregate, = sink.send_batch.await_args.args[0]
+    assert (aggregate.source, aggregate.values.tolist()) == ("meter1", [2.0])
+
+
+@pytest.mark.asyncio
+async def test_aggregation_drops_late_readings(mocker: MockerFixture):
+    sink = mocker.AsyncMock(DataSink)
+    aggregation = AggregatingSink(sink, 60, ["count"])
+
+    await aggregation.send_batch([create_reading("meter1", 0, 1.0), create_reading("meter1", 60, 1.0)])
+    await aggregation.send_batch([create_reading("meter1", 30, 1.0)])
+    assert sink.send_batch.await_count == 1
+
+    await aggregation.stop()
+    aggregate, = sink.send_batch.await_args.args[0]
+    assert aggregate.timestamp == START + timedelta(seconds=120)
+    assert aggregate.values.tolist() == [1.0]
+
+
+def test_aggregation_config():
+    config = ConfigParser()
+    config.read_dict({"sink0": {"type": "logger"},
+                      "sink1": {"type": "logger", "aggregation_window": "300", "aggregation_statistics": "mean, max"},
+                      "sink2": {"type": "logger", "aggregation_window": "300", "aggregation_statistics": "median"}})
+    sink = LoggerSink("DataLogger")
+
+    assert build_sink_stages(sink, config["sink0"]) is sink
+    assert isinstance(build_sink_stages(sink, config["sink1"]), AggregatingSink)
+    with pytest.raises(InvalidConfigError):
+        build_sink_stages(sink, config["sink2"])
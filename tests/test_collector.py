@@ -7,14 +7,19 @@
 #
 import asyncio
 import sys
+from configparser import ConfigParser
 from datetime import datetime, timezone
+from typing import List
 
 import pytest
 from pytest_mock import MockerFixture
 
-from smartmeter_datacollector.collector import Collector
+from smartmeter_datacollector.collector import Collector, CollectorConfig, OverflowPolicy, ReadingQueue, SinkQueue
+from smartmeter_datacollector.config import InvalidConfigError
+from smartmeter_datacollector.factory import build_collector, build_sinks
 from smartmeter_datacollector.sinks.data_sink import DataSink
-from smartmeter_datacollector.smartmeter.meter_data import MeterDataPoint, MeterDataPointType
+from smartmeter_datacollector.smartmeter.meter_data import (MeterDataPoint, MeterDataPointType, MeterDataPointTypes,
+                                                            MeterReading)
 
 
 @pytest.fixture
@@ -28,14 +33,17 @@ async def test_collector_with_one_sink(mocker: MockerFixture, test_type: MeterDa
     sink = mocker.AsyncMock(DataSink)
     data_point = MeterDataPoint(test_type, 0.0, "test_source", datetime.now(timezone.utc))
 
+    reading = MeterReading.from_data_points([data_point])
+
     coll.register_sink(sink)
-    coll.notify([data_point])
+    coll.notify(reading)
     routine = coll.process_queue()
 
     with pytest.raises(asyncio.TimeoutError):
         await asyncio.wait_for(routine, 0.1)
 
-    sink.send.assert_awaited_once_with(data_point)
+    sink.send_batch.assert_awaited_once_with([reading])
+    assert list(reading) == [data_point]
 
 
 @pytest.mark.asyncio
@@ -46,14 +54,15 @@ async def test_collector_with_one_sink_multiple_data_points(mocker: MockerFixtur
     coll.register_sink(sink)
     point0 = MeterDataPoint(test_type, 0.0, "test_source", datetime.now(timezone.utc))
     point1 = MeterDataPoint(test_type, 1.0, "test_source", datetime.now(timezone.utc))
-    coll.notify([point0, point1])
+    reading = MeterReading.from_data_points([point0, point1])
+    coll.notify(reading)
     routine = coll.process_queue()
 
     with pytest.raises(asyncio.TimeoutError):
         await asyncio.wait_for(routine, 0.1)
 
-    sink.send.assert_awaited_with(point1)
-    assert sink.send.await_count == 2
+    sink.send_batch.assert_awaited_once_with([reading])
+    assert reading.values.tolist() == [0.0, 1.0]
 
 
 @pytest.mark.asyncio
@@ -64,13 +73,220 @@ async def test_collector_with_two_sinks(mocker: MockerFixture, test_type: MeterD
 
     data_point = MeterDataPoint(test_type, 0.0, "test_source", datetime.now(timezone.utc))
 
+    reading = MeterReading.from_data_points([data_point])
+
     coll.register_sink(sink0)
     coll.register_sink(sink1)
-    coll.notify([data_point])
+    coll.notify(reading)
     routine = coll.process_queue()
 
     with pytest.raises(asyncio.TimeoutError):
         await asyncio.wait_for(routine, 0.1)
 
-    sink0.send.assert_awaited_once_with(data_point)
-    sink1.send.assert_awaited_once_with(data_point)
+    sink0.send_batch.assert_awaited_once_with([reading])
+    sink1.send_batch.assert_awaited_once_with([reading])
+
+
+@pytest.mark.asyncio
+async def test_collector_drains_queue_in_batches(mocker: MockerFixture, test_type: MeterDataPointType):
+    coll = Collector(CollectorConfig(batch_size=2))
+    sink = mocker.AsyncMock(DataSink)
+    readings = [MeterReading.from_data_points([MeterDataPoint(test_type, float(i), "test_source",
+                                                              datetime.now(timezone.utc))]) for i in range(3)]
+
+    coll.register_sink(sink)
+    for reading in readings:
+        coll.notify(reading)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(coll.process_queue(), 0.1)
+
+    assert sink.send_batch.await_args_list == [mocker.call(readings[:2]), mocker.call(readings[2:])]
+
+
+@pytest.mark.asyncio
+async def test_data_sink_sends_batch_per_data_point(mocker: MockerFixture, test_type: MeterDataPointType):
+    sink = mocker.AsyncMock(DataSink)
+    sink.send_batch = DataSink.send_batch.__get__(sink)
+    sink.send_reading = DataSink.send_reading.__get__(sink)
+    point0 = MeterDataPoint(test_type, 0.0, "test_source", datetime.now(timezone.utc))
+    point1 = MeterDataPoint(test_type, 1.0, "test_source", datetime.now(timezone.utc))
+
+    await sink.send_batch([MeterReading.from_data_points([point0]), MeterReading.from_data_points([point1])])
+
+    assert sink.send.await_args_list == [mocker.call(point0), mocker.call(point1)]
+
+
+@pytest.mark.asyncio
+async def test_collector_slow_sink_does_not_stall_others(mocker: MockerFixture, test_type: MeterDataPointType):
+    coll = Collector()
+    slow_sink = mocker.AsyncMock(DataSink)
+
+    async def send_slowly(_):
+        await asyncio.sleep(10)
+
+    slow_sink.send_batch.side_effect = send_slowly
+    sink = mocker.AsyncMock(DataSink)
+    readings = [MeterReading.from_data_points([MeterDataPoint(test_type, float(i), "test_source",
+                                                              datetime.now(timezone.utc))]) for i in range(2)]
+
+    coll.register_sink(slow_sink)
+    coll.register_sink(sink)
+    routine = asyncio.create_task(coll.process_queue())
+    for reading in readings:
+        coll.notify(reading)
+        await asyncio.sleep(0.05)
+    routine.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await routine
+
+    slow_sink.send_batch.assert_awaited_once_with(readings[:1])
+    assert sink.send_batch.await_args_list == [mocker.call(readings[:1]), mocker.call(readings[1:])]
+
+
+@pytest.mark.asyncio
+async def test_collector_drops_readings_of_full_sink_queue(mocker: MockerFixture, test_type: MeterDataPointType):
+    coll = Collector(CollectorConfig(queue_size=1))
+    sink = mocker.AsyncMock(DataSink)
+    readings = [MeterReading.from_data_points([MeterDataPoint(test_type, float(i), "test_source",
+                                                              datetime.now(timezone.utc))]) for i in range(2)]
+
+    coll.register_sink(sink)
+    for reading in readings:
+        coll.notify(reading)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(coll.process_queue(), 0.1)
+
+    sink.send_batch.assert_awaited_once_with(readings[:1])
+
+
+@pytest.mark.asyncio
+async def test_collector_restarts_failed_sink_consumer(mocker: MockerFixture, test_type: MeterDataPointType):
+    mocker.patch.object(SinkQueue, "RESTART_DELAY", 0.0)
+    coll = Collector(CollectorConfig(batch_size=1))
+    failing_sink = mocker.AsyncMock(DataSink)
+    failing_sink.send_batch.side_effect = [RuntimeError("sink failed"), None]
+    sink = mocker.AsyncMock(DataSink)
+    readings = [MeterReading.from_data_points([MeterDataPoint(test_type, float(i), "test_source",
+                                                              datetime.now(timezone.utc))]) for i in range(2)]
+
+    coll.register_sink(failing_sink)
+    coll.register_sink(sink)
+    for reading in readings:
+        coll.notify(reading)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(coll.process_queue(), 0.1)
+
+    assert failing_sink.send_batch.await_args_list == [mocker.call(readings[:1]), mocker.call(readings[1:])]
+    assert sink.send_batch.await_args_list == [mocker.call(readings[:1]), mocker.call(readings[1:])]
+
+
+def test_collector_config():
+    config = ConfigParser()
+    assert CollectorConfig.from_config(config) == CollectorConfig()
+
+    config.read_dict({"collector": {"batch_size": "0", "batch_delay": "0.5", "queue_size": "50",
+                                    "overflow": "coalesce"}})
+    assert CollectorConfig.from_config(config) == CollectorConfig(batch_size=1, batch_delay=0.5, queue_size=50,
+                                                                  overflow=OverflowPolicy.COALESCE)
+
+    config.read_dict({"collector": {"overflow": "drop_all"}})
+    with pytest.raises(InvalidConfigError):
+        CollectorConfig.from_config(config)
+
+
+def test_collector_config_per_sink():
+    config = ConfigParser()
+    config.read_dict({"collector": {"batch_size": "10", "queue_size": "50"},
+                      "sink0": {"type": "logger"},
+                      "sink1": {"type": "logger", "queue_size": "5", "overflow": "drop_oldest"},
+                      "sink2": {"type": "logger", "overflow": "drop_all"}})
+    collector_config = CollectorConfig.from_config(config)
+
+    assert collector_config.for_sink(config["sink0"]) == collector_config
+    assert collector_config.for_sink(config["sink1"]) == CollectorConfig(batch_size=10, queue_size=5,
+                                                                        overflow=OverflowPolicy.DROP_OLDEST)
+    with pytest.raises(InvalidConfigError):
+        collector_config.for_sink(config["sink2"])
+
+
+def test_build_collector_uses_sink_queue_config(mocker: MockerFixture):
+    config = ConfigParser()
+    config.read_dict({"collector": {"queue_size": "50"},
+                      "sink0": {"type": "logger"},
+                      "sink1": {"type": "logger", "queue_size": "5"}})
+    sink_queue_mock = mocker.patch("smartmeter_datacollector.collector.SinkQueue")
+
+    build_collector([], build_sinks(config), config)
+
+    assert [c.args[2].queue_size for c in sink_queue_mock.call_args_list] == [50, 5]
+
+
+def create_reading(source: str, values: List[float]) -> MeterReading:
+    types = (MeterDataPointTypes.ACTIVE_POWER_P.value, MeterDataPointTypes.VOLTAGE_L1.value)
+    return MeterReading.from_data_points([MeterDataPoint(point_type, value, source, datetime.now(timezone.utc))
+                                          for point_type, value in zip(types, values)])
+
+
+@pytest.mark.asyncio
+async def test_reading_queue_drop_policies():
+    readings = [create_reading("meter", [float(i)]) for i in range(3)]
+    drop_newest = ReadingQueue(2, OverflowPolicy.DROP_NEWEST)
+    drop_oldest = ReadingQueue(2, OverflowPolicy.DROP_OLDEST)
+
+    for reading in readings:
+        drop_newest.put(0.0, reading)
+        drop_oldest.put(0.0, reading)
+
+    assert [(await drop_newest.get())[1] for _ in range(2)] == readings[:2]
+    assert [(await drop_oldest.get())[1] for _ in range(2)] == readings[1:]
+
+
+@pytest.mark.asyncio
+async def test_reading_queue_coalesces_latest_values():
+    queue = ReadingQueue(2, OverflowPolicy.COALESCE)
+
+    assert queue.put(1.0, create_reading("meter1", [1.0, 230.0])) == (0, 0)
+    assert queue.put(2.0, create_reading("meter2", [2.0, 231.0])) == (0, 0)
+    # replaces both values of the first reading
+    assert queue.put(3.0, create_reading("meter1", [3.0, 232.0])) == (0, 2)
+    # replaces one value of the second reading, the oldest reading is dropped as it is still full
+    assert queue.put(4.0, create_reading("meter2", [4.0])) == (1, 1)
+
+    items = [queue.get_nowait() for _ in range(queue.qsize())]
+    assert [enqueued for enqueued, _ in items] == [3.0, 4.0]
+    assert [point.value for point in items[0][1]] == [3.0, 232.0]
+    assert [point.value for point in items[1][1]] == [4.0]
+    assert queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_reading_queue_coalesces_only_the_source_of_the_new_reading():
+    queue = ReadingQueue(3, OverflowPolicy.COALESCE)
+    queue.put(1.0, create_reading("meter1", [1.0]))
+    queue.put(2.0, create_reading("meter1", [2.0]))
+    queue.put(3.0, create_reading("meter2", [3.0]))
+
+    # nothing of meter3 to coalesce, the oldest reading is dropped
+    assert queue.put(4.0, create_reading("meter3", [4.0])) == (1, 0)
+    # the older reading of meter2 is superseded
+    assert queue.put(5.0, create_reading("meter2", [5.0])) == (0, 1)
+
+    items = [queue.get_nowait() for _ in range(queue.qsize())]
+    assert [(reading.source, enqueued) for enqueued, reading in items] == [
+        ("meter1", 2.0), ("meter3", 4.0), ("meter2", 5.0)]
+
+
+def test_reading_queue_memory_is_bounded_while_coalescing():
+    queue = ReadingQueue(100, OverflowPolicy.COALESCE)
+
+    for i in range(10000):
+        queue.put(float(i), create_reading(f"meter{i % 10}", [float(i), 230.0]))
+
+    assert queue.qsize() <= 100
+    assert len(queue._items) <= 2 * 100 + 1
+    items = [queue.get_nowait() for _ in range(queue.qsize())]
+    assert queue.empty()
+    assert items[-1][0] == 9999.0
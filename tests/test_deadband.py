@@ -0,0 +1,101 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+from configparser import ConfigParser
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+import pytest
+from pytest_mock import MockerFixture
+
+from smartmeter_datacollector.config import InvalidConfigError
+from smartmeter_datacollector.factory import build_sink_stages
+from smartmeter_datacollector.sinks.aggregation import AggregatingSink
+from smartmeter_datacollector.sinks.data_sink import DataSink
+from smartmeter_datacollector.sinks.deadband import Deadband, DeadbandConfig, DeadbandSink
+from smartmeter_datacollector.sinks.logger_sink import LoggerSink
+from smartmeter_datacollector.smartmeter.meter_data import MeterDataPoint, MeterDataPointTypes, MeterReading
+
+START = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+POWER = MeterDataPointTypes.ACTIVE_POWER_P.value
+VOLTAGE = MeterDataPointTypes.VOLTAGE_L1.value
+
+
+def create_reading(seconds: float, power: float, voltage: float) -> MeterReading:
+    timestamp = START + timedelta(seconds=seconds)
+    return MeterReading.from_data_points([MeterDataPoint(POWER, power, "meter1", timestamp),
+                                          MeterDataPoint(VOLTAGE, voltage, "meter1", timestamp)])
+
+
+def passed_values(sink) -> List[List[Tuple[str, float]]]:
+    return [[(point.type.identifier, point.value) for point in reading]
+            for call in sink.send_batch.await_args_list for reading in call.args[0]]
+
+
+@pytest.mark.asyncio
+async def test_deadband_suppresses_small_changes(mocker: MockerFixture):
+    sink = mocker.AsyncMock(DataSink)
+    config = DeadbandConfig(Deadband(relative=0.1), {"VOLTAGE_L1": Deadband(absolute=2.0)})
+    deadband = DeadbandSink(sink, config)
+
+    await deadband.send_batch([create_reading(0, 100.0, 230.0), create_reading(5, 105.0, 231.5)])
+    await deadband.send_batch([create_reading(10, 111.0, 232.5)])
+    await deadband.send_batch([create_reading(15, 115.0, 231.0)])
+
+    assert passed_values(sink) == [
+        [("ACTIVE_POWER_P", 100.0), ("VOLTAGE_L1", 230.0)],
+        [("ACTIVE_POWER_P", 111.0), ("VOLTAGE_L1", 232.5)],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_deadband_passes_heartbeat_after_max_silence(mocker: MockerFixture):
+    sink = mocker.AsyncMock(DataSink)
+    deadband = DeadbandSink(sink, DeadbandConfig(Deadband(absolute=1.0), max_silence=60))
+
+    for seconds in range(0, 130, 10):
+        await deadband.send_batch([create_reading(seconds, 100.0, 230.0)])
+
+    assert [reading.timestamp for call in sink.send_batch.await_args_list for reading in call.args[0]] == [
+        START, START + timedelta(seconds=60), START + timedelta(seconds=120)]
+
+
+@pytest.mark.asyncio
+async def test_deadband_with_max_silence_only_suppresses_unchanged_values(mocker: MockerFixture):
+    sink = mocker.AsyncMock(DataSink)
+    config = ConfigParser()
+    config.read_dict({"sink0": {"type": "logger", "deadband_max_silence": "60"}})
+    deadband = build_sink_stages(sink, config["sink0"])
+    assert isinstance(deadband, DeadbandSink)
+
+    for seconds, power in ((0, 100.0), (10, 100.0), (20, 100.5), (70, 100.5), (80, 100.5)):
+        await deadband.send_batch([create_reading(seconds, power, 230.0)])
+
+    assert passed_values(sink) == [
+        [("ACTIVE_POWER_P", 100.0), ("VOLTAGE_L1", 230.0)],
+        [("ACTIVE_POWER_P", 100.5)],
+        # heartbeats
+        [("VOLTAGE_L1", 230.0)],
+        [("ACTIVE_POWER_P", 100.5)],
+    ]
+
+
+def test_deadband_config():
+    config = ConfigParser()
+    config.read_dict({"sink0": {"type": "logger", "deadband_relative": "0.01", "deadband.voltage_l1": "2, 0.005",
+                                "deadband_max_silence": "300", "aggregation_window": "60"},
+                      "sink1": {"type": "logger", "deadband.voltage_l1": "-1"},
+                      "sink2": {"type": "logger"}})
+
+    assert DeadbandConfig.from_sink_config(config["sink0"]) == DeadbandConfig(
+        Deadband(0.0, 0.01), {"VOLTAGE_L1": Deadband(2.0, 0.005)}, 300.0)
+    assert not DeadbandConfig.from_sink_config(config["sink2"]).enabled
+    sink = build_sink_stages(LoggerSink("DataLogger"), config["sink0"])
+    assert isinstance(sink, AggregatingSink)
+    assert isinstance(sink._sink, DeadbandSink)
+    with pytest.raises(InvalidConfigError):
+        build_sink_stages(LoggerSink("DataLogger"), config["sink1"])
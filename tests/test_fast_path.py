@@ -0,0 +1,71 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+from smartmeter_datacollector.smartmeter.cosem import Cosem
+from smartmeter_datacollector.smartmeter.fast_path import ApduAssembler, FastPathLayout, notification_body
+from smartmeter_datacollector.smartmeter.hdlc_dlms_parser import HdlcDlmsParser
+from smartmeter_datacollector.smartmeter.meter_data import MeterReading
+
+from .utils import *
+
+
+def parse_all(parser: HdlcDlmsParser, data: List[bytes]) -> List[MeterReading]:
+    messages = []
+    for frame in data:
+        parser.append_to_hdlc_buffer(frame)
+        while parser.extract_data_from_hdlc_frames():
+            messages.append(parser.parse_to_meter_data())
+    return messages
+
+
+def test_assembler_reassembles_block_transfer(unencrypted_valid_data_lg: List[bytes]):
+    assembler = ApduAssembler()
+
+    apdus = [assembler.add(frame) for frame in unencrypted_valid_data_lg]
+
+    # first message is incomplete and discarded with the start of the second one
+    assert apdus[:-1] == [None] * 5
+    assert len(assembler.frames) == 4
+    assert notification_body(apdus[-1]).startswith(bytes.fromhex("02 10 01 10"))
+
+
+def test_fast_path_equals_full_decoding(unencrypted_valid_data_lg: List[bytes], cosem_config_lg: Cosem, mocker):
+    parser = HdlcDlmsParser(cosem_config_lg)
+    full_decoded = parse_all(parser, unencrypted_valid_data_lg)
+    get_data_spy = mocker.spy(parser._client, "getData")
+
+    fast_decoded = parse_all(parser, unencrypted_valid_data_lg[2:])
+
+    assert get_data_spy.call_count == 0
+    assert len(fast_decoded) == 1
+    assert len(fast_decoded[0]) == 11
+    assert fast_decoded == full_decoded
+
+
+def test_fast_path_falls_back_on_other_layout(unencrypted_valid_data_lg: List[bytes],
+                                              unencrypted_valid_data_lg2: List[bytes], cosem_config_lg: Cosem):
+    parser = HdlcDlmsParser(cosem_config_lg)
+    parse_all(parser, unencrypted_valid_data_lg)
+
+    messages = parse_all(parser, unencrypted_valid_data_lg2)
+
+    expected = parse_all(HdlcDlmsParser(cosem_config_lg), unencrypted_valid_data_lg2)
+    assert len(messages) == len(expected) == 1
+    assert [(p.type, p.value) for p in messages[0]] == [(p.type, p.value) for p in expected[0]]
+    assert len(messages[0]) == 8
+
+
+def test_fast_path_unsupported_layout_is_not_compiled_again(unencrypted_valid_data_lg: List[bytes],
+                                                            cosem_config_lg: Cosem, mocker):
+    parser = HdlcDlmsParser(cosem_config_lg)
+    compile_mock = mocker.patch.object(FastPathLayout, "compile", side_effect=ValueError("Unsupported layout."))
+
+    first = parse_all(parser, unencrypted_valid_data_lg)
+    second = parse_all(parser, unencrypted_valid_data_lg[2:])
+
+    assert len(first) == len(second) == 1
+    assert compile_mock.call_count == 1
@@ -0,0 +1,36 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+import os
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from smartmeter_datacollector.smartmeter.fd_serial_reader import FdSerialReader
+from smartmeter_datacollector.smartmeter.reader import ReaderError
+from smartmeter_datacollector.smartmeter.serial_reader import SerialConfig
+
+from .utils import *
+
+
+@pytest.mark.asyncio
+async def test_fd_reader_provides_frames(mocker: MockerFixture, pty_pair, unencrypted_valid_data_lg: List[bytes]):
+    master, port = pty_pair
+    callback = mocker.stub()
+    reader = FdSerialReader(SerialConfig(port, 2400, parity="E"), callback)
+
+    os.write(master, b"".join(unencrypted_valid_data_lg))
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(reader.start_and_listen(), 0.2)
+
+    assert [c.args[0] for c in callback.call_args_list] == unencrypted_valid_data_lg
+
+
+def test_fd_reader_invalid_port(mocker: MockerFixture):
+    with pytest.raises(ReaderError):
+        FdSerialReader(SerialConfig("/test/port"), mocker.stub())
@@ -0,0 +1,59 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+from pathlib import Path
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from smartmeter_datacollector.smartmeter.frame_capture import FrameCapture, list_segments, read_capture
+from smartmeter_datacollector.smartmeter.lge450 import LGE450
+from smartmeter_datacollector.smartmeter.reader import ReaderConfig
+
+from .utils import *
+
+
+def test_capture_write_and_read(tmp_path: Path, unencrypted_valid_data_lg: List[bytes]):
+    path = str(tmp_path / "reader0.cap")
+    capture = FrameCapture(path)
+    for frame in unencrypted_valid_data_lg:
+        capture.write(frame)
+    capture.close()
+
+    records = list(read_capture(path))
+    assert [data for _, data in records] == unencrypted_valid_data_lg
+    timestamps = [timestamp for timestamp, _ in records]
+    assert timestamps == sorted(timestamps)
+
+
+def test_capture_rotates_segments(tmp_path: Path, unencrypted_valid_data_lg: List[bytes]):
+    path = str(tmp_path / "reader0.cap")
+    capture = FrameCapture(path, max_segment_size=1, max_segments=3)
+    for frame in unencrypted_valid_data_lg:
+        capture.write(frame)
+        capture.flush()
+    capture.close()
+
+    segments = list_segments(path)
+    assert len(segments) == 3
+    assert segments[-1].endswith(f".{len(unencrypted_valid_data_lg) - 1:06d}")
+    assert [data for _, data in read_capture(path)] == unencrypted_valid_data_lg[-3:]
+    assert [data for _, data in read_capture(segments[0])] == unencrypted_valid_data_lg[-3:-2]
+
+
+@pytest.mark.asyncio
+async def test_lge450_captures_received_data(mocker: MockerFixture, tmp_path: Path,
+                                             unencrypted_valid_data_lg: List[bytes]):
+    mocker.patch("smartmeter_datacollector.smartmeter.meter.SerialReader", autospec=True)
+    path = str(tmp_path / "reader0.cap")
+    meter = LGE450("/test/port", reader_config=ReaderConfig(capture_path=path))
+
+    for frame in unencrypted_valid_data_lg:
+        meter._data_received(frame)
+    meter._capture.close()
+
+    assert [data for _, data in read_capture(path)] == unencrypted_valid_data_lg
@@ -11,7 +11,8 @@ import re
 from gurux_dlms.objects.GXDLMSObject import GXDLMSObject
 
 from smartmeter_datacollector.smartmeter.cosem import Cosem
-from smartmeter_datacollector.smartmeter.hdlc_dlms_parser import HdlcDlmsParser
+from smartmeter_datacollector.smartmeter.hdlc_dlms_parser import ExtractionPlan, HdlcDlmsParser
+from smartmeter_datacollector.smartmeter.meter_data import MeterReading
 
 from .utils import *
 
@@ -56,7 +57,7 @@ class TestHdlcParserUnencrypted:
         dlms_objects = parser.parse_to_dlms_objects()
         meter_data = parser.convert_dlms_bundle_to_reader_data(dlms_objects)
 
-        assert isinstance(meter_data, list)
+        assert isinstance(meter_data, MeterReading)
         assert len(meter_data) == 11
         assert any(data.type == MeterDataPointTypes.ACTIVE_POWER_P.value for data in meter_data)
         assert any(data.type == MeterDataPointTypes.ACTIVE_POWER_N.value for data in meter_data)
@@ -64,12 +65,43 @@ class TestHdlcParserUnencrypted:
         assert all(data.source == "LGZ1030655933512" for data in meter_data)
         assert all(data.timestamp.strftime(r"%m/%d/%y %H:%M:%S") == "07/06/21 14:58:18" for data in meter_data)
 
+    def test_reuse_push_object_schema(self, unencrypted_valid_data_lg: List[bytes], cosem_config_lg: Cosem, mocker):
+        parser = prepare_parser(unencrypted_valid_data_lg, cosem_config_lg)
+        parse_spy = mocker.spy(parser._client, "parsePushObjects")
+        first_objects = parser.parse_to_dlms_objects()
+        first_data = parser.convert_dlms_bundle_to_reader_data(first_objects)
+
+        for frame in unencrypted_valid_data_lg:
+            parser.append_to_hdlc_buffer(frame)
+            parser.extract_data_from_hdlc_frames()
+        second_objects = parser.parse_to_dlms_objects()
+        second_data = parser.convert_dlms_bundle_to_reader_data(second_objects)
+
+        assert parse_spy.call_count == 1
+        assert all(first is second for first, second in zip(first_objects, second_objects))
+        assert first_data == second_data
+
+    def test_reuse_extraction_plan(self, unencrypted_valid_data_lg: List[bytes],
+                                   unencrypted_valid_data_lg2: List[bytes], cosem_config_lg: Cosem, mocker):
+        compile_spy = mocker.spy(ExtractionPlan, "compile")
+        parser = HdlcDlmsParser(cosem_config_lg)
+        readings = []
+        for data in (unencrypted_valid_data_lg, unencrypted_valid_data_lg, unencrypted_valid_data_lg2):
+            for frame in data:
+                parser.append_to_hdlc_buffer(frame)
+            assert parser.extract_data_from_hdlc_frames()
+            readings.append(parser.convert_dlms_bundle_to_reader_data(parser.parse_to_dlms_objects()))
+
+        assert compile_spy.call_count == 2
+        assert readings[0] == readings[1]
+        assert len(readings[2]) == 8
+
     def test_parse_dlms_extended_register_to_meter_data(self, unencrypted_valid_data_extended_register_lg: List[bytes], cosem_config_lg: Cosem):
         parser = prepare_parser(unencrypted_valid_data_extended_register_lg, cosem_config_lg)
         dlms_objects = parser.parse_to_dlms_objects()
         meter_data = parser.convert_dlms_bundle_to_reader_data(dlms_objects)
 
-        assert isinstance(meter_data, list)
+        assert isinstance(meter_data, MeterReading)
         assert len(meter_data) == 1
         assert any(data.type == MeterDataPointTypes.WATER.value for data in meter_data)
         assert all(isinstance(data.value, float) for data in meter_data)
@@ -81,7 +113,7 @@ class TestHdlcParserUnencrypted:
         dlms_objects = parser.parse_to_dlms_objects()
         meter_data = parser.convert_dlms_bundle_to_reader_data(dlms_objects)
 
-        assert isinstance(meter_data, list)
+        assert isinstance(meter_data, MeterReading)
         assert len(meter_data) == 8
 
     def test_ignore_not_parsable_data_to_meter_data(self, unencrypted_invalid_data_lg: List[bytes], cosem_config_lg: Cosem):
@@ -89,7 +121,7 @@ class TestHdlcParserUnencrypted:
         dlms_objects = parser.parse_to_dlms_objects()
         meter_data = parser.convert_dlms_bundle_to_reader_data(dlms_objects)
 
-        assert isinstance(meter_data, list)
+        assert isinstance(meter_data, MeterReading)
         assert len(meter_data) == 5
 
     def test_hdlc_to_dlms_objects_without_pushlist(self, encrypted_data_no_pushlist_lg: List[bytes], cosem_config_lg: Cosem):
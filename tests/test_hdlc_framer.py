@@ -0,0 +1,133 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+from smartmeter_datacollector.smartmeter.cosem import Cosem
+from smartmeter_datacollector.smartmeter.hdlc_dlms_parser import HdlcDlmsParser
+from smartmeter_datacollector.smartmeter.hdlc_framer import HdlcFramer, crc16
+
+from .utils import *
+
+
+def test_framer_complete_frames(unencrypted_valid_data_lg: List[bytes]):
+    framer = HdlcFramer()
+
+    frames = framer.feed(b"".join(unencrypted_valid_data_lg))
+
+    assert frames == unencrypted_valid_data_lg
+
+
+def test_framer_chunked_stream(unencrypted_valid_data_iskra: List[bytes]):
+    framer = HdlcFramer()
+    stream = b"".join(unencrypted_valid_data_iskra)
+
+    frames = []
+    for pos in range(0, len(stream), 50):
+        frames.extend(framer.feed(stream[pos:pos + 50]))
+
+    assert frames == unencrypted_valid_data_iskra
+
+
+def test_framer_split_at_flags(encrypted_valid_data_lge570: List[bytes]):
+    framer = HdlcFramer()
+    stream = b"".join(encrypted_valid_data_lge570)
+
+    frames = []
+    for fragment in stream.split(bytes([HdlcFramer.HDLC_FLAG])):
+        frames.extend(framer.feed(fragment + bytes([HdlcFramer.HDLC_FLAG])))
+
+    assert frames == encrypted_valid_data_lge570
+
+
+def test_framer_shared_flag(unencrypted_valid_data_lg2: List[bytes]):
+    framer = HdlcFramer()
+    stream = unencrypted_valid_data_lg2[0] + b"".join(frame[1:] for frame in unencrypted_valid_data_lg2[1:])
+
+    frames = framer.feed(stream)
+
+    assert frames == unencrypted_valid_data_lg2
+
+
+def test_framer_skip_garbage(unencrypted_valid_data_lg2: List[bytes]):
+    framer = HdlcFramer()
+    garbage = bytes([0x01, 0x7E, 0x02, 0x7E, 0xA0, 0x05, 0x13])
+
+    frames = framer.feed(garbage + unencrypted_valid_data_lg2[0] + garbage[:3])
+    frames += framer.feed(unencrypted_valid_data_lg2[1])
+
+    assert frames == unencrypted_valid_data_lg2[:2]
+
+
+def test_crc16_check_value():
+    assert crc16(b"123456789") == 0x906E
+
+
+def test_framer_validates_crc(unencrypted_valid_data_lg: List[bytes]):
+    framer = HdlcFramer(validate_crc=True)
+    corrupted_payload = bytearray(unencrypted_valid_data_lg[1])
+    corrupted_payload[20] ^= 0xFF
+    corrupted_header = bytearray(unencrypted_valid_data_lg[2])
+    corrupted_header[5] ^= 0x02
+
+    frames = framer.feed(unencrypted_valid_data_lg[0] + corrupted_payload + corrupted_header +
+                         unencrypted_valid_data_lg[3])
+
+    assert frames == [unencrypted_valid_data_lg[0], unencrypted_valid_data_lg[3]]
+    assert framer.frame_count == 2
+    assert framer.crc_error_count == 2
+
+
+def test_parser_drops_corrupted_frames(unencrypted_valid_data_lg: List[bytes]):
+    parser = HdlcDlmsParser(Cosem("", []))
+    corrupted = bytearray(unencrypted_valid_data_lg[-1])
+    corrupted[-10] ^= 0x01
+
+    parser.append_to_hdlc_buffer(b"".join(unencrypted_valid_data_lg[:-1]) + corrupted)
+
+    assert not parser.extract_data_from_hdlc_frames()
+    assert parser.crc_error_count == 1
+
+    parser.append_to_hdlc_buffer(unencrypted_valid_data_lg[-1])
+
+    assert parser.extract_data_from_hdlc_frames()
+
+
+def test_framer_counts_dropped_bytes(unencrypted_valid_data_lg2: List[bytes]):
+    framer = HdlcFramer()
+    garbage = bytes([0x01, 0x7E, 0x02, 0x7E, 0xA0, 0x05, 0x13])
+    shared_flag = unencrypted_valid_data_lg2[1] + unencrypted_valid_data_lg2[2][1:]
+
+    frames = framer.feed(garbage + unencrypted_valid_data_lg2[0] + garbage[:3])
+    frames += framer.feed(b"\x7E" + shared_flag)
+
+    assert frames == unencrypted_valid_data_lg2
+    assert framer.dropped_bytes == len(garbage) + 3
+
+
+def test_framer_resynchronizes_on_overflow(unencrypted_valid_data_lg: List[bytes]):
+    framer = HdlcFramer(capacity=200)
+    # incomplete frame claiming a length of 0x7FF bytes
+    stuck_frame = bytes([0x7E, 0xA7, 0xFF]) + bytes(100)
+
+    frames = framer.feed(stuck_frame)
+    frames += framer.feed(bytes(150) + unencrypted_valid_data_lg[0])
+    frames += framer.feed(b"".join(unencrypted_valid_data_lg[1:]))
+
+    assert frames == unencrypted_valid_data_lg
+    assert framer.dropped_bytes == len(stuck_frame) + 150
+    assert len(framer) == 1
+
+
+def test_parser_keeps_message_on_overflow(unencrypted_valid_data_lg: List[bytes], cosem_config_lg: Cosem):
+    parser = HdlcDlmsParser(cosem_config_lg)
+
+    parser.append_to_hdlc_buffer(b"".join(unencrypted_valid_data_lg[2:4]))
+    assert not parser.extract_data_from_hdlc_frames()
+    parser.append_to_hdlc_buffer(bytes(HdlcDlmsParser.HDLC_BUFFER_MAX_SIZE) + b"".join(unencrypted_valid_data_lg[4:]))
+
+    assert parser.extract_data_from_hdlc_frames()
+    assert len(parser.parse_to_meter_data()) == 11
+    assert parser.dropped_bytes == HdlcDlmsParser.HDLC_BUFFER_MAX_SIZE
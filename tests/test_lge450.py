@@ -5,6 +5,7 @@
 # SPDX-License-Identifier: GPL-2.0-only
 # See LICENSES/README.md for more information.
 #
+import asyncio
 import sys
 from typing import List
 
@@ -12,7 +13,8 @@ import pytest
 from pytest_mock.plugin import MockerFixture
 
 from smartmeter_datacollector.smartmeter.lge450 import LGE450
-from smartmeter_datacollector.smartmeter.meter_data import MeterDataPointTypes
+from smartmeter_datacollector.smartmeter.meter_data import MeterDataPointTypes, MeterReading
+from smartmeter_datacollector.smartmeter.reader import ReaderConfig
 
 from .utils import *
 
@@ -52,7 +54,7 @@ async def test_lge450_parse_and_provide_unencrypted_data(mocker: MockerFixture,
     serial_mock.start_and_listen.assert_awaited_once()
     observer.notify.assert_called_once()
     values = observer.notify.call_args.args[0]
-    assert isinstance(values, list)
+    assert isinstance(values, MeterReading)
     assert any(data.type == MeterDataPointTypes.ACTIVE_POWER_P.value for data in values)
     assert any(data.type == MeterDataPointTypes.ACTIVE_POWER_N.value for data in values)
     assert any(data.type == MeterDataPointTypes.REACTIVE_POWER_P.value for data in values)
@@ -87,3 +89,28 @@ async def test_lge450_do_not_provide_invalid_data(mocker: MockerFixture,
 
     serial_mock.start_and_listen.assert_awaited_once()
     observer.notify.assert_not_called
+
+
+@pytest.mark.asyncio
+async def test_lge450_decode_in_thread(mocker: MockerFixture,
+                                       unencrypted_valid_data_lg: List[bytes],
+                                       unencrypted_valid_data_lg2: List[bytes]):
+    observer = mocker.stub("collector_mock")
+    observer.mock_add_spec(['notify'])
+    serial_mock = mocker.patch("smartmeter_datacollector.smartmeter.meter.SerialReader",
+                               autospec=True).return_value
+    meter = LGE450("/test/port", reader_config=ReaderConfig(decode_in_thread=True))
+    meter.register(observer)
+
+    async def data_received():
+        for frame in unencrypted_valid_data_lg + unencrypted_valid_data_lg2:
+            meter._data_received(frame)
+            await asyncio.sleep(0)
+    serial_mock.start_and_listen.side_effect = data_received
+
+    await meter.start()
+
+    assert observer.notify.call_count == 2
+    messages = [call.args[0] for call in observer.notify.call_args_list]
+    assert [len(data_points) for data_points in messages] == [11, 8]
+    assert all(data.source == "LGZ1030655933512" for data in messages[0])
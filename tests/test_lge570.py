@@ -12,7 +12,7 @@ import pytest
 from pytest_mock.plugin import MockerFixture
 
 from smartmeter_datacollector.smartmeter.lge570 import LGE570
-from smartmeter_datacollector.smartmeter.meter_data import MeterDataPointTypes
+from smartmeter_datacollector.smartmeter.meter_data import MeterDataPointTypes, MeterReading
 
 from .utils import *
 
@@ -38,7 +38,7 @@ async def test_lge570_parse_and_provide_encrypted_data(mocker: MockerFixture,
     serial_mock.start_and_listen.assert_awaited_once()
     observer.notify.assert_called_once()
     values = observer.notify.call_args.args[0]
-    assert isinstance(values, list)
+    assert isinstance(values, MeterReading)
     assert any(data.type == MeterDataPointTypes.ACTIVE_POWER_P.value for data in values)
     assert any(data.type == MeterDataPointTypes.ACTIVE_POWER_N.value for data in values)
     assert any(data.type == MeterDataPointTypes.REACTIVE_POWER_P.value for data in values)
@@ -6,9 +6,14 @@
 # See LICENSES/README.md for more information.
 #
 import json
+import pickle
 from datetime import datetime, timezone
 
-from smartmeter_datacollector.smartmeter.meter_data import MeterDataPoint, MeterDataPointType
+from smartmeter_datacollector.smartmeter.meter_data import (DATA_POINT_TYPES, MeterDataPoint, MeterDataPointType,
+                                                            MeterDataPointTypeRegistry, MeterDataPointTypes,
+                                                            MeterReading)
+
+from .utils import *
 
 
 def test_meter_data_serialize():
@@ -24,3 +29,38 @@ def test_meter_data_serialize():
     assert result['value'] == data_point.value
     assert result['source'] == data_point.source
     assert result['timestamp'] == data_point.timestamp.isoformat()
+
+
+def test_meter_data_serialize_meter_timestamp(unencrypted_valid_data_iskra: List[bytes]):
+    parser = prepare_parser(unencrypted_valid_data_iskra, Cosem("fallback_id"))
+    data_point = parser.parse_to_meter_data()[0]
+
+    result = json.loads(data_point.to_json())
+    assert result['timestamp'] == data_point.timestamp.isoformat()
+
+
+def test_meter_data_point_type_is_hashable():
+    test_type = MeterDataPointType("TEST_TYPE", "test type", "unit")
+
+    assert {test_type: 1}[MeterDataPointType("TEST_TYPE", "test type", "unit")] == 1
+    assert pickle.loads(pickle.dumps(test_type)) == test_type
+    with pytest.raises(AttributeError):
+        test_type.unit = "W"
+
+
+def test_meter_reading_is_slotted():
+    reading = MeterReading.from_data_points([
+        MeterDataPoint(MeterDataPointTypes.ACTIVE_POWER_P.value, 1.0, "meter1", datetime.now(timezone.utc))])
+
+    assert not hasattr(reading, "__dict__")
+
+
+def test_meter_data_point_type_registry():
+    registry = MeterDataPointTypeRegistry([MeterDataPointTypes.ACTIVE_POWER_P.value])
+    test_type = MeterDataPointType("TEST_TYPE", "test type", "unit")
+
+    assert registry.id_of(test_type) is None
+    assert registry.register(test_type) == 1
+    assert registry.register(MeterDataPointType("TEST_TYPE", "test type", "unit")) == 1
+    assert registry.get(1) is test_type
+    assert DATA_POINT_TYPES.get(DATA_POINT_TYPES.id_of(MeterDataPointTypes.WATER.value)) == MeterDataPointTypes.WATER.value
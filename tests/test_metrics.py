@@ -0,0 +1,100 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+import json
+from configparser import ConfigParser
+from datetime import datetime, timezone
+
+from pytest_mock import MockerFixture
+
+from smartmeter_datacollector.collector import Collector
+from smartmeter_datacollector.metrics import METRICS, Histogram, Metrics, MetricsConfig, MetricsReporter
+from smartmeter_datacollector.sinks.data_sink import DataSink
+from smartmeter_datacollector.smartmeter.meter_data import MeterDataPoint, MeterDataPointTypes, MeterReading
+
+from .utils import *
+
+
+@pytest.fixture
+def enabled_metrics():
+    METRICS.clear()
+    METRICS.enabled = True
+    yield METRICS
+    METRICS.enabled = False
+    METRICS.clear()
+
+
+def test_histogram():
+    histogram = Histogram()
+    for seconds in (0.00002, 0.00002, 0.003, 20.0):
+        histogram.observe(seconds)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["max"] == 20.0
+    assert snapshot["p50"] == 0.000025
+    assert snapshot["p99"] == 20.0
+    assert snapshot["buckets"] == {"2.5e-05": 2, "0.005": 1, "inf": 1}
+
+
+def test_disabled_metrics_are_not_recorded():
+    metrics = Metrics()
+
+    metrics.observe("meter", "hdlc_extraction", 0.1)
+    metrics.increment("meter", "messages")
+
+    assert metrics.snapshot() == {}
+
+
+def test_parser_records_stages(enabled_metrics: Metrics, unencrypted_valid_data_lg: List[bytes],
+                               cosem_config_lg: Cosem):
+    parser = HdlcDlmsParser(cosem_config_lg, name="/dev/ttyUSB0")
+    for frame in unencrypted_valid_data_lg + unencrypted_valid_data_lg[2:]:
+        parser.append_to_hdlc_buffer(frame)
+        while parser.extract_data_from_hdlc_frames():
+            parser.parse_to_meter_data()
+
+    meter = enabled_metrics.snapshot()["/dev/ttyUSB0"]
+    assert meter["latency"]["dlms_parsing"]["count"] == 1
+    assert meter["latency"]["conversion"]["count"] == 2
+    assert meter["counters"]["fast_path_messages"] == 1
+
+
+@pytest.mark.asyncio
+async def test_collector_records_queue_wait_and_send(enabled_metrics: Metrics, mocker: MockerFixture):
+    coll = Collector()
+    coll.register_sink(mocker.AsyncMock(DataSink))
+    data_point = MeterDataPoint(MeterDataPointTypes.ACTIVE_POWER_P.value, 1.0, "test_source",
+                                datetime.now(timezone.utc))
+    coll.notify(MeterReading.from_data_points([data_point, data_point]))
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(coll.process_queue(), 0.1)
+
+    snapshot = enabled_metrics.snapshot()
+    assert snapshot["AsyncMock#0"]["latency"]["queue_wait"]["count"] == 1
+    assert snapshot["AsyncMock#0"]["latency"]["send"]["count"] == 1
+    assert snapshot["AsyncMock#0"]["counters"] == {"batches": 1, "readings": 1}
+
+
+def test_reporter_writes_snapshot(tmp_path, enabled_metrics: Metrics):
+    path = str(tmp_path / "metrics.json")
+    enabled_metrics.increment("meter", "messages", 3)
+
+    MetricsReporter(MetricsConfig(True, 60.0, path)).report()
+
+    with open(path, encoding="utf-8") as metrics_file:
+        assert json.load(metrics_file) == {"meter": {"counters": {"messages": 3}}}
+
+
+def test_metrics_config():
+    config = ConfigParser()
+    assert not MetricsConfig.from_config(config).enabled
+
+    config.read_dict({"metrics": {"enabled": "true", "interval": "10", "path": "/tmp/metrics.json"}})
+    assert MetricsConfig.from_config(config) == MetricsConfig(True, 10.0, "/tmp/metrics.json")
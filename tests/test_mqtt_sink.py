@@ -12,12 +12,12 @@ from datetime import datetime, timezone
 from unittest import mock
 
 import pytest
-from asyncio_mqtt.error import MqttCodeError
+from asyncio_mqtt.error import MqttCodeError, MqttError
 from paho.mqtt.client import MQTT_ERR_NO_CONN
 from pytest_mock.plugin import MockerFixture
 
 from smartmeter_datacollector.sinks.mqtt_sink import MqttConfig, MqttDataSink
-from smartmeter_datacollector.smartmeter.meter_data import MeterDataPoint, MeterDataPointType
+from smartmeter_datacollector.smartmeter.meter_data import MeterDataPoint, MeterDataPointType, MeterReading
 
 TEST_TYPE = MeterDataPointType("TEST_TYPE", "test type", "unit")
 
@@ -174,3 +174,44 @@ def test_mqtt_config_encrypted_authorized_client_cert():
 
     with mock.patch("smartmeter_datacollector.sinks.mqtt_sink.ssl"):
         sink = MqttDataSink(cfg)
+
+
+@pytest.mark.asyncio
+async def test_mqtt_sink_spools_readings_while_disconnected(mocker: MockerFixture, tmp_path):
+    config = MqttConfig("localhost").with_spool(str(tmp_path))
+    sink = MqttDataSink(config)
+    client_mock = mocker.patch.object(sink, "_client", autospec=True)
+    readings = [MeterReading.from_data_points([MeterDataPoint(TEST_TYPE, float(i), "test_source",
+                                                              datetime.now(timezone.utc))]) for i in range(3)]
+
+    client_mock.publish.side_effect = MqttCodeError(MQTT_ERR_NO_CONN)
+    client_mock.connect.side_effect = MqttError("Connection refused")
+    await sink.send_batch(readings[:2])
+
+    # stops at the first failure
+    assert client_mock.publish.await_count == 1
+    assert list(tmp_path.iterdir())
+
+    client_mock.publish.reset_mock(side_effect=True)
+    await sink.send_batch(readings[2:])
+
+    published = [json.loads(call.args[1])["value"] for call in client_mock.publish.await_args_list]
+    assert published == [2.0, 0.0, 1.0]
+    assert not list(tmp_path.iterdir())
+
+
+def test_mqtt_config_spool():
+    cfg_parser = configparser.ConfigParser()
+    cfg_parser.read_dict({
+        "sink": {
+            'type': "mqtt",
+            'host': "localhost",
+            'spool_dir': "/var/spool/smartmeter",
+            'spool_max_size': 1024,
+        }
+    })
+
+    cfg = MqttConfig.from_sink_config(cfg_parser["sink"])
+    assert cfg.spool_dir == "/var/spool/smartmeter"
+    assert cfg.spool_max_size == 1024
+    assert MqttConfig("localhost").spool_dir is None
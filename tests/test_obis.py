@@ -71,3 +71,9 @@ def test_hash_of_obis():
 
     assert hash(obis) == hash(obis_same)
     assert hash(obis) != hash(obis_diff)
+
+
+def test_parsed_obis_codes_are_interned():
+    assert OBISCode.from_string("1.0.1.7.0.255") is OBISCode.from_string("1.0.1.7.0.255")
+    assert OBISCode.from_bytes(bytearray.fromhex("01 00 01 07 00 FF")) is OBISCode.from_bytes(
+        bytes.fromhex("01 00 01 07 00 FF"))
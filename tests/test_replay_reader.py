@@ -0,0 +1,83 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import time
+from pathlib import Path
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from smartmeter_datacollector.smartmeter.frame_capture import (CAPTURE_MAGIC, RECORD_HEADER, SEGMENT_HEADER,
+                                                               FrameCapture)
+from smartmeter_datacollector.smartmeter.lge450 import LGE450
+from smartmeter_datacollector.smartmeter.meter import MeterError
+from smartmeter_datacollector.smartmeter.meter_data import MeterDataPointTypes
+from smartmeter_datacollector.smartmeter.reader import ReaderConfig
+from smartmeter_datacollector.smartmeter.replay_reader import ReplayReader
+
+from .utils import *
+
+
+def write_paced_capture(path: Path, frames: List[bytes], interval_ns: int) -> None:
+    content = CAPTURE_MAGIC + SEGMENT_HEADER.pack(0, 0)
+    for index, frame in enumerate(frames):
+        content += RECORD_HEADER.pack((index + 1) * interval_ns, len(frame)) + frame
+    path.write_bytes(content)
+
+
+@pytest.mark.asyncio
+async def test_replay_hex_dump(mocker: MockerFixture, tmp_path: Path, unencrypted_valid_data_lg: List[bytes]):
+    dump = tmp_path / "dump.txt"
+    dump.write_text("# L+G E450\n" + "\n".join(f'data_str.append("{frame.hex(" ")}")'
+                                             for frame in unencrypted_valid_data_lg), encoding="utf-8")
+    callback = mocker.stub()
+
+    await ReplayReader(str(dump), callback).start_and_listen()
+
+    assert [c.args[0] for c in callback.call_args_list] == unencrypted_valid_data_lg
+
+
+@pytest.mark.asyncio
+async def test_replay_capture_pacing(mocker: MockerFixture, tmp_path: Path, unencrypted_valid_data_lg: List[bytes]):
+    capture = tmp_path / "reader0.cap.000000"
+    write_paced_capture(capture, unencrypted_valid_data_lg, 50_000_000)
+    callback = mocker.stub()
+
+    start = time.monotonic()
+    await ReplayReader(str(capture), callback, speed=5.0).start_and_listen()
+    paced_duration = time.monotonic() - start
+    start = time.monotonic()
+    await ReplayReader(str(capture), callback, speed=0).start_and_listen()
+    fast_duration = time.monotonic() - start
+
+    assert callback.call_count == 2 * len(unencrypted_valid_data_lg)
+    assert paced_duration >= 0.05
+    assert fast_duration < paced_duration
+
+
+@pytest.mark.asyncio
+async def test_lge450_replay_capture(mocker: MockerFixture, tmp_path: Path, unencrypted_valid_data_lg: List[bytes]):
+    observer = mocker.stub("collector_mock")
+    observer.mock_add_spec(['notify'])
+    path = str(tmp_path / "reader0.cap")
+    capture = FrameCapture(path)
+    for frame in unencrypted_valid_data_lg:
+        capture.write(frame)
+    capture.close()
+
+    meter = LGE450(path, reader_config=ReaderConfig(backend="replay", replay_speed=0))
+    meter.register(observer)
+    await meter.start()
+
+    observer.notify.assert_called_once()
+    values = observer.notify.call_args.args[0]
+    assert any(data.type == MeterDataPointTypes.ACTIVE_POWER_P.value for data in values)
+
+
+def test_lge450_replay_source_missing(tmp_path: Path):
+    with pytest.raises(MeterError):
+        LGE450(str(tmp_path / "missing.cap"), reader_config=ReaderConfig(backend="replay"))
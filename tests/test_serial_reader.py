@@ -0,0 +1,44 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+import os
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from smartmeter_datacollector.smartmeter.serial_reader import SerialConfig, SerialReader
+
+from .utils import *
+
+
+@pytest.mark.asyncio
+async def test_serial_reader_chunked_provides_complete_frames(mocker: MockerFixture, pty_pair,
+                                                              unencrypted_valid_data_lg: List[bytes]):
+    master, port = pty_pair
+    callback = mocker.stub()
+    reader = SerialReader(SerialConfig(port), callback, chunked=True)
+
+    os.write(master, b"".join(unencrypted_valid_data_lg))
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(reader.start_and_listen(), 0.5)
+
+    assert [c.args[0] for c in callback.call_args_list] == unencrypted_valid_data_lg
+
+
+@pytest.mark.asyncio
+async def test_serial_reader_chunked_does_not_wait_for_full_chunk(mocker: MockerFixture, pty_pair,
+                                                                  unencrypted_valid_data_lg: List[bytes]):
+    master, port = pty_pair
+    callback = mocker.stub()
+    reader = SerialReader(SerialConfig(port), callback, chunked=True)
+
+    os.write(master, unencrypted_valid_data_lg[0])
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(reader.start_and_listen(), 0.5)
+
+    callback.assert_called_once_with(unencrypted_valid_data_lg[0])
@@ -0,0 +1,112 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+import pickle
+from configparser import ConfigParser
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from smartmeter_datacollector import sharding
+from smartmeter_datacollector.collector import Collector
+from smartmeter_datacollector.smartmeter.meter_data import (BUILTIN_TYPE_COUNT, DATA_POINT_TYPES, MeterDataPoint,
+                                                            MeterDataPointType, MeterReading)
+
+from .utils import *
+
+
+def test_partition_reader_sections():
+    cfg = ConfigParser()
+    cfg.read_dict({f"reader{i}": {"type": "lge450"} for i in range(5)})
+    cfg.read_dict({"sink0": {"type": "logger"}, "sharding": {"workers": "2"}})
+
+    assert sharding.get_worker_count(cfg) == 2
+    assert sharding.partition_reader_sections(cfg, 2) == [["reader0", "reader2", "reader4"], ["reader1", "reader3"]]
+    assert sharding.partition_reader_sections(cfg, 8) == [[f"reader{i}"] for i in range(5)]
+
+
+def test_encode_decode_reading():
+    timestamp = datetime.now(timezone.utc)
+    custom_type = MeterDataPointType("TEST_TYPE", "test type", "unit")
+    reading = MeterReading.from_data_points([
+        MeterDataPoint(MeterDataPointTypes.ACTIVE_POWER_P.value, 1.0, "meter1", timestamp),
+        MeterDataPoint(MeterDataPointTypes.VOLTAGE_L1.value, 230.0, "meter1", timestamp),
+        MeterDataPoint(custom_type, 2.0, "meter1", timestamp),
+    ])
+
+    assert sharding.decode_reading(sharding.encode_reading(reading)) == reading
+
+
+def test_encode_reading_passes_registered_custom_type_by_value():
+    custom_type = MeterDataPointType("TEST_REGISTERED_TYPE", "test type", "unit")
+    assert DATA_POINT_TYPES.register(custom_type) >= BUILTIN_TYPE_COUNT
+    reading = MeterReading.from_data_points([
+        MeterDataPoint(MeterDataPointTypes.ACTIVE_POWER_P.value, 1.0, "meter1", datetime.now(timezone.utc)),
+        MeterDataPoint(custom_type, 2.0, "meter1", datetime.now(timezone.utc)),
+    ])
+
+    encoded = sharding.encode_reading(reading)
+
+    _, _, types, _ = pickle.loads(encoded)
+    assert types == (DATA_POINT_TYPES.id_of(MeterDataPointTypes.ACTIVE_POWER_P.value), custom_type)
+    assert sharding.decode_reading(encoded) == reading
+
+
+def test_encode_decode_reading_with_meter_time_zone(unencrypted_valid_data_iskra: List[bytes]):
+    parser = prepare_parser(unencrypted_valid_data_iskra, Cosem("fallback_id"))
+    reading = parser.parse_to_meter_data()
+
+    decoded = sharding.decode_reading(sharding.encode_reading(reading))
+
+    assert decoded.timestamp == reading.timestamp
+    assert decoded.timestamp.utcoffset() == reading.timestamp.utcoffset()
+    assert decoded.types == reading.types
+    assert decoded.values == reading.values
+
+
+def test_worker_shard_drops_invalid_data(mocker: MockerFixture):
+    collector = mocker.Mock(Collector)
+    shard = sharding.WorkerShard(0, {}, collector)
+    conn = mocker.Mock()
+    conn.recv_bytes.return_value = b"invalid"
+
+    shard._receive(conn, mocker.Mock())
+
+    collector.notify.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_worker_shard_forwards_data(mocker: MockerFixture, tmp_path: Path,
+                                          unencrypted_valid_data_lg: List[bytes]):
+    dump = tmp_path / "dump.txt"
+    dump.write_text("\n".join(frame.hex() for frame in unencrypted_valid_data_lg), encoding="utf-8")
+    cfg = ConfigParser()
+    cfg.read_dict({
+        "reader0": {"type": "lge450", "port": str(dump), "backend": "replay"},
+        "sharding": {"workers": "2"},
+    })
+    collector = mocker.Mock(Collector)
+    shards = sharding.build_shards(cfg, collector)
+    assert len(shards) == 1
+
+    task = asyncio.create_task(shards[0].run())
+    for _ in range(100):
+        if collector.notify.called:
+            break
+        await asyncio.sleep(0.1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    shards[0].stop()
+
+    collector.notify.assert_called()
+    values = collector.notify.call_args_list[0].args[0]
+    assert any(data.type == MeterDataPointTypes.ACTIVE_POWER_P.value for data in values)
+    assert all(data.source == "LGZ1030655933512" for data in values)
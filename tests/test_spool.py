@@ -0,0 +1,159 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+from pytest_mock.plugin import MockerFixture
+
+from smartmeter_datacollector.sinks.spool import QUARANTINE_SUFFIX, Spool
+from smartmeter_datacollector.smartmeter.cosem import Cosem
+from smartmeter_datacollector.smartmeter.meter_data import (MeterDataPoint, MeterDataPointType, MeterDataPointTypes,
+                                                            MeterReading)
+
+from .utils import *
+
+
+def create_readings(count: int) -> List[MeterReading]:
+    custom_type = MeterDataPointType("TEST_TYPE", "test type", "unit")
+    return [MeterReading.from_data_points([
+        MeterDataPoint(MeterDataPointTypes.ACTIVE_POWER_P.value, float(i), "meter1", datetime.now(timezone.utc)),
+        MeterDataPoint(custom_type, float(i), "meter1", datetime.now(timezone.utc)),
+    ]) for i in range(count)]
+
+
+def test_spool_replays_segments_in_order(tmp_path: Path):
+    readings = create_readings(4)
+    spool = Spool(str(tmp_path), segment_size=1)
+
+    spool.append(readings[:2])
+    spool.append(readings[2:3])
+    spool.append(readings[3:])
+
+    assert len(spool) == 3
+    assert spool.peek(10) == readings[:2]
+    spool.commit()
+    assert spool.peek(10) == readings[2:3]
+    spool.commit()
+    assert spool.peek(10) == readings[3:]
+    spool.commit()
+    assert len(spool) == 0
+    assert spool.peek(10) == []
+    assert not list(tmp_path.iterdir())
+
+
+def test_spool_peek_is_limited_by_record_count(tmp_path: Path):
+    readings = create_readings(5)
+    spool = Spool(str(tmp_path))
+    spool.append(readings)
+
+    assert spool.peek(2) == readings[:2]
+    # not committed, peeked again
+    assert spool.peek(2) == readings[:2]
+    spool.commit()
+    assert spool.peek(2) == readings[2:4]
+    spool.commit()
+    assert len(spool) == 1
+    assert spool.peek(2) == readings[4:]
+    spool.commit()
+    assert len(spool) == 0
+
+
+def test_spool_keeps_records_appended_after_peek(tmp_path: Path):
+    readings = create_readings(2)
+    spool = Spool(str(tmp_path))
+    spool.append(readings[:1])
+
+    assert spool.peek(10) == readings[:1]
+    spool.append(readings[1:])
+    spool.commit()
+
+    assert spool.peek(10) == readings[1:]
+
+
+def test_spool_is_persistent(tmp_path: Path):
+    readings = create_readings(2)
+    spool = Spool(str(tmp_path))
+    spool.append(readings)
+    spool.close()
+
+    spool = Spool(str(tmp_path))
+    assert spool.peek(10) == readings
+    spool.append(readings[:1])
+    assert len(spool) == 2
+
+
+def test_spool_evicts_oldest_segments(tmp_path: Path):
+    readings = create_readings(3)
+    spool = Spool(str(tmp_path), segment_size=1)
+    spool.append(readings[:1])
+    segment_size = spool.size
+    spool = Spool(str(tmp_path), max_size=2 * segment_size, segment_size=1)
+
+    spool.append(readings[1:2])
+    spool.append(readings[2:])
+
+    assert len(spool) == 2
+    assert spool.peek(10) == readings[1:2]
+
+
+def test_spool_ignores_truncated_record(tmp_path: Path):
+    readings = create_readings(2)
+    spool = Spool(str(tmp_path))
+    spool.append(readings)
+    spool.close()
+    segment = next(tmp_path.iterdir())
+    segment.write_bytes(segment.read_bytes()[:-1])
+
+    spool = Spool(str(tmp_path))
+    assert spool.peek(10) == readings[:1]
+    spool.commit()
+    assert len(spool) == 0
+
+
+def test_spool_round_trip_with_meter_time_zone(tmp_path: Path, unencrypted_valid_data_iskra: List[bytes]):
+    reading = prepare_parser(unencrypted_valid_data_iskra, Cosem("fallback_id")).parse_to_meter_data()
+    spool = Spool(str(tmp_path))
+    spool.append([reading])
+    spool.close()
+
+    replayed = Spool(str(tmp_path)).peek(10)
+
+    assert replayed == [reading]
+
+
+def test_spool_quarantines_invalid_segment(tmp_path: Path):
+    readings = create_readings(2)
+    spool = Spool(str(tmp_path), segment_size=1)
+    spool.append(readings[:1])
+    spool.append(readings[1:])
+    spool.close()
+    segment = sorted(tmp_path.iterdir())[0]
+    data = segment.read_bytes()
+    segment.write_bytes(data[:4] + b"\x00" * (len(data) - 4))
+
+    spool = Spool(str(tmp_path))
+    assert spool.peek(10) == []
+    spool.commit()
+
+    assert (tmp_path / (segment.name + QUARANTINE_SUFFIX)).exists()
+    assert spool.peek(10) == readings[1:]
+
+
+def test_spool_keeps_segment_on_read_error(tmp_path: Path, mocker: MockerFixture):
+    readings = create_readings(1)
+    spool = Spool(str(tmp_path))
+    spool.append(readings)
+    mocker.patch("builtins.open", side_effect=OSError("read error"))
+
+    assert spool.peek(10) == []
+    spool.commit()
+
+    mocker.stopall()
+    assert len(spool) == 1
+    assert spool.peek(10) == readings
@@ -0,0 +1,47 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from smartmeter_datacollector.smartmeter.meter import Meter
+from smartmeter_datacollector.smartmeter.reader import ReaderError
+from smartmeter_datacollector.supervisor import ReaderState, ReaderSupervisor
+
+
+@pytest.mark.asyncio
+async def test_supervisor_restarts_failed_reader(mocker: MockerFixture):
+    mocker.patch.object(ReaderSupervisor, "BACKOFF_MIN", 0.01)
+    meter = mocker.AsyncMock(Meter)
+    meter.start.side_effect = [ReaderError("unplugged"), ReaderError("unplugged"), None]
+    supervisor = ReaderSupervisor(meter, "test")
+
+    await asyncio.wait_for(supervisor.run(), 1)
+
+    assert meter.start.await_count == 3
+    assert supervisor.restarts == 2
+    assert supervisor.state == ReaderState.STOPPED
+
+
+@pytest.mark.asyncio
+async def test_supervisor_isolates_failures(mocker: MockerFixture):
+    mocker.patch.object(ReaderSupervisor, "BACKOFF_MIN", 0.01)
+    failing_meter = mocker.AsyncMock(Meter)
+    failing_meter.start.side_effect = ReaderError("unplugged")
+    healthy_meter = mocker.AsyncMock(Meter)
+    healthy_meter.start.side_effect = asyncio.Event().wait
+    failing = ReaderSupervisor(failing_meter, "failing")
+    healthy = ReaderSupervisor(healthy_meter, "healthy")
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(asyncio.gather(failing.run(), healthy.run()), 0.2)
+
+    assert failing.restarts >= 2
+    healthy_meter.start.assert_awaited_once()
+    assert healthy.state == ReaderState.STOPPED
@@ -0,0 +1,115 @@
+#
+# Copyright (C) 2024 Supercomputing Systems AG
+# This file is part of smartmeter-datacollector.
+#
+# SPDX-License-Identifier: GPL-2.0-only
+# See LICENSES/README.md for more information.
+#
+import asyncio
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from smartmeter_datacollector.smartmeter.lge450 import LGE450
+from smartmeter_datacollector.smartmeter.meter_data import MeterDataPointTypes
+from smartmeter_datacollector.smartmeter.reader import ReaderError
+from smartmeter_datacollector.smartmeter.tcp_reader import TcpReader
+
+from .utils import *
+
+
+async def start_replay_server(frames: List[bytes]) -> asyncio.AbstractServer:
+    async def replay(_: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.write(b"".join(frames))
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(replay, "127.0.0.1", 0)
+
+
+def test_tcp_reader_parse_url():
+    assert TcpReader.is_tcp_url("tcp://localhost:4001")
+    assert not TcpReader.is_tcp_url("/dev/ttyUSB0")
+    assert TcpReader.parse_url("tcp://192.168.1.10:4001") == ("192.168.1.10", 4001)
+
+    with pytest.raises(ReaderError):
+        TcpReader.parse_url("tcp://localhost")
+    with pytest.raises(ReaderError):
+        TcpReader.parse_url("tcp://localhost:port")
+
+
+@pytest.mark.asyncio
+async def test_tcp_reader_reconnects(mocker: MockerFixture, unencrypted_valid_data_lg: List[bytes]):
+    mocker.patch.object(TcpReader, "RECONNECT_DELAY_MIN", 0.01)
+    server = await start_replay_server(unencrypted_valid_data_lg)
+    port = server.sockets[0].getsockname()[1]
+    callback = mocker.stub()
+    reader = TcpReader(f"tcp://127.0.0.1:{port}", callback)
+
+    async with server:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(reader.start_and_listen(), 0.2)
+
+    frames = [c.args[0] for c in callback.call_args_list]
+    assert len(frames) >= 2 * len(unencrypted_valid_data_lg)
+    assert frames[:len(unencrypted_valid_data_lg)] == unencrypted_valid_data_lg
+
+
+@pytest.mark.asyncio
+async def test_tcp_reader_backs_off_if_connection_is_closed_without_data(mocker: MockerFixture):
+    async def close(_: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.close()
+
+    class StopReconnecting(Exception):
+        pass
+
+    server = await asyncio.start_server(close, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    sleep_mock = mocker.patch("smartmeter_datacollector.smartmeter.tcp_reader.asyncio.sleep",
+                              side_effect=[None, None, None, StopReconnecting()])
+    reader = TcpReader(f"tcp://127.0.0.1:{port}", mocker.stub())
+
+    async with server:
+        with pytest.raises(StopReconnecting):
+            await reader.start_and_listen()
+
+    assert [c.args[0] for c in sleep_mock.await_args_list] == [1.0, 2.0, 4.0, 8.0]
+
+
+@pytest.mark.asyncio
+async def test_tcp_reader_backs_off_on_connect_timeout(mocker: MockerFixture):
+    class StopReconnecting(Exception):
+        pass
+
+    async def connect_forever(*_):
+        await asyncio.Event().wait()
+
+    mocker.patch.object(TcpReader, "CONNECT_TIMEOUT", 0.01)
+    mocker.patch("smartmeter_datacollector.smartmeter.tcp_reader.asyncio.open_connection", side_effect=connect_forever)
+    sleep_mock = mocker.patch("smartmeter_datacollector.smartmeter.tcp_reader.asyncio.sleep",
+                              side_effect=[None, StopReconnecting()])
+    reader = TcpReader("tcp://192.0.2.1:4001", mocker.stub())
+
+    with pytest.raises(StopReconnecting):
+        await asyncio.wait_for(reader.start_and_listen(), 1.0)
+
+    assert [c.args[0] for c in sleep_mock.await_args_list] == [1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_lge450_over_tcp(mocker: MockerFixture, unencrypted_valid_data_lg: List[bytes]):
+    observer = mocker.stub("collector_mock")
+    observer.mock_add_spec(['notify'])
+    server = await start_replay_server(unencrypted_valid_data_lg)
+    port = server.sockets[0].getsockname()[1]
+    meter = LGE450(f"tcp://127.0.0.1:{port}")
+    meter.register(observer)
+
+    async with server:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(meter.start(), 0.2)
+
+    observer.notify.assert_called_once()
+    values = observer.notify.call_args.args[0]
+    assert any(data.type == MeterDataPointTypes.ACTIVE_POWER_P.value for data in values)
+    assert all(data.source == "LGZ1030655933512" for data in values)